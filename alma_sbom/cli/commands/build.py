@@ -31,14 +31,23 @@ class BuildCommand(SubCommand):
             )
 
     def _runner_with_build_id(self) -> 'Build':
-        albs_collector = self.collector_factory.gen_albs_collector()
-        build = albs_collector.collect_build_by_id(build_id=self.config.build_id)
-
-        immudb_collector = self.collector_factory.gen_immudb_collector()
-
-        for pkg_hash in albs_collector.iter_package_hash():
-            pkg = immudb_collector.collect_package_by_hash(pkg_hash)
-            build.append_package(pkg)
-
-        return build
+        with self.collector_factory:
+            albs_collector = self.collector_factory.gen_albs_collector()
+            build = albs_collector.collect_build_by_id(build_id=self.config.build_id)
+            _logger.debug(f'ALBS requests: {albs_collector.metrics.summary()}')
+
+            immudb_collector = self.collector_factory.gen_immudb_collector()
+
+            failed = []
+            for pkg_hash, pkg, error in immudb_collector.collect_packages_by_hashes(
+                albs_collector.iter_package_hash(),
+            ):
+                if error is not None:
+                    _logger.error(f'Failed to get data from immudb for hash value {pkg_hash}: {error}')
+                    failed.append(pkg_hash)
+                    continue
+                build.append_package(pkg)
+            if failed:
+                raise KeyError(f'Failed to get data from immudb for {len(failed)} package(s) of the build')
+            return build
 
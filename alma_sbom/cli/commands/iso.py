@@ -1,52 +1,336 @@
 import argparse
 import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
 from logging import getLogger
-from typing import ClassVar, TYPE_CHECKING
+from pathlib import Path
+from typing import ClassVar, Iterator, Optional, TYPE_CHECKING
 
 from alma_sbom.cli.config import CommonConfig, IsoConfig
+from alma_sbom.cli.factory import CollectorFactory
 
 ### TODO: https://github.com/AlmaLinux/alma-sbom/issues/59
 from alma_sbom.data import NullPackage
+from alma_sbom.data.collectors.dependencies import resolve_dependencies
+from alma_sbom.data.collectors.rpm import digest_buffer, get_licenses_cache_info
+from alma_sbom.type import get_hash_value
 
 from .commands import SubCommand
 
+if TYPE_CHECKING:
+    from alma_sbom.data import Iso, Package, ImmudbCollector, RpmCollector, IsoCollector
+    from alma_sbom.data.collectors.iso import IsoPackageEntry
+    from alma_sbom.type import Hash
+
 _logger = getLogger(__name__)
 
+class IsoPackageProcessor:
+    immudb_collector: 'ImmudbCollector'
+    rpm_collector: 'RpmCollector'
+    package_access: str
+    verify_sample_rate: float
+    cache_packages: bool
+    ### NOTE:
+    ##  Merged packages by their SHA256 checksum. Packages which are byte-identical
+    ##  across ISO images of a batch are looked up in immudb and parsed only once.
+    package_cache: dict[str, 'Package']
+
+    def __init__(
+        self,
+        immudb_collector: 'ImmudbCollector',
+        rpm_collector: 'RpmCollector',
+        package_access: str = IsoConfig.PACKAGE_ACCESS_EXTRACT,
+        verify_sample_rate: float = 0.0,
+        cache_packages: bool = True,
+    ) -> None:
+        self.immudb_collector = immudb_collector
+        self.rpm_collector = rpm_collector
+        self.package_access = package_access
+        self.verify_sample_rate = verify_sample_rate
+        self.cache_packages = cache_packages
+        self.package_cache = {}
+
+    @classmethod
+    def from_factory(cls, collector_factory: CollectorFactory, config: IsoConfig) -> 'IsoPackageProcessor':
+        return cls(
+            collector_factory.gen_immudb_collector(),
+            collector_factory.gen_rpm_collector(),
+            config.package_access,
+            config.verify_sample_rate,
+            ### NOTE:
+            ##  Streamed packages must not be kept, to keep memory usage flat
+            not config.stream,
+        )
+
+    def process(self, iso_collector: 'IsoCollector', entry: 'IsoPackageEntry') -> 'Package':
+        _logger.debug(f'Processing package {entry.rr_path}...')
+        hashes = self._hash_package(iso_collector, entry)
+        hash_value = get_hash_value(hashes)
+        if hash_value in self.package_cache:
+            return self.package_cache[hash_value]
+
+        pkg_from_immudb = self._collect_from_immudb(hash_value)
+        if self.package_access == IsoConfig.PACKAGE_ACCESS_MMAP:
+            pkg_from_pkg = self.rpm_collector.collect_package_from_fd(
+                iso_collector.get_iso_fd(),
+                entry.offset,
+                hashes=hashes,
+            )
+        else:
+            pkg_from_pkg = self.rpm_collector.collect_package_from_file(
+                iso_collector.get_fd_path(),
+                hashes=hashes,
+            )
+        return self._cache_package(hash_value, pkg_from_immudb.merge(pkg_from_pkg))
+
+    def process_from_repodata(
+        self,
+        iso_collector: 'IsoCollector',
+        entry: 'IsoPackageEntry',
+        pkg_from_repodata: 'Package',
+    ) -> 'Package':
+        _logger.debug(f'Processing package {entry.rr_path} from repodata...')
+        hash_value = pkg_from_repodata.hashs[0].value
+        if self._is_sampled(hash_value):
+            self._verify_hash(iso_collector, entry, hash_value)
+        if hash_value in self.package_cache:
+            return self.package_cache[hash_value]
+        pkg_from_immudb = self._collect_from_immudb(hash_value)
+        return self._cache_package(hash_value, pkg_from_immudb.merge(pkg_from_repodata))
+
+    def refresh_from_immudb(self, cached_pkg: 'Package') -> 'Package':
+        """
+        Looks a package of a stored ISO manifest up in immudb again. Used for
+        packages which were not found in immudb when the manifest was stored.
+        """
+        hash_value = get_hash_value(cached_pkg.hashs)
+        if hash_value in self.package_cache:
+            return self.package_cache[hash_value]
+        pkg_from_immudb = self._collect_from_immudb(hash_value)
+        return self._cache_package(hash_value, pkg_from_immudb.merge(cached_pkg))
+
+    @staticmethod
+    def is_found_in_immudb(package: 'Package') -> bool:
+        ### NOTE:
+        ##  SBOM properties are taken only from immudb,
+        ##  packages merged with NullPackage have none
+        return package.sbom_properties is not None
+
+    def _cache_package(self, hash_value: str, package: 'Package') -> 'Package':
+        if self.cache_packages:
+            self.package_cache[hash_value] = package
+        return package
+
+    def _collect_from_immudb(self, hash_value: str) -> 'Package':
+        try:
+            return self.immudb_collector.collect_package_by_hash(hash_value)
+        except KeyError as e:
+            return NullPackage
+
+    def _hash_package(self, iso_collector: 'IsoCollector', entry: 'IsoPackageEntry') -> list['Hash']:
+        if self.package_access == IsoConfig.PACKAGE_ACCESS_MMAP:
+            with iso_collector.get_package_view(entry) as view:
+                return digest_buffer(view, iso_collector.algorithms)
+        elif self.package_access == IsoConfig.PACKAGE_ACCESS_COPY_OFFLOAD:
+            return iso_collector.copy_package(entry)
+        return iso_collector.extract_package(entry)
+
+    def _is_sampled(self, hash_value: str) -> bool:
+        ### NOTE:
+        ##  Sampling is derived from the checksum itself,
+        ##  so the same packages are verified on every run.
+        return int(hash_value[:8], 16) < self.verify_sample_rate * 0x100000000
+
+    def _verify_hash(self, iso_collector: 'IsoCollector', entry: 'IsoPackageEntry', expected_hash_value: str) -> None:
+        hash_value = get_hash_value(self._hash_package(iso_collector, entry))
+        if hash_value != expected_hash_value:
+            raise ValueError(
+                f'Checksum of {entry.rr_path} ({hash_value}) differs from '
+                f'the one in repodata ({expected_hash_value})'
+            )
+        _logger.debug(f'Verified checksum of {entry.rr_path}')
+
+### NOTE:
+##  State of each worker process of the pool. Every worker owns its own
+##  IsoCollectors (and so its own memfds), ImmudbWrapper and rpm.TransactionSet.
+##  The worker lives for the whole batch, so its package cache spans all ISO images.
+_worker_collector_factory: CollectorFactory = None
+_worker_processor: IsoPackageProcessor = None
+_worker_iso_collectors: dict[Path, 'IsoCollector'] = {}
+
+def _init_worker(config: IsoConfig) -> None:
+    global _worker_collector_factory, _worker_processor
+    _worker_collector_factory = CollectorFactory(config)
+    _worker_processor = IsoPackageProcessor.from_factory(_worker_collector_factory, config)
+
+def _get_worker_iso_collector(iso_image: Path) -> 'IsoCollector':
+    if iso_image not in _worker_iso_collectors:
+        ### NOTE:
+        ##  ISO images are processed one after another,
+        ##  so the image processed before is not needed anymore
+        for previous_iso_collector in _worker_iso_collectors.values():
+            previous_iso_collector.close()
+        _worker_iso_collectors.clear()
+        iso_collector = _worker_collector_factory.gen_iso_collector()
+        iso_collector.collect_iso_by_file(iso_image)
+        _worker_iso_collectors[iso_image] = iso_collector
+    return _worker_iso_collectors[iso_image]
+
+def _process_chunk_in_worker(iso_image: Path, entries: list['IsoPackageEntry']) -> list['Package']:
+    iso_collector = _get_worker_iso_collector(iso_image)
+    return [
+        _worker_processor.process(iso_collector, entry)
+        for entry in iso_collector.iter_with_readahead(entries)
+    ]
+
 class IsoCommand(SubCommand):
     CONFIG_CLASS : ClassVar[type[CommonConfig]] = IsoConfig
+    WORKER_CHUNKSIZE: ClassVar[int] = 16
     config: IsoConfig
+    processor: IsoPackageProcessor
+    executor: Executor
+
+    def __init__(self, base: CommonConfig, args: argparse.Namespace) -> None:
+        self.processor = None
+        self.executor = None
+        super().__init__(base, args)
 
     def run(self) -> int:
-        iso = self.runner()
-        doc = self.document_factory.gen_from_iso(iso)
-        doc.write(self.config.output_file)
+        if self.config.output_dir is not None:
+            self.config.output_dir.mkdir(parents=True, exist_ok=True)
+        for iso_image, iso, packages in self.runner():
+            output_file = self.config.get_output_file(iso_image)
+            if self.config.stream:
+                self.document_factory.stream_from_iso(iso, packages, output_file)
+                continue
+            for pkg in packages:
+                iso.append_package(pkg)
+            if self.config.dependencies:
+                resolve_dependencies(iso.packages)
+            doc = self.document_factory.gen_from_iso(iso)
+            doc.write(output_file)
         return 0
 
     def _select_runner(self) -> None:
-        if self.config.iso_image:
-            self.runner = self._runner_with_iso_image
+        if self.config.iso_images:
+            self.runner = self._runner_with_iso_images
         else:
             raise RuntimeError('Unexpected situation has occurred')
 
-    def _runner_with_iso_image(self) -> 'Iso':
-        iso_collector = self.collector_factory.gen_iso_collector()
-        immudb_collector = self.collector_factory.gen_immudb_collector()
-        rpm_collector = self.collector_factory.gen_rpm_collector()
+    def _runner_with_iso_images(self) -> Iterator[tuple[Path, 'Iso', Iterator['Package']]]:
+        with ExitStack() as stack:
+            stack.enter_context(self.collector_factory)
+            if self.config.jobs > 1:
+                self.executor = stack.enter_context(ProcessPoolExecutor(
+                    max_workers=self.config.jobs,
+                    initializer=_init_worker,
+                    initargs=(self.config,),
+                ))
+            for iso_image in self.config.iso_images:
+                _logger.info(f'Generating SBOM of ISO image {iso_image}')
+                ### NOTE:
+                ##  Packages are consumed before the next image is requested,
+                ##  so the image is closed once its SBOM is written
+                with self.collector_factory.gen_iso_collector(
+                    self.config.manifest_cache_dir,
+                    self.config.metadata_source,
+                ) as iso_collector:
+                    iso = iso_collector.collect_iso_by_file(iso_image)
+                    yield iso_image, iso, self._iter_iso_packages(iso_image, iso_collector)
 
-        iso = iso_collector.collect_iso_by_file(self.config.iso_image)
+    def _get_processor(self) -> IsoPackageProcessor:
+        if self.processor is None:
+            self.processor = IsoPackageProcessor.from_factory(self.collector_factory, self.config)
+        return self.processor
 
+    def _iter_iso_packages(self, iso_image: Path, iso_collector: 'IsoCollector') -> Iterator['Package']:
+        cached_packages = iso_collector.get_cached_packages()
+        if cached_packages is not None:
+            yield from self._iter_cached_packages(iso_collector, cached_packages)
+            return
+
+        if self.config.metadata_source == IsoConfig.METADATA_SOURCE_REPODATA:
+            repodata_collector = self.collector_factory.gen_repodata_collector()
+            processed = self._iter_packages_from_repodata(
+                iso_collector,
+                iso_collector.iter_repodata_packages(repodata_collector),
+            )
+        else:
+            entries = list(iso_collector.iter_package_entries())
+            if self.executor is not None:
+                processed = self._iter_packages_parallel(iso_image, entries)
+            else:
+                processed = self._iter_packages_sequential(iso_collector, entries)
+
+        ### NOTE:
+        ##  Streamed packages are not kept, so the manifest can't be stored
+        manifest_entries = None if self.config.stream else []
+        manifest_packages = None if self.config.stream else []
         count = 1
-        fd_path = iso_collector.get_fd_path()
-        for _ in iso_collector.iter_packages():
-            _logger.debug(f'Processing package #{count}...')
+        for entry, pkg in processed:
+            _logger.debug(f'Processed package #{count}')
             count = count + 1
-            try:
-                pkg_from_immudb = immudb_collector.collect_package_by_package(fd_path)
-            except KeyError as e:
-                pkg_from_immudb = NullPackage
-            pkg_from_pkg = rpm_collector.collect_package_from_file(fd_path)
-            pkg_merged = pkg_from_immudb.merge(pkg_from_pkg)
-            iso.append_package(pkg_merged)
+            if manifest_entries is not None:
+                manifest_entries.append(entry)
+                manifest_packages.append(pkg)
+            yield pkg
+
+        _logger.debug(f'License strings cache: {get_licenses_cache_info()}')
+        if manifest_entries is not None:
+            iso_collector.save_manifest(manifest_entries, manifest_packages)
+
+    def _iter_cached_packages(self, iso_collector: 'IsoCollector', packages: list['Package']) -> Iterator['Package']:
+        ### NOTE:
+        ##  Packages unknown to immudb when the manifest was stored may have been
+        ##  added to immudb since then, so they are looked up again on every run
+        ##  and the manifest is updated once some of them are found.
+        found = 0
+        for i, pkg in enumerate(packages):
+            if not IsoPackageProcessor.is_found_in_immudb(pkg):
+                pkg = packages[i] = self._get_processor().refresh_from_immudb(pkg)
+                found += IsoPackageProcessor.is_found_in_immudb(pkg)
+            yield pkg
+        if found:
+            _logger.info(f'{found} packages of the cached ISO manifest are found in immudb now')
+            iso_collector.save_manifest(list(iso_collector.iter_package_entries()), packages)
+
+    def _iter_packages_sequential(
+        self,
+        iso_collector: 'IsoCollector',
+        entries: list['IsoPackageEntry'],
+    ) -> Iterator[tuple['IsoPackageEntry', 'Package']]:
+        processor = self._get_processor()
+        for entry in iso_collector.iter_with_readahead(entries):
+            yield entry, processor.process(iso_collector, entry)
 
-        return iso
+    def _iter_packages_from_repodata(
+        self,
+        iso_collector: 'IsoCollector',
+        repodata_packages: Iterator[tuple['IsoPackageEntry', Optional['Package']]],
+    ) -> Iterator[tuple['IsoPackageEntry', 'Package']]:
+        processor = self._get_processor()
+        for entry, pkg_from_repodata in repodata_packages:
+            if pkg_from_repodata is None:
+                yield entry, processor.process(iso_collector, entry)
+            else:
+                yield entry, processor.process_from_repodata(iso_collector, entry, pkg_from_repodata)
 
+    def _iter_packages_parallel(
+        self,
+        iso_image: Path,
+        entries: list['IsoPackageEntry'],
+    ) -> Iterator[tuple['IsoPackageEntry', 'Package']]:
+        _logger.info(f'Processing {len(entries)} packages with {self.config.jobs} workers')
+        ### NOTE:
+        ##  Every worker gets chunks of consecutive entries to read its part
+        ##  of the image sequentially. Executor.map returns results in the
+        ##  order of chunks, so the resulting SBOM doesn't depend on worker scheduling.
+        chunks = [
+            entries[i:i + self.WORKER_CHUNKSIZE]
+            for i in range(0, len(entries), self.WORKER_CHUNKSIZE)
+        ]
+        for chunk, packages in zip(
+            chunks,
+            self.executor.map(_process_chunk_in_worker, [iso_image] * len(chunks), chunks),
+        ):
+            yield from zip(chunk, packages)
@@ -1,8 +1,11 @@
 import argparse
+from concurrent.futures import Executor, ProcessPoolExecutor
 from logging import getLogger
-from typing import ClassVar, TYPE_CHECKING
+from pathlib import Path
+from typing import ClassVar, Iterator, Optional, TYPE_CHECKING
 
 from alma_sbom.cli.config import CommonConfig, PackageConfig
+from alma_sbom.cli.factory import CollectorFactory
 
 from .commands import SubCommand
 
@@ -11,49 +14,150 @@ from .commands import SubCommand
 #if TYPE_CHECKING:
 #    from alma_sbom.data import Package
 from alma_sbom.data import Package, NullPackage
+from alma_sbom.data.collectors.rpm import digest_file
+from alma_sbom.type import get_hash_value
+
+if TYPE_CHECKING:
+    from alma_sbom.data import ImmudbCollector, RpmCollector
 
 _logger = getLogger(__name__)
 
+class PackageProcessor:
+    immudb_collector: 'ImmudbCollector'
+    rpm_collector: 'RpmCollector'
+
+    def __init__(self, immudb_collector: 'ImmudbCollector', rpm_collector: 'RpmCollector') -> None:
+        self.immudb_collector = immudb_collector
+        self.rpm_collector = rpm_collector
+
+    @classmethod
+    def from_factory(cls, collector_factory: CollectorFactory) -> 'PackageProcessor':
+        return cls(
+            collector_factory.gen_immudb_collector(),
+            collector_factory.gen_rpm_collector(),
+        )
+
+    def process_hash(self, hash_value: str) -> 'Package':
+        try:
+            return self.immudb_collector.collect_package_by_hash(hash_value)
+        except KeyError as e:
+            raise KeyError(f'Failed to get data from immudb for hash value: {hash_value}') from e
+
+    def process_file(self, rpm_package: Path) -> 'Package':
+        ### NOTE:
+        ##  The package is hashed only once, the checksums are used both
+        ##  for immudb lookup and for package component of SBOM.
+        hashes = digest_file(rpm_package, self.rpm_collector.algorithms)
+        hash_value = get_hash_value(hashes)
+        try:
+            pkg_from_immudb = self.immudb_collector.collect_package_by_hash(hash_value)
+        except KeyError as e:
+            _logger.warning(f'Failed to get data from immudb corresponding to {rpm_package}')
+            _logger.warning(f'Create SBOM from only package data.')
+            pkg_from_immudb = NullPackage
+        pkg_from_pkg = self.rpm_collector.collect_package_from_file(rpm_package, hashes=hashes)
+        return pkg_from_immudb.merge(pkg_from_pkg)
+
+### NOTE:
+##  State of each worker process of the pool. Every worker logs in to immudb
+##  once and keeps the session for all packages it processes.
+_worker_processor: PackageProcessor = None
+
+def _init_worker(config: PackageConfig) -> None:
+    global _worker_processor
+    _worker_processor = PackageProcessor.from_factory(CollectorFactory(config))
+
+def _process_in_worker(item: tuple[str, object]) -> tuple[Optional['Package'], Optional[str]]:
+    ### NOTE:
+    ##  Errors are returned instead of raised,
+    ##  so a single broken package doesn't stop the whole batch.
+    method, arg = item
+    try:
+        return getattr(_worker_processor, method)(arg), None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+
 class PackageCommand(SubCommand):
     CONFIG_CLASS : ClassVar[type[CommonConfig]] = PackageConfig
+    WORKER_CHUNKSIZE: ClassVar[int] = 4
     config: PackageConfig
+    processor: PackageProcessor
+    executor: Executor
+
+    def __init__(self, base: CommonConfig, args: argparse.Namespace) -> None:
+        self.processor = None
+        self.executor = None
+        super().__init__(base, args)
 
     def run(self) -> int:
-        package = self.runner()
-        doc = self.document_factory.gen_from_package(package)
-        doc.write(self.config.output_file)
+        if self.config.output_dir is not None:
+            self.config.output_dir.mkdir(parents=True, exist_ok=True)
+        failed = 0
+        for name, package, error in self.runner():
+            if error is not None:
+                _logger.error(f'Failed to generate SBOM of {name}: {error}')
+                failed = failed + 1
+                continue
+            doc = self.document_factory.gen_from_package(package)
+            doc.write(self.config.get_output_file(name))
+        if failed:
+            _logger.error(f'Failed to generate SBOM of {failed} package(s)')
+            return 1
         return 0
 
     def _select_runner(self) -> None:
-        if self.config.rpm_package_hash:
-            self.runner = self._runner_with_rpm_package_hash
-        elif self.config.rpm_package:
-            self.runner = self._runner_with_rpm_package
+        if self.config.rpm_package_hashes:
+            self.runner = self._runner_with_rpm_package_hashes
+        elif self.config.rpm_packages:
+            self.runner = self._runner_with_rpm_packages
         else:
             raise RuntimeError(
                 'Unexpected situation has occurred. '
                 'Required info to generate SBOM of package has not been provided.'
             )
 
-    def _runner_with_rpm_package_hash(self) -> 'Package':
-        immudb_collector = self.collector_factory.gen_immudb_collector()
-        try:
-            return immudb_collector.collect_package_by_hash(self.config.rpm_package_hash)
-        except KeyError as e:
-            raise KeyError(f'Failed to get data from immudb for hash value: {self.config.rpm_package_hash}') from e
+    def _runner_with_rpm_package_hashes(self) -> Iterator[tuple[str, Optional['Package'], Optional[str]]]:
+        hashes = self.config.rpm_package_hashes
+        with self.collector_factory:
+            for hash_value, (package, error) in zip(hashes, self._iter_results('process_hash', hashes)):
+                yield hash_value, package, error
 
-    def _runner_with_rpm_package(self) -> 'Package':
-        immudb_collector = self.collector_factory.gen_immudb_collector()
-        rpm_collector = self.collector_factory.gen_rpm_collector()
-
-        try:
-            pkg_from_immudb = immudb_collector.collect_package_by_package(self.config.rpm_package)
-        except KeyError as e:
-            _logger.warning(f'Failed to get data from immudb corresponding to {self.config.rpm_package}')
-            _logger.warning(f'Create SBOM from only package data.')
-            pkg_from_immudb = NullPackage
-        pkg_from_pkg = rpm_collector.collect_package_from_file(self.config.rpm_package)
+    def _runner_with_rpm_packages(self) -> Iterator[tuple[str, Optional['Package'], Optional[str]]]:
+        rpm_packages = self.config.rpm_packages
+        with self.collector_factory:
+            for rpm_package, (package, error) in zip(rpm_packages, self._iter_results('process_file', rpm_packages)):
+                yield PackageConfig.get_output_name(rpm_package), package, error
 
-        pkg_merged = pkg_from_immudb.merge(pkg_from_pkg)
-        return pkg_merged
+    def _iter_results(self, method: str, args: list) -> Iterator[tuple[Optional['Package'], Optional[str]]]:
+        if len(args) == 1 and self.config.output_dir is None:
+            ### NOTE:
+            ##  A single package is processed as before, errors are raised as they are
+            yield getattr(self._get_processor(), method)(args[0]), None
+            return
+        if self.config.jobs > 1:
+            _logger.info(f'Processing {len(args)} packages with {self.config.jobs} workers')
+            with ProcessPoolExecutor(
+                max_workers=self.config.jobs,
+                initializer=_init_worker,
+                initargs=(self.config,),
+            ) as self.executor:
+                ### NOTE:
+                ##  Executor.map returns results in the order of packages,
+                ##  so output doesn't depend on worker scheduling.
+                yield from self.executor.map(
+                    _process_in_worker,
+                    [(method, arg) for arg in args],
+                    chunksize=self.WORKER_CHUNKSIZE,
+                )
+            return
+        processor = self._get_processor()
+        for arg in args:
+            try:
+                yield getattr(processor, method)(arg), None
+            except Exception as e:
+                yield None, f'{type(e).__name__}: {e}'
 
+    def _get_processor(self) -> PackageProcessor:
+        if self.processor is None:
+            self.processor = PackageProcessor.from_factory(self.collector_factory)
+        return self.processor
@@ -17,6 +17,10 @@ class BuildConfig(CommonConfig):
                 'Unexpected situation has occurred'
                 'build_id must not be empty'
             )
+        ### NOTE:
+        ##  Packages of a build are taken from immudb, which has no requires of them
+        if self.dependencies:
+            raise ValueError('Dependencies can be resolved only between packages of an ISO image')
 
     @classmethod
     def from_base(cls, base: CommonConfig, build_id: str) -> 'BuildConfig':
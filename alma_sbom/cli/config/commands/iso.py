@@ -1,32 +1,122 @@
 import argparse
 from dataclasses import dataclass
 from pathlib import Path
+from typing import ClassVar
 
 from alma_sbom.cli.config import CommonConfig
+from alma_sbom.type import Algorithms, SbomFileFormatType
 
 @dataclass
 class IsoConfig(CommonConfig):
-    iso_image: Path = None
+    PACKAGE_ACCESS_EXTRACT: ClassVar[str] = 'extract'
+    PACKAGE_ACCESS_MMAP: ClassVar[str] = 'mmap'
+    PACKAGE_ACCESS_COPY_OFFLOAD: ClassVar[str] = 'copy-offload'
+    PACKAGE_ACCESS_CHOICES: ClassVar[list[str]] = [
+        PACKAGE_ACCESS_EXTRACT,
+        PACKAGE_ACCESS_MMAP,
+        PACKAGE_ACCESS_COPY_OFFLOAD,
+    ]
+    METADATA_SOURCE_RPM: ClassVar[str] = 'rpm'
+    METADATA_SOURCE_REPODATA: ClassVar[str] = 'repodata'
+    METADATA_SOURCE_CHOICES: ClassVar[list[str]] = [
+        METADATA_SOURCE_RPM,
+        METADATA_SOURCE_REPODATA,
+    ]
+
+    iso_images: list[Path] = None
+    output_dir: Path = None
+    jobs: int = 1
+    package_access: str = PACKAGE_ACCESS_EXTRACT
+    manifest_cache_dir: Path = None
+    metadata_source: str = METADATA_SOURCE_RPM
+    verify_sample_rate: float = 0.0
+    stream: bool = False
 
     def __post_init__(self) -> None:
         self._validate()
         super().__post_init__()
 
     def _validate(self) -> None:
-        if not self.iso_image:
+        if not self.iso_images:
             raise ValueError(
                 'Unexpected situation has occurred'
-                'iso_image must not be empty'
+                'iso_images must not be empty'
+            )
+        if len(self.iso_images) > 1 and not self.output_dir:
+            raise ValueError('output_dir must be specified to generate SBOMs of several ISO images')
+        ### NOTE:
+        ##  SBOMs are named by the image names, see get_output_file
+        stems = [iso_image.stem for iso_image in self.iso_images]
+        duplicated_stems = sorted({stem for stem in stems if stems.count(stem) > 1})
+        if duplicated_stems:
+            raise ValueError(
+                'Names of ISO images must be unique, as their SBOMs are named by them, '
+                f'got several images named {", ".join(duplicated_stems)}'
             )
+        if self.jobs < 1:
+            raise ValueError(f'jobs must be a positive integer, got {self.jobs}')
+        if self.package_access not in self.PACKAGE_ACCESS_CHOICES:
+            raise ValueError(f'Unknown package access mode: {self.package_access}')
+        if self.metadata_source not in self.METADATA_SOURCE_CHOICES:
+            raise ValueError(f'Unknown metadata source: {self.metadata_source}')
+        if not 0.0 <= self.verify_sample_rate <= 1.0:
+            raise ValueError(f'verify_sample_rate must be between 0 and 1, got {self.verify_sample_rate}')
+        if self.rpm_files and self.metadata_source == self.METADATA_SOURCE_REPODATA:
+            raise ValueError('Files of RPM packages are not available with repodata as metadata source')
+        if self.metadata_source == self.METADATA_SOURCE_REPODATA and any(
+            alg != Algorithms.SHA_256 for alg in self.hash_algorithms or []
+        ):
+            raise ValueError('Only SHA-256 checksums of RPM packages are available with repodata as metadata source')
+        if self.dependencies and self.stream:
+            raise ValueError('Dependencies can\'t be resolved while SBOM is streamed')
+        if self.stream and self.sbom_type.file_format_type != SbomFileFormatType.JSON:
+            raise ValueError(f'Streaming SBOM is supported only in JSON, not in {self.sbom_type.file_format_type.value}')
 
     @classmethod
-    def from_base(cls, base: CommonConfig, iso_image: Path) -> 'BuildConfig':
+    def from_base(
+        cls,
+        base: CommonConfig,
+        iso_images: list[Path],
+        output_dir: Path = None,
+        jobs: int = 1,
+        package_access: str = PACKAGE_ACCESS_EXTRACT,
+        manifest_cache_dir: Path = None,
+        metadata_source: str = METADATA_SOURCE_RPM,
+        verify_sample_rate: float = 0.0,
+        stream: bool = False,
+    ) -> 'BuildConfig':
         base_fields = vars(base)
-        return cls(**base_fields, iso_image=iso_image)
+        return cls(
+            **base_fields,
+            iso_images=iso_images,
+            output_dir=output_dir,
+            jobs=jobs,
+            package_access=package_access,
+            manifest_cache_dir=manifest_cache_dir,
+            metadata_source=metadata_source,
+            verify_sample_rate=verify_sample_rate,
+            stream=stream,
+        )
 
     @classmethod
     def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'BuildConfig':
-        return cls.from_base(base, iso_image=Path(args.iso_image))
+        return cls.from_base(
+            base,
+            iso_images=[Path(iso_image) for iso_image in args.iso_image],
+            output_dir=args.output_dir and Path(args.output_dir),
+            jobs=args.jobs,
+            package_access=args.package_access,
+            manifest_cache_dir=args.manifest_cache_dir and Path(args.manifest_cache_dir),
+            metadata_source=args.metadata_source,
+            verify_sample_rate=args.verify_sample_rate,
+            stream=args.stream,
+        )
+
+    def get_output_file(self, iso_image: Path) -> Path:
+        if self.output_dir is None:
+            return self.output_file
+        record_type, file_format_type = self.sbom_type.values()
+        return self.output_dir / f'{iso_image.stem}.{record_type.value}.{file_format_type.value}'
 
     @staticmethod
     def add_arguments(parser: argparse._SubParsersAction) -> None:
@@ -34,6 +124,84 @@ class IsoConfig(CommonConfig):
         build_parser.add_argument(
             '--iso-image',
             type=str,
-            help='Path to AlmaLinux installer ISO9660 image',
+            action='append',
+            help=(
+                'Path to AlmaLinux installer ISO9660 image. '
+                'Can be specified several times to generate SBOM of each image'
+            ),
             required=True,
         )
+        build_parser.add_argument(
+            '--output-dir',
+            type=str,
+            help=(
+                'Directory to write SBOM of each ISO image to, instead of '
+                '--output-file. Required if several ISO images are specified'
+            ),
+            required=False,
+        )
+        build_parser.add_argument(
+            '--jobs',
+            type=int,
+            help=(
+                'Number of worker processes used to process packages '
+                'in the ISO image (default: %(default)s)'
+            ),
+            required=False,
+            default=1,
+        )
+        build_parser.add_argument(
+            '--package-access',
+            choices=IsoConfig.PACKAGE_ACCESS_CHOICES,
+            help=(
+                'How packages are read from the ISO image. "extract" copies '
+                'every package out of the image, "mmap" reads packages in place '
+                'from the memory mapped image without copying, "copy-offload" '
+                'lets the kernel copy every package out of the image '
+                '(default: %(default)s)'
+            ),
+            required=False,
+            default=IsoConfig.PACKAGE_ACCESS_EXTRACT,
+        )
+        build_parser.add_argument(
+            '--manifest-cache-dir',
+            type=str,
+            help=(
+                'Directory to keep manifests of processed ISO images in. '
+                'Repeated runs against an unchanged image reuse its manifest '
+                'instead of reading the image. Manifests are neither used '
+                'nor stored if not specified'
+            ),
+            required=False,
+        )
+        build_parser.add_argument(
+            '--metadata-source',
+            choices=IsoConfig.METADATA_SOURCE_CHOICES,
+            help=(
+                'Where package data is taken from. "rpm" reads every package, '
+                '"repodata" parses primary.xml of each variant instead of '
+                'opening packages (default: %(default)s)'
+            ),
+            required=False,
+            default=IsoConfig.METADATA_SOURCE_RPM,
+        )
+        build_parser.add_argument(
+            '--verify-sample-rate',
+            type=float,
+            help=(
+                'Fraction of packages, between 0 and 1, which are re-hashed to verify '
+                'checksums taken from repodata (default: %(default)s)'
+            ),
+            required=False,
+            default=0.0,
+        )
+        build_parser.add_argument(
+            '--stream',
+            help=(
+                'Write every package to the SBOM as soon as it is processed '
+                'instead of building the whole document in memory. '
+                'Supported only for JSON SBOMs, ISO manifests are not stored in this mode'
+            ),
+            required=False,
+            action='store_true',
+        )
@@ -1,42 +1,130 @@
 import argparse
+import glob
 import os
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from typing import ClassVar
 
 from alma_sbom.cli.config import CommonConfig
 
 @dataclass
 class PackageConfig(CommonConfig):
-    rpm_package_hash: str = None
-    rpm_package: Path = None
+    RPM_PACKAGE_SUFFIX: ClassVar[str] = '.rpm'
+
+    rpm_package_hashes: list[str] = None
+    rpm_packages: list[Path] = None
+    output_dir: Path = None
+    jobs: int = 1
 
     def __post_init__(self) -> None:
         self._validate()
         super().__post_init__()
 
     def _validate(self) -> None:
-        if (self.rpm_package_hash is None and self.rpm_package is None) or \
-           (self.rpm_package_hash is not None and self.rpm_package is not None):
+        if bool(self.rpm_package_hashes) == bool(self.rpm_packages):
             raise ValueError(
                 'Unexpected situation has occurred. '
-                'Either rpm_package_hash or rpm_package must be specified.'
+                'Either rpm_package_hashes or rpm_packages must be specified.'
+            )
+        for rpm_package in self.rpm_packages or []:
+            if not rpm_package.exists():
+                raise FileNotFoundError(f"File '{rpm_package}' not found")
+        if len(self.rpm_package_hashes or self.rpm_packages) > 1 and not self.output_dir:
+            raise ValueError('output_dir must be specified to generate SBOMs of several packages')
+        ### NOTE:
+        ##  SBOMs are named by the package file names, see get_output_name
+        names = [self.get_output_name(rpm_package) for rpm_package in self.rpm_packages or []]
+        duplicated_names = sorted({name for name in names if names.count(name) > 1})
+        if duplicated_names:
+            raise ValueError(
+                'Names of RPM packages must be unique, as their SBOMs are named by them, '
+                f'got several packages named {", ".join(duplicated_names)}'
             )
-        if self.rpm_package and not self.rpm_package.exists():
-            raise FileNotFoundError(f"File '{self.rpm_package}' not found")
+        if self.jobs < 1:
+            raise ValueError(f'jobs must be a positive integer, got {self.jobs}')
+        if self.dependencies:
+            raise ValueError('Dependencies can be resolved only between packages of an ISO image')
 
     @classmethod
-    def from_base(cls, base: CommonConfig, rpm_package_hash: str, rpm_package: Path) -> 'PackageConfig':
+    def get_output_name(cls, rpm_package: Path) -> str:
+        return rpm_package.name.removesuffix(cls.RPM_PACKAGE_SUFFIX)
+
+    def get_output_file(self, name: str) -> Path:
+        if self.output_dir is None:
+            return self.output_file
+        record_type, file_format_type = self.sbom_type.values()
+        return self.output_dir / f'{name}.{record_type.value}.{file_format_type.value}'
+
+    @classmethod
+    def from_base(
+        cls,
+        base: CommonConfig,
+        rpm_package_hashes: list[str],
+        rpm_packages: list[Path],
+        output_dir: Path = None,
+        jobs: int = 1,
+    ) -> 'PackageConfig':
         base_fields = vars(base)
-        return cls(**base_fields, rpm_package_hash=rpm_package_hash, rpm_package=rpm_package)
+        return cls(
+            **base_fields,
+            rpm_package_hashes=rpm_package_hashes,
+            rpm_packages=rpm_packages,
+            output_dir=output_dir,
+            jobs=jobs,
+        )
 
     @classmethod
     def from_base_args(cls, base: CommonConfig, args: argparse.Namespace) -> 'PackageConfig':
+        rpm_package_hashes = list(args.rpm_package_hash or [])
+        if args.rpm_package_hash_file:
+            rpm_package_hashes += cls._read_hash_file(Path(args.rpm_package_hash_file))
+        ### NOTE:
+        ##  A package given several times gets a single SBOM
+        rpm_package_hashes = list(dict.fromkeys(rpm_package_hashes))
         return cls.from_base(
             base,
-            rpm_package_hash=args.rpm_package_hash,
-            rpm_package=args.rpm_package and Path(args.rpm_package)
+            rpm_package_hashes=rpm_package_hashes,
+            rpm_packages=cls._expand_rpm_packages(args.rpm_package or []),
+            output_dir=args.output_dir and Path(args.output_dir),
+            jobs=args.jobs,
         )
 
+    @classmethod
+    def _expand_rpm_packages(cls, patterns: list[str]) -> list[Path]:
+        """
+        Expands directories and glob patterns into RPM package files, keeping plain files as they are.
+        Files found several times (e.g. by a directory and a glob pattern) are taken once.
+        """
+        rpm_packages = []
+        for pattern in patterns:
+            path = Path(pattern)
+            if path.is_dir():
+                matches = sorted(p for p in path.rglob(f'*{cls.RPM_PACKAGE_SUFFIX}') if p.is_file())
+                if not matches:
+                    raise FileNotFoundError(f"No RPM packages found in '{pattern}'")
+                rpm_packages += matches
+            elif glob.has_magic(pattern):
+                matches = sorted(
+                    Path(p) for p in glob.glob(pattern, recursive=True)
+                    if p.endswith(cls.RPM_PACKAGE_SUFFIX) and os.path.isfile(p)
+                )
+                if not matches:
+                    raise FileNotFoundError(f"No RPM packages match '{pattern}'")
+                rpm_packages += matches
+            else:
+                rpm_packages.append(path)
+        unique_rpm_packages = {}
+        for rpm_package in rpm_packages:
+            unique_rpm_packages.setdefault(rpm_package.resolve(), rpm_package)
+        return list(unique_rpm_packages.values())
+
+    @staticmethod
+    def _read_hash_file(hash_file: Path) -> list[str]:
+        """Reads SHA256 hashes of RPM packages, one per line. Empty lines and comments are skipped"""
+        with open(hash_file, 'r') as fd:
+            lines = [line.split('#', 1)[0].strip() for line in fd]
+        return [line for line in lines if line]
+
     @staticmethod
     def add_arguments(parser: argparse._SubParsersAction) -> None:
         package_parser = parser.add_parser('package', help='Generate package SBOM')
@@ -44,11 +132,42 @@ class PackageConfig(CommonConfig):
         object_id_group.add_argument(
             '--rpm-package-hash',
             type=str,
-            help='SHA256 hash of an RPM package',
+            action='append',
+            help=(
+                'SHA256 hash of an RPM package. '
+                'Can be specified several times to generate SBOM of each package'
+            ),
+        )
+        object_id_group.add_argument(
+            '--rpm-package-hash-file',
+            type=str,
+            help='File with SHA256 hashes of RPM packages, one per line',
         )
         object_id_group.add_argument(
             '--rpm-package',
             type=str,
-            help='path to an RPM package',
+            action='append',
+            help=(
+                'Path to an RPM package, a directory with RPM packages or a glob pattern. '
+                'Can be specified several times to generate SBOM of each package'
+            ),
+        )
+        package_parser.add_argument(
+            '--output-dir',
+            type=str,
+            help=(
+                'Directory to write SBOM of each package to, instead of '
+                '--output-file. Required if several packages are specified'
+            ),
+            required=False,
+        )
+        package_parser.add_argument(
+            '--jobs',
+            type=int,
+            help=(
+                'Number of worker processes used to process packages. '
+                'Each worker keeps its own immudb session (default: %(default)s)'
+            ),
+            required=False,
+            default=1,
         )
-
@@ -6,7 +6,8 @@ from logging import getLogger
 from pathlib import Path
 from immudb_wrapper import ImmudbWrapper
 
-from alma_sbom.type import SbomType
+from alma_sbom.type import SbomType, SbomRecordType, Algorithms
+from alma_sbom.data.collectors.albs import AlbsCollector
 
 _logger = getLogger(__name__)
 
@@ -19,6 +20,8 @@ class CommonConfig:
 
     ### ALBS defaults ###
     DEF_ALBS_URL: ClassVar[str] = 'https://build.almalinux.org'
+    DEF_ALBS_TIMEOUT: ClassVar[float] = AlbsCollector.DEF_TIMEOUT
+    DEF_ALBS_RETRIES: ClassVar[int] = AlbsCollector.DEF_RETRIES
 
     ### immudb defaults ###
     DEF_IMMUDB_USERNAME: ClassVar[str] = os.getenv('IMMUDB_USERNAME') or ImmudbWrapper.read_only_username()
@@ -26,6 +29,21 @@ class CommonConfig:
     DEF_IMMUDB_DATABASE: ClassVar[str] = os.getenv('IMMUDB_DATABASE') or ImmudbWrapper.almalinux_database_name()
     DEF_IMMUDB_ADDRESS: ClassVar[str] = os.getenv('IMMUDB_ADDRESS') or ImmudbWrapper.almalinux_database_address()
     DEF_IMMUDB_PUBLIC_KEY_FILE: ClassVar[str] = os.getenv('IMMUDB_PUBLIC_KEY_FILE')
+    DEF_IMMUDB_MAX_IN_FLIGHT: ClassVar[int] = 8
+    DEF_IMMUDB_POOL_SIZE: ClassVar[int] = 8
+    DEF_IMMUDB_CACHE_FILE: ClassVar[str] = str(
+        Path(os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache') / 'alma-sbom' / 'immudb.sqlite'
+    )
+    DEF_IMMUDB_NEGATIVE_TTL: ClassVar[float] = 3600.0
+    DEF_IMMUDB_POSITIVE_TTL: ClassVar[float] = 604800.0
+
+    ### RPM defaults ###
+    RPM_HEADER_PARSER_LIBRPM: ClassVar[str] = 'librpm'
+    RPM_HEADER_PARSER_PYTHON: ClassVar[str] = 'python'
+    RPM_HEADER_PARSER_CHOICES: ClassVar[list[str]] = [
+        RPM_HEADER_PARSER_LIBRPM,
+        RPM_HEADER_PARSER_PYTHON,
+    ]
 
     ### output related settings ###
     output_file: Path
@@ -41,6 +59,28 @@ class CommonConfig:
     immudb_address: str
     immudb_public_key_file: str
 
+    ### RPM settings ###
+    rpm_header_parser: str = RPM_HEADER_PARSER_LIBRPM
+    hash_algorithms: list[Algorithms] = None
+    rpm_files: bool = False
+    dependencies: bool = False
+
+    ### immudb tuning ###
+    immudb_max_in_flight: int = DEF_IMMUDB_MAX_IN_FLIGHT
+    immudb_cache_file: Path = None
+    immudb_negative_ttl: float = DEF_IMMUDB_NEGATIVE_TTL
+    immudb_positive_ttl: float = DEF_IMMUDB_POSITIVE_TTL
+    immudb_deferred_verification: bool = False
+    immudb_pool_size: int = DEF_IMMUDB_POOL_SIZE
+
+    ### ALBS tuning ###
+    albs_timeout: float = DEF_ALBS_TIMEOUT
+    albs_retries: int = DEF_ALBS_RETRIES
+
+    ### recording settings ###
+    record_dir: Path = None
+    replay_dir: Path = None
+
     @classmethod
     def from_str(
         cls,
@@ -54,6 +94,20 @@ class CommonConfig:
         sbom_type_str: str = None,
         sbom_record_type: str = None,
         sbom_file_format_type: str = None,
+        rpm_header_parser: str = RPM_HEADER_PARSER_LIBRPM,
+        hash_algorithms: list[str] = None,
+        rpm_files: bool = False,
+        dependencies: bool = False,
+        immudb_max_in_flight: int = DEF_IMMUDB_MAX_IN_FLIGHT,
+        immudb_cache_file: str = None,
+        immudb_negative_ttl: float = DEF_IMMUDB_NEGATIVE_TTL,
+        immudb_positive_ttl: float = DEF_IMMUDB_POSITIVE_TTL,
+        immudb_deferred_verification: bool = False,
+        immudb_pool_size: int = DEF_IMMUDB_POOL_SIZE,
+        albs_timeout: float = DEF_ALBS_TIMEOUT,
+        albs_retries: int = DEF_ALBS_RETRIES,
+        record_dir: str = None,
+        replay_dir: str = None,
     ) -> 'CommonConfig':
         if sbom_type_str:
             sbom_type = SbomType.from_str(sbom_type_str)
@@ -73,6 +127,20 @@ class CommonConfig:
             immudb_database,
             immudb_address,
             immudb_public_key_file,
+            rpm_header_parser,
+            [Algorithms.from_str(alg) for alg in hash_algorithms or []],
+            rpm_files,
+            dependencies,
+            immudb_max_in_flight,
+            immudb_cache_file and Path(immudb_cache_file),
+            immudb_negative_ttl,
+            immudb_positive_ttl,
+            immudb_deferred_verification,
+            immudb_pool_size,
+            albs_timeout,
+            albs_retries,
+            record_dir and Path(record_dir),
+            replay_dir and Path(replay_dir),
         )
 
     @classmethod
@@ -86,16 +154,55 @@ class CommonConfig:
             args.immudb_address,
             args.immudb_public_key_file,
             sbom_type_str = args.file_format,
+            rpm_header_parser = args.rpm_header_parser,
+            hash_algorithms = args.hash_algorithm,
+            rpm_files = args.rpm_files,
+            dependencies = args.dependencies,
+            immudb_max_in_flight = args.immudb_max_in_flight,
+            immudb_cache_file = args.immudb_cache_file,
+            immudb_negative_ttl = args.immudb_negative_ttl,
+            immudb_positive_ttl = args.immudb_positive_ttl,
+            immudb_deferred_verification = args.immudb_deferred_verification,
+            immudb_pool_size = args.immudb_pool_size,
+            albs_timeout = args.albs_timeout,
+            albs_retries = args.albs_retries,
+            record_dir = args.record,
+            replay_dir = args.replay,
         )
 
     def __post_init__(self):
-        pass
+        ### NOTE:
+        ##  SHA256 checksum is always computed, packages are looked up in immudb by it
+        self.hash_algorithms = [Algorithms.SHA_256] + [
+            alg for alg in dict.fromkeys(self.hash_algorithms or []) if alg != Algorithms.SHA_256
+        ]
+        ### NOTE:
+        ##  SPDX 2.3 requires SHA1 checksum of every file, while headers
+        ##  of EL8+ packages only hold SHA256 digests of their files.
+        if self.rpm_files and self.sbom_type.record_type != SbomRecordType.CYCLONEDX:
+            raise ValueError('Files of RPM packages can be put only into CycloneDX SBOM')
+        if self.immudb_max_in_flight < 1:
+            raise ValueError(f'immudb_max_in_flight must be a positive integer, got {self.immudb_max_in_flight}')
+        if self.immudb_pool_size < 1:
+            raise ValueError(f'immudb_pool_size must be a positive integer, got {self.immudb_pool_size}')
+        if self.albs_timeout <= 0:
+            raise ValueError(f'albs_timeout must be positive, got {self.albs_timeout}')
+        if self.albs_retries < 0:
+            raise ValueError(f'albs_retries must not be negative, got {self.albs_retries}')
+        if self.record_dir and self.replay_dir:
+            raise ValueError('Responses can\'t be recorded and replayed at the same time')
+        if self.immudb_negative_ttl < 0:
+            raise ValueError(f'immudb_negative_ttl must not be negative, got {self.immudb_negative_ttl}')
+        if self.immudb_positive_ttl < 0:
+            raise ValueError(f'immudb_positive_ttl must not be negative, got {self.immudb_positive_ttl}')
 
     @classmethod
     def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
         cls._add_output_arguments(parser)
         cls._add_albs_arguments(parser)
         cls._add_immudb_arguments(parser)
+        cls._add_rpm_arguments(parser)
+        cls._add_recording_arguments(parser)
 
     @classmethod
     def _add_output_arguments(cls, parser: argparse.ArgumentParser) -> None:
@@ -125,6 +232,21 @@ class CommonConfig:
             help='Override ALBS url',
             default=cls.DEF_ALBS_URL,
         )
+        parser.add_argument(
+            '--albs-timeout',
+            type=float,
+            help='Seconds to wait for ALBS to connect and to respond (default: %(default)s)',
+            default=cls.DEF_ALBS_TIMEOUT,
+        )
+        parser.add_argument(
+            '--albs-retries',
+            type=int,
+            help=(
+                'Times to retry a request to ALBS which failed to connect '
+                'or got 429 or 5xx, with jittered exponential backoff (default: %(default)s)'
+            ),
+            default=cls.DEF_ALBS_RETRIES,
+        )
 
     @classmethod
     def _add_immudb_arguments(cls, parser: argparse.ArgumentParser) -> None:
@@ -178,6 +300,136 @@ class CommonConfig:
             required=False,
             default=cls.DEF_IMMUDB_PUBLIC_KEY_FILE
         )
+        parser.add_argument(
+            '--immudb-max-in-flight',
+            type=int,
+            help=(
+                'Maximum number of immudb lookups running at once when '
+                'packages of a build are collected (default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_IMMUDB_MAX_IN_FLIGHT,
+        )
+        parser.add_argument(
+            '--immudb-pool-size',
+            type=int,
+            help=(
+                'Maximum number of logged-in immudb clients shared by all lookups '
+                'of a process, lookups wait for a free client beyond it (default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_IMMUDB_POOL_SIZE,
+        )
+        parser.add_argument(
+            '--immudb-cache-file',
+            type=str,
+            help=(
+                'SQLite database to keep immudb records of packages in, '
+                'keyed by the immudb address, database and user they were read from '
+                '(default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_IMMUDB_CACHE_FILE,
+        )
+        parser.add_argument(
+            '--no-immudb-cache',
+            help='Neither use nor store cached immudb records',
+            required=False,
+            action='store_const', dest='immudb_cache_file', const=None,
+        )
+        parser.add_argument(
+            '--immudb-negative-ttl',
+            type=float,
+            help=(
+                'Seconds to remember that a package is not found in immudb, '
+                '0 to look it up on every run (default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_IMMUDB_NEGATIVE_TTL,
+        )
+        parser.add_argument(
+            '--immudb-positive-ttl',
+            type=float,
+            help=(
+                'Seconds to keep a cached immudb record of a package before it is looked up again, '
+                '0 to look it up on every run (default: %(default)s)'
+            ),
+            required=False,
+            default=cls.DEF_IMMUDB_POSITIVE_TTL,
+        )
+        parser.add_argument(
+            '--immudb-deferred-verification',
+            help=(
+                'Read all immudb records of a build without proofs first, '
+                'then verify them together against a single immudb state. '
+                'Fails if any of the records does not verify'
+            ),
+            required=False,
+            action='store_true',
+        )
+
+    @classmethod
+    def _add_recording_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        recording_group = parser.add_mutually_exclusive_group()
+        recording_group.add_argument(
+            '--record',
+            type=str,
+            metavar='DIR',
+            help='Record every response of immudb and ALBS into a bundle in DIR',
+            required=False,
+        )
+        recording_group.add_argument(
+            '--replay',
+            type=str,
+            metavar='DIR',
+            help=(
+                'Take responses of immudb and ALBS from the bundle recorded '
+                'into DIR by --record, without any network access'
+            ),
+            required=False,
+        )
+
+    @classmethod
+    def _add_rpm_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            '--rpm-header-parser',
+            choices=cls.RPM_HEADER_PARSER_CHOICES,
+            help=(
+                'How headers of RPM packages are read. "librpm" uses the rpm '
+                'Python bindings, "python" uses the built-in parser which '
+                'doesn\'t need librpm (default: %(default)s)'
+            ),
+            required=False,
+            default=cls.RPM_HEADER_PARSER_LIBRPM,
+        )
+        parser.add_argument(
+            '--hash-algorithm',
+            choices=Algorithms.choices(),
+            action='append',
+            help=(
+                'Checksum of RPM packages to put into SBOM in addition to SHA-256. '
+                'Can be specified several times, all checksums are computed '
+                'in a single read of the package'
+            ),
+            required=False,
+        )
+        parser.add_argument(
+            '--rpm-files',
+            action='store_true',
+            help=(
+                'Put regular files of RPM packages with their sizes and digests into SBOM. '
+                'Files are taken from package headers, payloads are not extracted. '
+                'Only supported by CycloneDX formats'
+            ),
+        )
+        parser.add_argument(
+            '--dependencies',
+            action='store_true',
+            help=(
+                'Resolve requires of RPM packages to the packages providing them '
+                'and put the dependencies into SBOM of an ISO image'
+            ),
+        )
 
     # TODO: Implement creator options, see: https://github.com/AlmaLinux/alma-sbom/issues/52
 
@@ -1,34 +1,116 @@
+from pathlib import Path
+from typing import Optional
+
+import requests
+
 from alma_sbom.cli.config import CommonConfig
 from alma_sbom.data import (
     ImmudbCollector,
     AlbsCollector,
     RpmCollector,
     IsoCollector,
+    RepodataCollector,
 )
+from alma_sbom.data.collectors.http import make_session
+from alma_sbom.data.collectors.immudb.cache import ImmudbRecordCache
+from alma_sbom.data.collectors.immudb.pool import ImmudbClientPool
+from alma_sbom.data.collectors.iso_manifest import IsoManifestCache
+from alma_sbom.data.collectors.recording import ResponseBundle
 
 class CollectorFactory:
     config: CommonConfig
+    ### NOTE:
+    ##  All collectors of a process record into (or replay from) the same bundle
+    response_bundle: Optional[ResponseBundle]
+    ### NOTE:
+    ##  immudb clients are logged in once and reused by all immudb collectors
+    ##  of a process. Worker processes of --jobs have factories (and pools) of their own,
+    ##  as gRPC channels can't be shared across fork.
+    immudb_client_pool: Optional[ImmudbClientPool]
+    ### NOTE:
+    ##  Connections to ALBS are kept alive and reused by all ALBS collectors of a process
+    albs_session: Optional[requests.Session]
 
     def __init__(self, config: CommonConfig):
         self.config = config
+        self.immudb_client_pool = None
+        self.albs_session = None
+        self.response_bundle = None
+        if config.record_dir:
+            self.response_bundle = ResponseBundle(config.record_dir)
+        elif config.replay_dir:
+            self.response_bundle = ResponseBundle(config.replay_dir, replay=True)
+
+    def __enter__(self) -> 'CollectorFactory':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the response bundle, the immudb clients and the ALBS connections of the collectors"""
+        if self.response_bundle is not None:
+            self.response_bundle.close()
+        if self.immudb_client_pool is not None:
+            self.immudb_client_pool.close()
+        if self.albs_session is not None:
+            self.albs_session.close()
 
     def gen_immudb_collector(self) -> ImmudbCollector:
+        if self.immudb_client_pool is None and not self.config.replay_dir:
+            self.immudb_client_pool = ImmudbClientPool(
+                username=self.config.immudb_username,
+                password=self.config.immudb_password,
+                database=self.config.immudb_database,
+                immudb_address=self.config.immudb_address,
+                public_key_file=self.config.immudb_public_key_file,
+                max_size=self.config.immudb_pool_size,
+            )
         return ImmudbCollector(
              username=self.config.immudb_username,
              password=self.config.immudb_password,
              database=self.config.immudb_database,
              immudb_address=self.config.immudb_address,
              public_key_file=self.config.immudb_public_key_file,
+             max_in_flight=self.config.immudb_max_in_flight,
+             record_cache=ImmudbRecordCache(
+                 self.config.immudb_cache_file,
+                 self.config.immudb_negative_ttl,
+                 self.config.immudb_positive_ttl,
+             ) if self.config.immudb_cache_file else None,
+             deferred_verification=self.config.immudb_deferred_verification,
+             response_bundle=self.response_bundle,
+             client_pool=self.immudb_client_pool,
         )
 
     def gen_albs_collector(self) -> AlbsCollector:
+        if self.albs_session is None:
+            self.albs_session = make_session(retries=self.config.albs_retries)
         return AlbsCollector(
             albs_url=self.config.albs_url,
+            response_bundle=self.response_bundle,
+            session=self.albs_session,
+            timeout=self.config.albs_timeout,
         )
 
     def gen_rpm_collector(self) -> RpmCollector:
-        return RpmCollector()
+        return RpmCollector(
+            use_librpm=self.config.rpm_header_parser == CommonConfig.RPM_HEADER_PARSER_LIBRPM,
+            algorithms=self.config.hash_algorithms,
+            collect_files=self.config.rpm_files,
+            collect_dependencies=self.config.dependencies,
+        )
 
-    def gen_iso_collector(self) -> IsoCollector:
-        return IsoCollector()
+    def gen_iso_collector(self, manifest_cache_dir: Path = None, metadata_source: str = 'rpm') -> IsoCollector:
+        return IsoCollector(
+            manifest_cache=IsoManifestCache(manifest_cache_dir) if manifest_cache_dir else None,
+            algorithms=self.config.hash_algorithms,
+            collect_files=self.config.rpm_files,
+            collect_dependencies=self.config.dependencies,
+            metadata_source=metadata_source,
+        )
 
+    def gen_repodata_collector(self) -> RepodataCollector:
+        return RepodataCollector(
+            collect_dependencies=self.config.dependencies,
+        )
@@ -1,4 +1,5 @@
-from typing import Any
+from pathlib import Path
+from typing import Any, Iterable
 
 from alma_sbom.cli.config import CommonConfig
 from alma_sbom.formats import (
@@ -23,3 +24,5 @@ class DocumentFactory:
     def gen_from_iso(self, iso: Any) -> Document:
         return self.document_class.from_iso(iso, self.config.sbom_type.file_format_type)
 
+    def stream_from_iso(self, iso: Any, packages: Iterable[Any], output_file: Path) -> None:
+        self.document_class.stream_iso(iso, packages, self.config.sbom_type.file_format_type, output_file)
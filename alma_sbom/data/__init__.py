@@ -1,3 +1,3 @@
 from .models import Package, NullPackage, Build, PackageNevra, Iso
-from .collectors import ImmudbCollector, AlbsCollector, RpmCollector, IsoCollector
+from .collectors import ImmudbCollector, AlbsCollector, RpmCollector, IsoCollector, RepodataCollector
 from .attributes import Property
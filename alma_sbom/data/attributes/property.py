@@ -29,6 +29,16 @@ class BuildSourceProperties(PropertyMixin):
     def to_properties(self) -> list[Property]:
         return self._create_properties()
 
+    @staticmethod
+    def from_dict(data: dict) -> 'BuildSourceProperties':
+        """Restore source properties of the proper source_type from the output of dataclasses.asdict"""
+        fields = {k: v for k, v in data.items() if k != 'source_type'}
+        if data['source_type'] == 'git':
+            return GitSourceProperties(**fields)
+        elif data['source_type'] == 'srpm':
+            return SrpmSourceProperties(**fields)
+        raise ValueError(f"Unknown source_type: {data['source_type']}")
+
 @dataclass
 class GitSourceProperties(BuildSourceProperties):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
@@ -106,6 +116,14 @@ class BuildPropertiesForPackage(BuildPropertiesBase):
     def to_properties(self) -> list[Property]:
         return self._create_properties() + (self.source.to_properties() if self.source is not None else [])
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BuildPropertiesForPackage':
+        source = data.get('source')
+        return cls(**{
+            **data,
+            'source': BuildSourceProperties.from_dict(source) if source is not None else None,
+        })
+
 @dataclass
 class BuildPropertiesForBuild(BuildPropertiesBase):
     PROPERTY_KEYS: ClassVar[dict[str, str]] = {
@@ -2,3 +2,4 @@ from .immudb import ImmudbCollector
 from .albs import AlbsCollector
 from .rpm import RpmCollector
 from .iso import IsoCollector
+from .repodata import RepodataCollector
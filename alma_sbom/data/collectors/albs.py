@@ -1,19 +1,42 @@
 import requests
+import time
 from logging import getLogger
-from typing import ClassVar, Iterator
+from typing import ClassVar, Iterator, Optional
 
 from alma_sbom.data import Build
 from alma_sbom.data.attributes.property import BuildPropertiesForBuild as BuildProperties
 
+from .http import RequestMetrics, make_session
+from .recording import ResponseBundle
+
 _logger = getLogger(__name__)
 
 class AlbsCollector:
+    DEF_TIMEOUT: ClassVar[float] = 60.0
+    DEF_RETRIES: ClassVar[int] = 5
+
     albs_url: str
     package_hash_list: list[str]
+    response_bundle: Optional[ResponseBundle]
+    ### NOTE:
+    ##  The session (and its connections) can be shared with other collectors, see CollectorFactory
+    session: requests.Session
+    timeout: float
+    metrics: RequestMetrics
 
-    def __init__(self, albs_url) -> None:
+    def __init__(
+        self,
+        albs_url,
+        response_bundle: ResponseBundle = None,
+        session: requests.Session = None,
+        timeout: float = DEF_TIMEOUT,
+    ) -> None:
         self.albs_url = albs_url
         self.package_hash_list = None
+        self.response_bundle = response_bundle
+        self.session = session or make_session(retries=self.DEF_RETRIES)
+        self.timeout = timeout
+        self.metrics = RequestMetrics()
 
     def collect_build_by_id(self, build_id: str) -> Build:
         build_info = self._extract_build_info_by_id(build_id)
@@ -51,11 +74,36 @@ class AlbsCollector:
             )
 
     def _extract_build_info_by_id(self, build_id: str) -> dict:
-        response = requests.get(
-            url=f'{self._get_albs_builds_endpoint()}/{build_id}',
-        )
-        response.raise_for_status()
-        return response.json()
+        if self.response_bundle is not None and self.response_bundle.replay:
+            return self.response_bundle.load(ResponseBundle.KIND_ALBS, str(build_id))
+        build_info = self._get(f'{self._get_albs_builds_endpoint()}/{build_id}')
+        if self.response_bundle is not None:
+            self.response_bundle.save(ResponseBundle.KIND_ALBS, str(build_id), build_info)
+        return build_info
+
+    def _get(self, url: str) -> dict:
+        start = time.perf_counter()
+        response = None
+        failed = True
+        try:
+            response = self.session.get(url=url, timeout=self.timeout)
+            response.raise_for_status()
+            ### NOTE:
+            ##  A response which isn't JSON (e.g. an error page of a proxy) is failed too
+            body = response.json()
+            failed = False
+            return body
+        finally:
+            latency = time.perf_counter() - start
+            ### NOTE:
+            ##  Retries which ended with an exception aren't known, they're counted as none
+            retry = getattr(response.raw, 'retries', None) if response is not None else None
+            retries = len(retry.history) if retry is not None else 0
+            self.metrics.add(latency, retries, failed=failed)
+            _logger.debug(
+                f'GET {url}: {response.status_code if response is not None else "failed"} '
+                f'in {latency:.3f}s, {retries} retries'
+            )
 
     def _make_BuildProperties_from_build_info(self, build_info: dict) -> BuildProperties:
         return BuildProperties(
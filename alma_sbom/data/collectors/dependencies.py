@@ -0,0 +1,57 @@
+import re
+from logging import getLogger
+from typing import Iterable
+
+from alma_sbom.type import get_hash_value
+from alma_sbom.data.models import Package
+
+_logger = getLogger(__name__)
+
+### NOTE:
+##  Files which other packages may require by path. The same set of files
+##  is listed in primary.xml by createrepo, so packages read from headers and
+##  from repodata provide the same paths.
+##  See https://github.com/rpm-software-management/createrepo_c/blob/master/src/misc.c
+PRIMARY_FILE_RE = re.compile(r'^(/etc/.*|.*bin/.*|/usr/lib/sendmail)$')
+
+### NOTE:
+##  Requirements satisfied by rpm itself rather than by other packages
+_RPMLIB_PREFIX = 'rpmlib('
+
+def is_primary_file(path: str) -> bool:
+    return PRIMARY_FILE_RE.match(path) is not None
+
+def is_package_requirement(name: str) -> bool:
+    return not name.startswith(_RPMLIB_PREFIX)
+
+def resolve_dependencies(packages: Iterable[Package]) -> None:
+    """
+    Sets dependencies of each package to SHA256 checksums of the packages
+    providing its requirements. All provides are put into a single index
+    first, so every requirement is resolved by one lookup. A capability
+    provided by several packages is resolved to the first of them.
+    Requirements provided by the package itself or by none of the packages
+    are left out.
+    """
+    packages = list(packages)
+    providers = {}
+    for pkg in packages:
+        hash_value = get_hash_value(pkg.hashs)
+        for name in pkg.provides or []:
+            providers.setdefault(name, hash_value)
+
+    unresolved = 0
+    for pkg in packages:
+        if pkg.requires is None:
+            continue
+        hash_value = get_hash_value(pkg.hashs)
+        provides = set(pkg.provides or ())
+        dependencies = {}
+        for name in pkg.requires:
+            provider = providers.get(name)
+            if provider is None:
+                unresolved = unresolved + 1
+            elif provider != hash_value and name not in provides:
+                dependencies[provider] = None
+        pkg.dependencies = list(dependencies)
+    _logger.debug(f'Resolved dependencies of {len(packages)} packages, {unresolved} requirements are not provided')
@@ -0,0 +1,84 @@
+import random
+import threading
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class RetryWithJitter(Retry):
+    """
+    Retry of urllib3 with up to jitter seconds added at random to every backoff,
+    so that clients which failed at the same time don't retry at the same time.
+    urllib3 2 has backoff_jitter for this, urllib3 1.26 doesn't.
+    """
+    jitter: float
+
+    def __init__(self, *args, jitter: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+
+    def new(self, **kw) -> 'RetryWithJitter':
+        kw.setdefault('jitter', self.jitter)
+        return super().new(**kw)
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return backoff + random.uniform(0, self.jitter)
+
+def make_session(
+    retries: int,
+    backoff_factor: float = 0.5,
+    jitter: float = 0.5,
+    pool_maxsize: int = 10,
+) -> requests.Session:
+    """
+    Returns a session keeping connections alive, retrying idempotent requests
+    which failed to connect or got 429 or 5xx up to retries times, with exponential
+    jittered backoff and respecting Retry-After. Responses are gzip-compressed
+    as requests asks for that by default.
+    """
+    retry = RetryWithJitter(
+        total=retries,
+        backoff_factor=backoff_factor,
+        jitter=jitter,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        ### NOTE:
+        ##  The last response is returned, so raise_for_status reports its status
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=pool_maxsize)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+@dataclass
+class RequestMetrics:
+    """Latencies (including retries) and retries of requests, in seconds"""
+    latencies: list[float] = field(default_factory=list)
+    retries: int = 0
+    failures: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, latency: float, retries: int, failed: bool) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            self.retries += retries
+            self.failures += failed
+
+    def summary(self) -> str:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            retries, failures = self.retries, self.failures
+        if not latencies:
+            return 'no requests'
+        return (
+            f'{len(latencies)} requests, {failures} failed, {retries} retries, '
+            f'latency min {latencies[0]:.3f}s, '
+            f'median {latencies[len(latencies) // 2]:.3f}s, '
+            f'max {latencies[-1]:.3f}s'
+        )
@@ -0,0 +1,116 @@
+import json
+import sqlite3
+import threading
+import time
+from logging import getLogger
+from pathlib import Path
+from typing import ClassVar, Optional
+
+_logger = getLogger(__name__)
+
+class ImmudbRecordCache:
+    """
+    On-disk cache of immudb responses keyed by SHA256 checksum of the package
+    and the immudb server, database and user it was read from. immudb is append-only,
+    so a record found once never changes, it's looked up again once positive_ttl seconds
+    have passed all the same. Hashes which were not found are looked up again
+    once negative_ttl seconds have passed, other errors are never cached.
+    """
+    ### NOTE:
+    ##  Version of the table layout. Bump it whenever the layout
+    ##  or the stored payload is changed, the cache is dropped then.
+    VERSION: ClassVar[int] = 2
+    ### NOTE:
+    ##  Error of immudb for keys it doesn't have. ImmudbWrapper returns it as {'error': ...},
+    ##  the same as failures of the network, which are never cached.
+    NOT_FOUND_ERROR: ClassVar[str] = 'key not found'
+    ### NOTE:
+    ##  Other processes (e.g. workers of --jobs) may write into the cache at the same time
+    LOCK_TIMEOUT: ClassVar[float] = 30.0
+
+    cache_file: Path
+    positive_ttl: float
+    negative_ttl: float
+    _conn: Optional[sqlite3.Connection]
+    _lock: threading.Lock
+
+    def __init__(self, cache_file: Path, negative_ttl: float = 3600.0, positive_ttl: float = 604800.0):
+        self.cache_file = Path(cache_file)
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get(self, hash: str, address: str, database: str, username: str) -> Optional[dict]:
+        """Returns the stored immudb response, or None if the hash has to be looked up in immudb"""
+        with self._lock:
+            row = self._get_connection().execute(
+                'SELECT response, found, stored_at FROM records '
+                'WHERE hash = ? AND address = ? AND database = ? AND username = ?',
+                (hash, address, database, username),
+            ).fetchone()
+        if row is None:
+            return None
+        response, found, stored_at = row
+        if time.time() - stored_at >= self._get_ttl(found):
+            return None
+        return json.loads(response)
+
+    def put(self, hash: str, address: str, database: str, username: str, response: dict) -> None:
+        found = 'value' in response
+        if not found and not self.is_not_found(response):
+            _logger.debug(f'Not caching immudb response for {hash}: {response.get("error")}')
+            return
+        if self._get_ttl(found) <= 0:
+            return
+        try:
+            serialized = json.dumps(response)
+        except (TypeError, ValueError) as e:
+            _logger.warning(f'Not caching immudb response for {hash}: {e}')
+            return
+        with self._lock, self._get_connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO records '
+                '(hash, address, database, username, response, found, stored_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (hash, address, database, username, serialized, found, time.time()),
+            )
+
+    @classmethod
+    def is_not_found(cls, response: dict) -> bool:
+        return cls.NOT_FOUND_ERROR in str(response.get('error', ''))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _get_ttl(self, found: bool) -> float:
+        return self.positive_ttl if found else self.negative_ttl
+
+    def _get_connection(self) -> sqlite3.Connection:
+        ### NOTE:
+        ##  The connection is opened on first use, so that the cache
+        ##  can be created before worker processes are forked.
+        if self._conn is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.cache_file, timeout=self.LOCK_TIMEOUT, check_same_thread=False)
+            with conn:
+                if conn.execute('PRAGMA user_version').fetchone()[0] != self.VERSION:
+                    _logger.info(f'Creating immudb record cache {self.cache_file}')
+                    conn.execute('DROP TABLE IF EXISTS records')
+                    conn.execute(f'PRAGMA user_version = {self.VERSION}')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS records ('
+                    'hash TEXT NOT NULL, '
+                    'address TEXT NOT NULL, '
+                    'database TEXT NOT NULL, '
+                    'username TEXT NOT NULL, '
+                    'response TEXT NOT NULL, '
+                    'found INTEGER NOT NULL, '
+                    'stored_at REAL NOT NULL, '
+                    'PRIMARY KEY (hash, address, database, username))'
+                )
+            self._conn = conn
+        return self._conn
@@ -1,17 +1,37 @@
+import json
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from immudb_wrapper import ImmudbWrapper
 from logging import getLogger
 from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
 
 from alma_sbom.data import Package, PackageNevra
 
-from .processor import DataProcessor, processor_factory
+from ..recording import ResponseBundle
+from ..rpm import hash_buffer, hash_fileobj
+from .cache import ImmudbRecordCache
+from .pool import ImmudbClientPool
+from .verification import get_verified_state, verify_tx_entries
+from .processor import process_immudb_infos, processor_factory
 
 _logger = getLogger(__name__)
 
 class ImmudbCollector:
-    client: ImmudbWrapper
-    processor: DataProcessor
+    database: str
+    ### NOTE:
+    ##  Server, database and user the records are read from, cached records are keyed by them
+    cache_scope: tuple[str, str, str]
+    record_cache: Optional[ImmudbRecordCache]
+    max_in_flight: int
+    deferred_verification: bool
+    response_bundle: Optional[ResponseBundle]
+    ### NOTE:
+    ##  Every lookup holds a client of the pool (and its gRPC channel) while it runs,
+    ##  the pool can be shared with other collectors, see CollectorFactory.
+    ##  Replayed runs have no pool, they must not touch the network, not even to log in.
+    client_pool: Optional[ImmudbClientPool]
 
     def __init__(
          self,
@@ -20,39 +40,221 @@ class ImmudbCollector:
          database: str,
          immudb_address: str,
          public_key_file: str,
+         max_in_flight: int = 8,
+         record_cache: ImmudbRecordCache = None,
+         deferred_verification: bool = False,
+         response_bundle: ResponseBundle = None,
+         client_pool: ImmudbClientPool = None,
      ):
-         self.client = ImmudbWrapper(
-             username=username,
-             password=password,
-             database=database,
-             immudb_address=immudb_address,
-             public_key_file=public_key_file,
+         self.database = database
+         self.cache_scope = (
+             immudb_address or ImmudbWrapper.almalinux_database_address(),
+             database or ImmudbWrapper.almalinux_database_name(),
+             username or ImmudbWrapper.read_only_username(),
          )
-         self.processor = None
+         self.record_cache = record_cache
+         self.max_in_flight = max_in_flight
+         self.deferred_verification = deferred_verification
+         self.response_bundle = response_bundle
+         if client_pool is None and not self._is_replaying():
+             client_pool = ImmudbClientPool(
+                 username=username,
+                 password=password,
+                 database=database,
+                 immudb_address=immudb_address,
+                 public_key_file=public_key_file,
+                 max_size=max_in_flight,
+             )
+         self.client_pool = client_pool
 
     def collect_package_by_hash(self, hash: str) -> Package:
         immudb_info = self._extract_immudb_info_about_package(hash=hash)
-        self.processor = processor_factory(immudb_info, hash)
-        return self.processor.get_package()
+        return processor_factory(immudb_info, hash).get_package()
+
+    def collect_packages_by_hashes(
+        self,
+        hashes: Iterable[str],
+    ) -> Iterator[tuple[str, Optional[Package], Optional[Exception]]]:
+        """
+        Collects packages by their SHA256 checksums with up to max_in_flight
+        lookups running at once. Yields (hash, package, None) or (hash, None, error)
+        for every hash in the order of hashes, so a failed lookup doesn't stop
+        the others. hashes are consumed lazily, only as far as the in-flight limit.
+
+        With deferred_verification, all hashes are read first with plain reads,
+        then the whole set is verified against a single state of immudb.
+        Raises ValueError if any of the entries doesn't verify.
+        """
+        if self._is_replaying():
+            for hash in hashes:
+                try:
+                    yield hash, self.collect_package_by_hash(hash), None
+                except Exception as e:
+                    yield hash, None, e
+            return
+        if self.deferred_verification:
+            yield from self._collect_packages_with_deferred_verification(list(hashes))
+            return
+        hashes = iter(hashes)
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            in_flight = deque()
+            for hash in hashes:
+                in_flight.append((hash, executor.submit(self.client_pool.run, self._collect_package_by_hash, hash)))
+                if len(in_flight) >= self.max_in_flight:
+                    yield self._get_result(*in_flight.popleft())
+            while in_flight:
+                yield self._get_result(*in_flight.popleft())
 
     def collect_package_by_package(self, rpm_package: Path) -> Package:
         immudb_info = self._extract_immudb_info_about_package(rpm_package=str(rpm_package))
-        self.processor = processor_factory(immudb_info, hash=None)
-        return self.processor.get_package()
+        return processor_factory(immudb_info, hash=None).get_package()
+
+    def collect_package_by_buffer(self, buff: Union[bytes, memoryview]) -> Package:
+        """Collects package data of the RPM package in memory by its SHA256 checksum"""
+        return self.collect_package_by_hash(hash_buffer(buff))
+
+    def collect_package_by_fileobj(self, fileobj: BinaryIO) -> Package:
+        """
+        Collects package data of the RPM package read from the current position
+        of the binary file object up to its end, by its SHA256 checksum
+        """
+        return self.collect_package_by_hash(hash_fileobj(fileobj))
+
+    @staticmethod
+    def _get_result(hash: str, future) -> tuple[str, Optional[Package], Optional[Exception]]:
+        try:
+            return hash, future.result(), None
+        except Exception as e:
+            return hash, None, e
+
+    def _collect_packages_with_deferred_verification(
+        self,
+        hashes: list[str],
+    ) -> Iterator[tuple[str, Optional[Package], Optional[Exception]]]:
+        unique_hashes = list(dict.fromkeys(hashes))
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            ### NOTE:
+            ##  Reads go without proofs, responses are either taken
+            ##  from the cache (so verified before) or still to be verified.
+            futures = [
+                (hash, executor.submit(self.client_pool.run, self._read_entry, hash))
+                for hash in unique_hashes
+            ]
+            reads = {hash: self._get_result(hash, future)[1:] for hash, future in futures}
+            unverified = {}
+            for hash, (entry, error) in reads.items():
+                if error is None and not isinstance(entry, dict):
+                    unverified.setdefault(entry.tx, {})[hash.encode()] = entry.value
+
+            timestamps = {}
+            if unverified:
+                _logger.info(
+                    f'Verifying {sum(map(len, unverified.values()))} immudb entries '
+                    f'of {len(unverified)} transactions'
+                )
+                state = self.client_pool.run(get_verified_state)
+                txs = list(unverified)
+                timestamps = dict(zip(txs, executor.map(
+                    lambda tx: self.client_pool.run(verify_tx_entries, state, tx, unverified[tx]),
+                    txs,
+                )))
+
+        responses = {}
+        for hash, (entry, error) in reads.items():
+            if error is not None or isinstance(entry, dict):
+                responses[hash] = (entry, error)
+                continue
+            try:
+                response = {'value': json.loads(entry.value), 'timestamp': timestamps[entry.tx]}
+            except ValueError as e:
+                responses[hash] = (None, e)
+                continue
+            if self.record_cache is not None:
+                self.record_cache.put(hash, *self.cache_scope, response)
+            responses[hash] = (response, None)
+
+        immudb_infos = {}
+        for hash, (response, error) in responses.items():
+            if error is None:
+                immudb_infos[hash] = self._immudb_info_from_response(response)
+                self._record(hash, immudb_infos[hash])
+        packages = dict(zip(immudb_infos, process_immudb_infos(list(immudb_infos.values()), list(immudb_infos))))
 
-    def _extract_immudb_info_about_package(self, hash: str = None, rpm_package: str = None) -> dict:
+        for hash in hashes:
+            _, error = responses[hash]
+            if error is not None:
+                yield hash, None, error
+            elif isinstance(packages[hash], Exception):
+                yield hash, None, packages[hash]
+            else:
+                yield hash, packages[hash], None
+
+    def _read_entry(self, client: ImmudbWrapper, hash: str):
+        """Returns the cached or not found response, or the entry read without verification"""
+        if self.record_cache is not None:
+            response = self.record_cache.get(hash, *self.cache_scope)
+            if response is not None:
+                return response
+        entry = client.get(hash.encode())
+        if entry is None:
+            response = {'error': f'{hash}: {ImmudbRecordCache.NOT_FOUND_ERROR}'}
+            if self.record_cache is not None:
+                self.record_cache.put(hash, *self.cache_scope, response)
+            return response
+        return entry
+
+    def _collect_package_by_hash(self, client: ImmudbWrapper, hash: str) -> Package:
+        immudb_info = self._extract_immudb_info_about_package(hash=hash, client=client)
+        return processor_factory(immudb_info, hash).get_package()
+
+    def _is_replaying(self) -> bool:
+        return self.response_bundle is not None and self.response_bundle.replay
+
+    def _record(self, key: str, immudb_info: dict) -> None:
+        if self.response_bundle is not None:
+            self.response_bundle.save(ResponseBundle.KIND_IMMUDB, key, immudb_info)
+
+    def _authenticate_hash(self, hash: str, client: ImmudbWrapper) -> dict:
+        if self.record_cache is None:
+            return client.authenticate(hash)
+        response = self.record_cache.get(hash, *self.cache_scope)
+        if response is None:
+            response = client.authenticate(hash)
+            self.record_cache.put(hash, *self.cache_scope, response)
+        else:
+            _logger.debug(f'Taking immudb record of {hash} from cache')
+        return response
+
+    def _extract_immudb_info_about_package(
+        self,
+        hash: str = None,
+        rpm_package: str = None,
+        client: ImmudbWrapper = None,
+    ) -> dict:
+        if self._is_replaying():
+            return self.response_bundle.load(ResponseBundle.KIND_IMMUDB, hash or rpm_package)
+        if client is None:
+            return self.client_pool.run(
+                lambda client: self._extract_immudb_info_about_package(hash, rpm_package, client),
+            )
         response = {}
         if hash != None :
-            response = self.client.authenticate(hash)
+            response = self._authenticate_hash(hash, client)
         elif rpm_package != None :
-            response = self.client.authenticate_file(rpm_package)
+            response = client.authenticate_file(rpm_package)
         else:
             raise RuntimeError(
                 'Unexpected situation has occurred. '
                 'Required info to to extract immudb info has not been provided.'
             )
 
-        result = response.get('value', {})
+        immudb_info = self._immudb_info_from_response(response)
+        self._record(hash or rpm_package, immudb_info)
+        return immudb_info
+
+    @staticmethod
+    def _immudb_info_from_response(response: dict) -> dict:
+        result = dict(response.get('value', {}))
         result['timestamp'] = response.get('timestamp')
         return result
 
@@ -0,0 +1,170 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Callable, Iterator, TypeVar
+
+import grpc
+from immudb_wrapper import ImmudbWrapper
+
+_logger = getLogger(__name__)
+
+T = TypeVar('T')
+
+@dataclass
+class _PooledClient:
+    client: ImmudbWrapper
+    checked_at: float
+    needs_login: bool = False
+
+def _is_unauthenticated(error: Exception) -> bool:
+    return isinstance(error, grpc.RpcError) and error.code() == grpc.StatusCode.UNAUTHENTICATED
+
+class ImmudbClientPool:
+    """
+    Logged-in immudb clients shared by the collectors (and their threads) of a process.
+    Clients are created on demand up to max_size and each of them is used by one thread
+    at a time, a thread checking out again while it holds a client gets the same one.
+    A client idle for health_check_interval seconds is checked before it is handed out,
+    it is logged in again if its token has expired and replaced if it's broken.
+    """
+    max_size: int
+    health_check_interval: float
+    _idle: list[_PooledClient]
+    _size: int
+    _condition: threading.Condition
+    _local: threading.local
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        database: str,
+        immudb_address: str,
+        public_key_file: str,
+        max_size: int = 8,
+        health_check_interval: float = 60.0,
+    ):
+        self._client_kwargs = dict(
+            username=username,
+            password=password,
+            database=database,
+            immudb_address=immudb_address,
+            public_key_file=public_key_file,
+        )
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+        self._idle = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    @contextmanager
+    def checkout(self) -> Iterator[ImmudbWrapper]:
+        """Holds a client for the current thread, waiting for one if max_size clients are in use"""
+        pooled = getattr(self._local, 'pooled', None)
+        if pooled is not None:
+            yield pooled.client
+            return
+        pooled = self._acquire()
+        self._local.pooled = pooled
+        try:
+            yield pooled.client
+        except Exception as e:
+            if _is_unauthenticated(e):
+                pooled.needs_login = True
+            raise
+        finally:
+            self._local.pooled = None
+            self._release(pooled)
+
+    def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Calls func(client, *args) with a client of the pool. The call is
+        repeated once with a new login if immudb rejects the token of the client.
+        """
+        try:
+            with self.checkout() as client:
+                return func(client, *args)
+        except Exception as e:
+            if not _is_unauthenticated(e) or getattr(self._local, 'pooled', None) is not None:
+                raise
+            _logger.debug(f'immudb rejected the token, logging in again: {e}')
+        with self.checkout() as client:
+            return func(client, *args)
+
+    def close(self) -> None:
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for pooled in idle:
+            pooled.client.shutdown()
+
+    def _acquire(self) -> _PooledClient:
+        with self._condition:
+            while not self._idle and self._size >= self.max_size:
+                self._condition.wait()
+            if self._idle:
+                pooled = self._idle.pop()
+            else:
+                pooled = None
+                self._size += 1
+        try:
+            if pooled is None:
+                return self._connect()
+            return self._check(pooled)
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, pooled: _PooledClient) -> None:
+        with self._condition:
+            ### NOTE:
+            ##  The last released client is handed out first, so the clients
+            ##  which aren't needed stay idle and the busy ones stay healthy.
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    def _connect(self) -> _PooledClient:
+        _logger.debug(f'Connecting immudb client #{self._size}')
+        return _PooledClient(ImmudbWrapper(**self._client_kwargs), time.monotonic())
+
+    def _check(self, pooled: _PooledClient) -> _PooledClient:
+        if not pooled.needs_login and time.monotonic() - pooled.checked_at < self.health_check_interval:
+            return pooled
+        try:
+            if not pooled.needs_login:
+                self._health_check(pooled.client)
+        except Exception as e:
+            if not _is_unauthenticated(e):
+                _logger.debug(f'Replacing broken immudb client: {e}')
+                pooled.client.shutdown()
+                return self._connect()
+            pooled.needs_login = True
+        if pooled.needs_login:
+            _logger.debug('Logging immudb client in again')
+            self._login(pooled.client)
+            pooled.needs_login = False
+        pooled.checked_at = time.monotonic()
+        return pooled
+
+    @staticmethod
+    def _health_check(client: ImmudbWrapper) -> None:
+        ### NOTE:
+        ##  Health is used instead of CurrentState, which would replace the trusted state of the client.
+        ##  A token which has expired anyway is renewed by run once immudb rejects a lookup.
+        if not client.healthCheck():
+            raise RuntimeError('immudb reports that it is not healthy')
+
+    def _login(self, client: ImmudbWrapper) -> None:
+        ### NOTE:
+        ##  Missing credentials are taken from the environment by ImmudbWrapper
+        client.login(
+            self._client_kwargs['username'] or ImmudbWrapper.read_only_username(),
+            self._client_kwargs['password'] or ImmudbWrapper.read_only_password(),
+            self._client_kwargs['database'] or ImmudbWrapper.almalinux_database_name(),
+        )
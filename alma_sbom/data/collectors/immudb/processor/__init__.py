@@ -1,8 +1,8 @@
 from .processor import DataProcessor
 from .apiver01 import DataProcessor01
 from .apiver02 import DataProcessor02
-
-from alma_sbom.type import Hash
+from .batch import process_immudb_infos
+from .utils import parse_immudb_info
 
 processor_classes: dict[str, type[DataProcessor]] = {
     '0.1': DataProcessor01,
@@ -10,23 +10,10 @@ processor_classes: dict[str, type[DataProcessor]] = {
 }
 
 def processor_factory(immudb_info: dict, hash: str) -> DataProcessor:
-    if 'Metadata' in immudb_info:
-            immudb_metadata = immudb_info['Metadata']
-    else:
-        raise KeyError('Immudb info is malformed, not has Metadata field')
-
-    api_ver = immudb_metadata.get('sbom_api_ver') or immudb_metadata.get('sbom_api')
-    if not api_ver:
-        raise KeyError('Immudb metadata is malformed, API version cannot be detected')
-
-    if hash is not None and hash != immudb_info['Hash']:
-        raise ValueError('malformed hash value')
-    hash = hash or immudb_info['Hash']
-    hashs = Hash(value=hash)
+    api_ver, immudb_metadata, hashs = parse_immudb_info(immudb_info, hash)
 
     try:
         processor_class = processor_classes[api_ver]
         return processor_class(immudb_info, immudb_metadata, hashs)
     except KeyError:
         raise ValueError(f"Unknown api_ver: {api_ver}")
-
@@ -0,0 +1,158 @@
+from typing import Callable, Optional, Sequence, Union
+
+from alma_sbom.type import Hash
+from alma_sbom.data import Package, PackageNevra
+from alma_sbom.data.attributes.property import (
+    PackageProperties,
+    BuildSourceProperties,
+    GitSourceProperties,
+    SrpmSourceProperties,
+    BuildPropertiesForPackage as BuildProperties,
+    SBOMProperties,
+)
+from .utils import normalize_epoch, parse_immudb_info
+
+### NOTE:
+##  Stateless counterpart of processor_factory(...).get_package() for many records at once.
+##  DataProcessor01 and DataProcessor02 convert their record by the same converters, so both
+##  produce the same packages. Records are grouped by their API version and every group is
+##  converted in one pass, every field being read from the metadata once (the epoch is
+##  normalized once, not for the NEVRA and the properties).
+
+ImmudbRecord = tuple[dict, dict, Hash]
+BatchConverter = Callable[[list[ImmudbRecord]], list[Union[Package, Exception]]]
+
+### source_type: build source properties from metadata
+_source_extractors: dict[str, Callable[[dict], BuildSourceProperties]] = {
+    ### git_commit is taken from git_url, as in all SBOMs generated so far
+    'git': lambda metadata: GitSourceProperties(
+        git_url=metadata.get('git_url'),
+        git_commit=metadata.get('git_url'),
+        git_ref=metadata.get('git_ref'),
+        git_commit_immudb_hash=metadata.get('alma_commit_sbom_hash'),
+    ),
+    'srpm': lambda metadata: SrpmSourceProperties(
+        srpm_url=metadata.get('srpm_url'),
+        srpm_checksum=metadata.get('srpm_sha256'),
+        srpm_nevra=metadata.get('srpm_nevra'),
+    ),
+}
+
+def _build_properties(immudb_metadata: dict) -> BuildProperties:
+    source_type = immudb_metadata.get('source_type')
+    try:
+        extract_source = _source_extractors[source_type]
+    except KeyError:
+        raise ValueError(f'Unknown source_type: {source_type}')
+    return BuildProperties(
+        target_arch=immudb_metadata.get('build_arch'),
+        package_type='rpm',
+        build_id=immudb_metadata.get('build_id'),
+        ### Please See https://github.com/AlmaLinux/build-system/issues/425 why build_url=None
+        build_url=None,
+        author=immudb_metadata.get('built_by'),
+        source=extract_source(immudb_metadata),
+    )
+
+def convert_v01(records: list[ImmudbRecord]) -> list[Union[Package, Exception]]:
+    packages = []
+    for immudb_info, immudb_metadata, hash in records:
+        try:
+            package_nevra = PackageNevra.from_str_nothas_epoch(immudb_info.get('Name'))
+            timestamp = immudb_info.get('timestamp')
+            packages.append(Package(
+                package_nevra = package_nevra,
+                source_rpm = None,
+                hashs = [hash],
+                package_timestamp = timestamp,
+                package_properties = PackageProperties(
+                    epoch=None,
+                    version=package_nevra.version,
+                    release=package_nevra.release,
+                    arch=package_nevra.arch,
+                    buildhost=immudb_metadata.get('build_host'),
+                    sourcerpm=None,
+                    timestamp=timestamp,
+                ),
+                build_properties = _build_properties(immudb_metadata),
+                sbom_properties = SBOMProperties(immudb_hash=immudb_info['Hash']),
+            ))
+        except Exception as e:
+            packages.append(e)
+    return packages
+
+def convert_v02(records: list[ImmudbRecord]) -> list[Union[Package, Exception]]:
+    packages = []
+    for immudb_info, immudb_metadata, hash in records:
+        try:
+            get = immudb_metadata.get
+            ### NOTE:
+            # Due to uncertainty about whether missing epoch field in the database'
+            # can be treated as equivalent to 0, Now we store None for missing epoch
+            # field at this time.
+            epoch = normalize_epoch(immudb_metadata['epoch']) if 'epoch' in immudb_metadata else None
+            version, release, arch, sourcerpm = get('version'), get('release'), get('arch'), get('sourcerpm')
+            timestamp = immudb_info.get('timestamp')
+            packages.append(Package(
+                package_nevra = PackageNevra(
+                    epoch = epoch,
+                    name = get('name'),
+                    version = version,
+                    release = release,
+                    arch = arch,
+                ),
+                source_rpm = sourcerpm,
+                hashs = [hash],
+                package_timestamp = timestamp,
+                package_properties = PackageProperties(
+                    epoch=epoch,
+                    version=version,
+                    release=release,
+                    arch=arch,
+                    buildhost=get('build_host'),
+                    sourcerpm=sourcerpm,
+                    timestamp=timestamp,
+                ),
+                build_properties = _build_properties(immudb_metadata),
+                sbom_properties = SBOMProperties(immudb_hash=immudb_info.get('Hash')),
+            ))
+        except Exception as e:
+            packages.append(e)
+    return packages
+
+batch_converters: dict[str, BatchConverter] = {
+    '0.1': convert_v01,
+    '0.2': convert_v02,
+}
+
+def process_immudb_infos(
+    immudb_infos: Sequence[dict],
+    hashes: Optional[Sequence[Optional[str]]] = None,
+) -> list[Union[Package, Exception]]:
+    """
+    Converts immudb records of packages into packages, the same way as
+    processor_factory(immudb_info, hash).get_package() does for every one of them.
+    hashes, if given, are the SHA256 checksums the records were looked up by.
+    Returns the package or the error of every record in the order of immudb_infos,
+    so a malformed record doesn't stop the others.
+    """
+    if hashes is None:
+        hashes = [None] * len(immudb_infos)
+    results: list[Union[Package, Exception]] = [None] * len(immudb_infos)
+    groups: dict[str, tuple[list[int], list[ImmudbRecord]]] = {}
+    for i, (immudb_info, hash) in enumerate(zip(immudb_infos, hashes)):
+        try:
+            api_ver, immudb_metadata, hashs = parse_immudb_info(immudb_info, hash)
+            if api_ver not in batch_converters:
+                raise ValueError(f"Unknown api_ver: {api_ver}")
+        except Exception as e:
+            results[i] = e
+            continue
+        indexes, records = groups.setdefault(api_ver, ([], []))
+        indexes.append(i)
+        records.append((immudb_info, immudb_metadata, hashs))
+
+    for api_ver, (indexes, records) in groups.items():
+        for i, result in zip(indexes, batch_converters[api_ver](records)):
+            results[i] = result
+    return results
@@ -3,6 +3,8 @@ from abc import ABC, abstractmethod
 from alma_sbom.type import Hash
 from alma_sbom.data import Package
 
+from .batch import BatchConverter
+
 class DataProcessor(ABC):
     immudb_info: dict
     immudb_metadata: dict
@@ -21,3 +23,11 @@ class DataProcessor(ABC):
     def get_package(self) -> Package:
         pass
 
+    def _convert(self, converter: BatchConverter) -> Package:
+        ### NOTE:
+        ##  Records are converted by the batch converters of process_immudb_infos,
+        ##  so a package is the same whichever way it was looked up.
+        package, = converter([(self.immudb_info, self.immudb_metadata, self.hash)])
+        if isinstance(package, Exception):
+            raise package
+        return package
@@ -1,4 +1,6 @@
-from typing import Union
+from typing import Optional, Union
+
+from alma_sbom.type import Hash
 
 def normalize_epoch(epoch: Union[str, int]) -> int:
     '''normalize inconsistent null epoch representations in immudb'''
@@ -6,3 +8,19 @@ def normalize_epoch(epoch: Union[str, int]) -> int:
     if epoch is None or epoch == 'None' or epoch == '(none)':
         return 0
     return epoch
+
+def parse_immudb_info(immudb_info: dict, hash: Optional[str]) -> tuple[str, dict, Hash]:
+    '''returns API version, metadata and checksum of the immudb record'''
+    if 'Metadata' in immudb_info:
+            immudb_metadata = immudb_info['Metadata']
+    else:
+        raise KeyError('Immudb info is malformed, not has Metadata field')
+
+    api_ver = immudb_metadata.get('sbom_api_ver') or immudb_metadata.get('sbom_api')
+    if not api_ver:
+        raise KeyError('Immudb metadata is malformed, API version cannot be detected')
+
+    if hash is not None and hash != immudb_info['Hash']:
+        raise ValueError('malformed hash value')
+    hash = hash or immudb_info['Hash']
+    return api_ver, immudb_metadata, Hash(value=hash)
@@ -0,0 +1,115 @@
+from logging import getLogger
+
+from google.protobuf import empty_pb2
+from immudb import database, schema
+from immudb.embedded import store
+from immudb.exceptions import ErrKeyNotFound
+from immudb.grpc import schema_pb2
+from immudb.rootService import State
+from immudb_wrapper import ImmudbWrapper
+
+### NOTE:
+##  Verification of entries read by plain reads, the same proofs as
+##  ImmudbClient.verifiedGet checks, but all of them against one pinned state
+##  and once per transaction instead of once per key.
+##  See immudb/handler/verifiedGet.py and verifiedtxbyid.py of immudb-py.
+
+_logger = getLogger(__name__)
+
+def get_verified_state(client: ImmudbWrapper) -> State:
+    """
+    Returns the current state of the database, once it's proven to extend the state
+    the client trusts, and makes it the trusted state of the client. Its signature is
+    checked too if the client has the public key. Raises ValueError if anything doesn't verify.
+    """
+    ### NOTE:
+    ##  ImmudbClient.currentState trusts whatever state the server returns,
+    ##  so the state is only stored once it's proven to be consistent.
+    trusted_state = client._rs.get()
+    state = State.FromGrpc(client._stub.CurrentState(empty_pb2.Empty()))
+    if client._vk is not None:
+        state.Verify(client._vk)
+    else:
+        _logger.warning(
+            'immudb state is not signed, as no public key of immudb is provided, '
+            'records are verified against a state only proven to extend the one of the login'
+        )
+    if state.txId < trusted_state.txId:
+        raise ValueError(
+            f'immudb state at transaction {state.txId} is older than the trusted one at transaction {trusted_state.txId}'
+        )
+    if state.txId == trusted_state.txId:
+        if state.txHash != trusted_state.txHash:
+            raise ValueError(f'immudb state at transaction {state.txId} differs from the trusted one')
+    elif trusted_state.txId > 0:
+        vtx = client._stub.VerifiableTxById(schema_pb2.VerifiableTxRequest(
+            tx=state.txId,
+            proveSinceTx=trusted_state.txId,
+        ))
+        if not store.VerifyDualProof(
+            schema.DualProofFromProto(vtx.dualProof),
+            trusted_state.txId,
+            state.txId,
+            schema.DigestFromProto(trusted_state.txHash),
+            schema.DigestFromProto(state.txHash),
+        ):
+            raise ValueError(
+                f'immudb state at transaction {state.txId} is not consistent '
+                f'with the trusted one at transaction {trusted_state.txId}'
+            )
+    client._rs.set(state)
+    return state
+
+def verify_tx_entries(client: ImmudbWrapper, state: State, tx: int, entries: dict[bytes, bytes]) -> int:
+    """
+    Verifies that entries (key to value) were written in transaction tx
+    and that the transaction is a part of the database at state.
+    Returns the timestamp of the transaction. Raises ValueError if anything doesn't verify.
+    """
+    vtx = client._stub.VerifiableTxById(schema_pb2.VerifiableTxRequest(
+        tx=tx,
+        proveSinceTx=state.txId,
+    ))
+    ### NOTE:
+    ##  TxFromProto rebuilds the hash tree of entries (and so eH of the header)
+    ##  from the entries it got, so its Alh proves the entries once it matches the dual proof.
+    verified_tx = schema.TxFromProto(vtx.tx)
+    dual_proof = schema.DualProofFromProto(vtx.dualProof)
+    if verified_tx.header.iD != tx:
+        raise ValueError(f'immudb returned transaction {verified_tx.header.iD} instead of {tx}')
+    if state.txId <= tx:
+        tx_header = dual_proof.targetTxHeader
+        verifies = store.VerifyDualProof(
+            dual_proof,
+            state.txId,
+            tx,
+            schema.DigestFromProto(state.txHash),
+            tx_header.Alh(),
+        )
+    else:
+        tx_header = dual_proof.sourceTxHeader
+        verifies = store.VerifyDualProof(
+            dual_proof,
+            tx,
+            state.txId,
+            tx_header.Alh(),
+            schema.DigestFromProto(state.txHash),
+        )
+    if not verifies or tx_header.Alh() != verified_tx.header.Alh():
+        raise ValueError(f'Transaction {tx} is not consistent with immudb state at transaction {state.txId}')
+
+    ### NOTE:
+    ##  The hash tree is built from all entries of the proven transaction, so an entry
+    ##  is included once its digest equals the leaf of its key. Tx.Proof isn't used,
+    ##  as the inclusion proofs it makes for transactions of several entries are broken.
+    entry_spec_digest = store.EntrySpecDigestFor(verified_tx.header.version)
+    tx_entry_digest = verified_tx.TxEntryDigest()
+    for key, value in entries.items():
+        try:
+            tx_entry = verified_tx.entries[verified_tx.IndexOf(database.EncodeKey(key))]
+        except ErrKeyNotFound:
+            raise ValueError(f'Entry {key.decode()} is not a part of transaction {tx}')
+        digest = entry_spec_digest(database.EncodeEntrySpec(key, tx_entry.md, value))
+        if digest != tx_entry_digest(tx_entry):
+            raise ValueError(f'Value of entry {key.decode()} does not verify against transaction {tx}')
+    return verified_tx.header.ts
@@ -1,31 +1,130 @@
 import configparser
+import errno
 import io
+import mmap
 import os
 import pycdlib
-import tempfile
+from dataclasses import dataclass
+from logging import getLogger
 from pathlib import Path
-from typing import ClassVar, Iterator
+from typing import BinaryIO, ClassVar, Iterable, Iterator, Optional
 
-from alma_sbom.data import Iso
+from alma_sbom.data import Iso, Package
+from alma_sbom.type import Algorithms, Hash, get_hash_value
+
+from .iso_manifest import IsoIdentity, IsoManifest, IsoManifestCache, IsoManifestPackage
+from .repodata import RepodataCollector
+from .rpm import MultiHasher, digest_buffer
+
+_logger = getLogger(__name__)
+
+@dataclass(frozen=True)
+class IsoPackageEntry:
+    """Location of an RPM package inside of the ISO image"""
+    rr_path: str
+    offset: int
+    size: int
+
+class _HashingWriter:
+    """File-like object computing checksums of the data written through it"""
+    fp: BinaryIO
+
+    def __init__(self, fp: BinaryIO, hasher: MultiHasher):
+        self.fp = fp
+        self.hasher = hasher
+
+    def write(self, data: bytes) -> int:
+        self.hasher.update(data)
+        return self.fp.write(data)
 
 class IsoCollector:
     PATH_TO_TREEINFO: ClassVar[str] = Path('/.treeinfo')
     DVD_REPO_LIST: ClassVar[list[str]] = ['AppStream', 'BaseOS']
     MINIMAL_REPO_LIST: ClassVar[list[str]] = ['Minimal']
+    ### NOTE:
+    ##  Amount of data of upcoming packages the kernel is asked to read ahead
+    READAHEAD_SIZE: ClassVar[int] = 64 * 1024 * 1024
+    COPY_UNSUPPORTED_ERRNOS: ClassVar[tuple[int, ...]] = (
+        errno.ENOSYS,
+        errno.EXDEV,
+        errno.EINVAL,
+        errno.EOPNOTSUPP,
+    )
 
     iso: pycdlib.PyCdlib
+    iso_fp: BinaryIO
+    iso_mmap: mmap.mmap
     config: configparser.ConfigParser
+    treeinfo: str
+    memfd: int
+    memfd_fp: BinaryIO
     memfd_path: Path
     repositories_info: dict
+    manifest_cache: IsoManifestCache
+    identity: IsoIdentity
+    manifest: IsoManifest
+    algorithms: list[Algorithms]
+    collect_files: bool
+    collect_dependencies: bool
+    metadata_source: str
 
-    def __init__(self):
+    def __init__(
+        self,
+        manifest_cache: IsoManifestCache = None,
+        algorithms: Iterable[Algorithms] = (Algorithms.SHA_256,),
+        collect_files: bool = False,
+        collect_dependencies: bool = False,
+        metadata_source: str = 'rpm',
+    ):
         self.iso = pycdlib.PyCdlib()
+        self.iso_fp = None
+        self.iso_mmap = None
         self.config = configparser.ConfigParser()
-        memfd = os.memfd_create('package', flags=0)
-        self.memfd_path = Path(f'/proc/self/fd/{memfd}')
+        self.treeinfo = None
+        self.memfd = os.memfd_create('package', flags=0)
+        self.memfd_fp = os.fdopen(self.memfd, 'wb', closefd=False)
+        self.memfd_path = Path(f'/proc/self/fd/{self.memfd}')
+        self._copy_methods = [self._copy_file_range, self._sendfile, self._copy_by_python]
+        self.manifest_cache = manifest_cache
+        self.identity = None
+        self.manifest = None
+        self.algorithms = list(algorithms)
+        self.collect_files = collect_files
+        self.collect_dependencies = collect_dependencies
+        self.metadata_source = metadata_source
+
+    def __enter__(self) -> 'IsoCollector':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the ISO image, its memory mapping and the memfd"""
+        if self.iso_mmap is not None:
+            self.iso_mmap.close()
+            self.iso_mmap = None
+        if self.iso_fp is not None:
+            self.iso_fp.close()
+            self.iso_fp = None
+        if not self.memfd_fp.closed:
+            self.memfd_fp.close()
+            os.close(self.memfd)
 
     def collect_iso_by_file(self, iso_image: Path) -> Iso:
-        self._read_iso(iso_image)
+        if self.manifest_cache is not None:
+            self.identity = IsoIdentity.from_file(iso_image)
+            self.manifest = self.manifest_cache.load(self.identity)
+            if self.manifest is not None and not self._is_manifest_usable(self.manifest):
+                _logger.info(f'Ignoring cached manifest of ISO image {iso_image} made with other settings')
+                self.manifest = None
+
+        if self.manifest is not None:
+            _logger.info(f'Using cached manifest of ISO image {iso_image}')
+            self.treeinfo = self.manifest.treeinfo
+        else:
+            self._read_iso(iso_image)
+        self.config.read_string(self.treeinfo)
         self._check_almalinux_iso()
 
         self.repositories_info = self._get_repositories_info()
@@ -39,19 +138,187 @@ class IsoCollector:
             packages=[],
         )
 
+    def _is_manifest_usable(self, manifest: IsoManifest) -> bool:
+        return (
+            ### NOTE:
+            ##  Packages of the manifest would put their checksums, files (or requires and provides)
+            ##  into SBOMs which weren't asked for them, so these must match exactly
+            set(manifest.algorithms) == set(self.algorithms)
+            and manifest.files == self.collect_files
+            and manifest.dependencies == self.collect_dependencies
+            ### NOTE:
+            ##  Packages read from repodata lack the epoch 0 and the other checksums,
+            ##  so manifests made from repodata and from RPM headers are not interchangeable
+            and manifest.metadata_source == self.metadata_source
+        )
+
     def get_fd_path(self) -> Path:
         return self.memfd_path
 
+    def get_iso_fd(self) -> int:
+        return self.iso_fp.fileno()
+
     def iter_packages(self) -> Iterator[None]:
+        for entry in self.iter_package_entries():
+            self.extract_package(entry)
+            yield
+
+    def iter_package_entries(self) -> Iterator[IsoPackageEntry]:
+        if self.manifest is not None:
+            for pkg in self.manifest.packages:
+                yield IsoPackageEntry(rr_path=pkg.rr_path, offset=pkg.offset, size=pkg.size)
+            return
+        ### NOTE:
+        ##  Order of directory records doesn't need to match the order of
+        ##  extents on the disk. Visit packages in extent order to read
+        ##  the image sequentially.
+        entries = []
         for variant_packages_repo in self.repositories_info.values():
-            for _ in self._iter_packages_per_repo(variant_packages_repo):
-                yield
+            entries.extend(self._iter_package_entries_per_repo(variant_packages_repo))
+        yield from sorted(entries, key=lambda entry: entry.offset)
+
+    def iter_with_readahead(self, entries: list[IsoPackageEntry]) -> Iterator[IsoPackageEntry]:
+        """
+        Yields the entries, while hinting the kernel to read ahead
+        data of the upcoming packages (up to READAHEAD_SIZE bytes).
+        """
+        advised = 0
+        pending_size = 0
+        for i, entry in enumerate(entries):
+            while advised < len(entries) and (advised <= i or pending_size < self.READAHEAD_SIZE):
+                self._advise(entries[advised], os.POSIX_FADV_WILLNEED)
+                pending_size += entries[advised].size
+                advised += 1
+            pending_size -= entry.size
+            yield entry
+
+    def iter_repodata_packages(
+        self,
+        repodata_collector: RepodataCollector,
+    ) -> Iterator[tuple[IsoPackageEntry, Optional[Package]]]:
+        """
+        Yields package entries of the ISO image with package data parsed from
+        repodata of each variant, without reading the packages themselves.
+        Packages of the image which are not listed in repodata are yielded
+        last, with None instead of package data.
+        """
+        entries = {entry.rr_path: entry for entry in self.iter_package_entries()}
+        listed = set()
+        for repository in self._get_repositories_path().values():
+            repository_path = Path('/') / repository
+            repomd = self.read_file(str(repository_path / repodata_collector.PATH_TO_REPOMD))
+            primary_location = repodata_collector.get_primary_location(repomd)
+            primary = self.read_file(str(repository_path / primary_location))
+            for location, pkg in repodata_collector.iter_packages(primary, primary_location):
+                rr_path = str(repository_path / location)
+                if rr_path not in entries:
+                    raise KeyError(f'Package {rr_path} listed in repodata is not found in ISO image')
+                listed.add(rr_path)
+                yield entries[rr_path], pkg
+        for rr_path, entry in entries.items():
+            if rr_path not in listed:
+                _logger.warning(f'Package {rr_path} is not listed in repodata, reading its header')
+                yield entry, None
+
+    def read_file(self, rr_path: str) -> io.BytesIO:
+        data = io.BytesIO()
+        self.iso.get_file_from_iso_fp(data, rr_path=rr_path)
+        data.seek(0)
+        return data
+
+    def get_cached_packages(self) -> Optional[list[Package]]:
+        """
+        Returns merged packages stored in the manifest of the ISO image,
+        or None if the image has not been processed before.
+        """
+        if self.manifest is None:
+            return None
+        return [pkg.package for pkg in self.manifest.packages]
+
+    def save_manifest(self, entries: list[IsoPackageEntry], packages: list[Package]) -> None:
+        if self.manifest_cache is None:
+            return
+        if len(entries) != len(packages):
+            raise RuntimeError(
+                'Unexpected situation has occurred. '
+                f'Number of packages ({len(packages)}) differs from '
+                f'number of package entries ({len(entries)}) in ISO image.'
+            )
+        self.manifest = IsoManifest(
+            identity=self.identity,
+            treeinfo=self.treeinfo,
+            algorithms=self.algorithms,
+            files=self.collect_files,
+            dependencies=self.collect_dependencies,
+            metadata_source=self.metadata_source,
+            packages=[
+                IsoManifestPackage(
+                    rr_path=entry.rr_path,
+                    offset=entry.offset,
+                    size=entry.size,
+                    sha256=get_hash_value(pkg.hashs),
+                    package=pkg,
+                )
+                for entry, pkg in zip(entries, packages)
+            ],
+        )
+        self.manifest_cache.save(self.manifest)
+
+    def extract_package(self, entry: IsoPackageEntry) -> list[Hash]:
+        """
+        Extracts the package into the memfd (see get_fd_path) and returns
+        checksums of the package computed while it is extracted.
+        """
+        self.memfd_fp.seek(0)
+        self.memfd_fp.truncate()
+        writer = _HashingWriter(self.memfd_fp, MultiHasher(self.algorithms))
+        self.iso.get_file_from_iso_fp(writer, rr_path=entry.rr_path)
+        self.memfd_fp.flush()
+        return writer.hasher.get_hashes()
+
+    def copy_package(self, entry: IsoPackageEntry) -> list[Hash]:
+        """
+        Copies the package into the memfd (see get_fd_path) by the kernel,
+        using the extent of the package in the ISO image, and returns
+        checksums of the package. Package bytes don't pass through Python
+        unless the kernel refuses to copy them.
+        """
+        os.ftruncate(self.memfd, 0)
+        while True:
+            copy_method = self._copy_methods[0]
+            try:
+                copy_method(entry)
+                break
+            except OSError as e:
+                ### NOTE:
+                ##  Only errors telling that the kernel can't copy between these
+                ##  files are a reason to fall back, others (e.g. EIO) are real failures
+                if e.errno not in self.COPY_UNSUPPORTED_ERRNOS or len(self._copy_methods) == 1:
+                    raise
+                _logger.debug(f'{copy_method.__name__} is not available ({e}), falling back')
+                self._copy_methods.pop(0)
+        ### NOTE:
+        ##  Package data has just been read by the kernel, so hashing
+        ##  the mapped image is served from the page cache.
+        with self.get_package_view(entry) as view:
+            return digest_buffer(view, self.algorithms)
+
+    def get_package_view(self, entry: IsoPackageEntry) -> memoryview:
+        """
+        Returns a read-only view of the package bytes in the memory mapped ISO image.
+        No data is copied, pages are read from the image on access.
+        """
+        if self.iso_mmap is None:
+            self.iso_mmap = mmap.mmap(self.get_iso_fd(), 0, access=mmap.ACCESS_READ)
+            self.iso_mmap.madvise(mmap.MADV_SEQUENTIAL)
+        return memoryview(self.iso_mmap)[entry.offset:entry.offset + entry.size]
 
     def _read_iso(self, iso_image: Path) -> None:
-        self.iso.open(iso_image)
-        with tempfile.NamedTemporaryFile(delete=True) as tmp:
-            self.iso.get_file_from_iso(local_path=tmp.name, rr_path=str(self.PATH_TO_TREEINFO))
-            self.config.read(tmp.name)
+        self.iso_fp = open(iso_image, 'rb')
+        os.posix_fadvise(self.get_iso_fd(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        self.iso.open_fp(self.iso_fp)
+        treeinfo = self.read_file(str(self.PATH_TO_TREEINFO))
+        self.treeinfo = treeinfo.getvalue().decode('utf8')
 
     def _check_almalinux_iso(self) -> None:
         if 'general' in self.config and 'family' in self.config['general']:
@@ -77,6 +344,50 @@ class IsoCollector:
                 raise RuntimeError('Unexpected situation has occurred')
         return variant_packages
 
+    def _copy_file_range(self, entry: IsoPackageEntry) -> None:
+        copied = 0
+        while copied < entry.size:
+            size = os.copy_file_range(
+                self.get_iso_fd(), self.memfd, entry.size - copied,
+                offset_src=entry.offset + copied, offset_dst=copied,
+            )
+            if size == 0:
+                raise EOFError(f'Unexpected end of ISO image while copying {entry.rr_path}')
+            copied += size
+
+    def _sendfile(self, entry: IsoPackageEntry) -> None:
+        os.lseek(self.memfd, 0, os.SEEK_SET)
+        copied = 0
+        while copied < entry.size:
+            size = os.sendfile(self.memfd, self.get_iso_fd(), entry.offset + copied, entry.size - copied)
+            if size == 0:
+                raise EOFError(f'Unexpected end of ISO image while copying {entry.rr_path}')
+            copied += size
+
+    def _copy_by_python(self, entry: IsoPackageEntry) -> None:
+        self.memfd_fp.seek(0)
+        copied = 0
+        while copied < entry.size:
+            data = os.pread(self.get_iso_fd(), min(entry.size - copied, 1048576), entry.offset + copied)
+            if not data:
+                raise EOFError(f'Unexpected end of ISO image while copying {entry.rr_path}')
+            self.memfd_fp.write(data)
+            copied += len(data)
+        self.memfd_fp.flush()
+
+    def _advise(self, entry: IsoPackageEntry, advice: int) -> None:
+        os.posix_fadvise(self.get_iso_fd(), entry.offset, entry.size, advice)
+
+    def _get_repositories_path(self) -> dict:
+        repositories_path = {}
+        for variant, variant_packages_repo in self.repositories_info.items():
+            section_name = f'variant-{variant}'
+            if 'repository' in self.config[section_name]:
+                repositories_path[variant] = self.config[section_name]['repository']
+            else:
+                repositories_path[variant] = str(Path(variant_packages_repo).parent)
+        return repositories_path
+
     def _get_releasever(self) -> str:
         if 'general' in self.config and 'version' in self.config['general']:
             return self.config['general']['version']
@@ -90,16 +401,14 @@ class IsoCollector:
             return 'Minimal'
         raise KeyError('Cat not detect image type.')
 
-    def _iter_packages_per_repo(self, variant_packages_repo: str) -> Iterator[None]:
+    def _iter_package_entries_per_repo(self, variant_packages_repo: str) -> Iterator[IsoPackageEntry]:
         variant_path = Path('/') / variant_packages_repo
         variant_entry = self.iso.get_record(iso_path=str(variant_path))
         for child in variant_entry.children:
             pkg_name = child.rock_ridge.name().decode('utf8')
             if pkg_name.endswith('.rpm'):
-                full_rr_path = variant_path / pkg_name
-                self.iso.get_file_from_iso(
-                    local_path=self.memfd_path,
-                    rr_path=str(full_rr_path),
+                yield IsoPackageEntry(
+                    rr_path=str(variant_path / pkg_name),
+                    offset=child.extent_location() * self.iso.logical_block_size,
+                    size=child.get_data_length(),
                 )
-                yield
-
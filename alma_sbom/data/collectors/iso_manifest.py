@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict
+from logging import getLogger
+from pathlib import Path
+from typing import ClassVar, Optional
+
+from alma_sbom._version import __version__
+from alma_sbom.data.models import Package
+from alma_sbom.type import Algorithms
+
+_logger = getLogger(__name__)
+
+@dataclass(frozen=True)
+class IsoIdentity:
+    """Identifies an ISO image without reading its content"""
+    ### NOTE:
+    ##  Volume ID is stored in the primary volume descriptor,
+    ##  which is the 16th logical sector of ISO9660 image.
+    ##  See https://wiki.osdev.org/ISO_9660#The_Primary_Volume_Descriptor
+    PVD_OFFSET: ClassVar[int] = 16 * 2048
+    VOLUME_ID_OFFSET: ClassVar[int] = 40
+    VOLUME_ID_LENGTH: ClassVar[int] = 32
+
+    size: int
+    mtime_ns: int
+    volume_id: str
+
+    @classmethod
+    def from_file(cls, iso_image: Path) -> 'IsoIdentity':
+        stat = os.stat(iso_image)
+        with open(iso_image, 'rb') as fp:
+            fp.seek(cls.PVD_OFFSET + cls.VOLUME_ID_OFFSET)
+            volume_id = fp.read(cls.VOLUME_ID_LENGTH)
+        return cls(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            volume_id=volume_id.decode('ascii', errors='replace').strip(),
+        )
+
+    def get_key(self) -> str:
+        return hashlib.sha256(
+            f'{self.size}:{self.mtime_ns}:{self.volume_id}'.encode('utf8')
+        ).hexdigest()
+
+@dataclass
+class IsoManifestPackage:
+    rr_path: str
+    offset: int
+    size: int
+    sha256: str
+    package: Package
+
+@dataclass
+class IsoManifest:
+    VERSION: ClassVar[int] = 5
+
+    identity: IsoIdentity
+    treeinfo: str
+    ### NOTE:
+    ##  Checksum algorithms of the packages read from the image
+    algorithms: list[Algorithms]
+    packages: list[IsoManifestPackage]
+    ### NOTE:
+    ##  Whether the packages hold their files, and their requires and provides
+    files: bool = False
+    dependencies: bool = False
+    ### NOTE:
+    ##  Where package data was taken from, RPM headers ("rpm") or repodata ("repodata")
+    metadata_source: str = 'rpm'
+
+    def to_dict(self) -> dict:
+        return {
+            'version': self.VERSION,
+            'alma_sbom_version': __version__,
+            'identity': asdict(self.identity),
+            'treeinfo': self.treeinfo,
+            'algorithms': [alg.value for alg in self.algorithms],
+            'files': self.files,
+            'dependencies': self.dependencies,
+            'metadata_source': self.metadata_source,
+            'packages': [
+                {
+                    'rr_path': pkg.rr_path,
+                    'offset': pkg.offset,
+                    'size': pkg.size,
+                    'sha256': pkg.sha256,
+                    'package': pkg.package.to_dict(),
+                }
+                for pkg in self.packages
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'IsoManifest':
+        return cls(
+            identity=IsoIdentity(**data['identity']),
+            treeinfo=data['treeinfo'],
+            algorithms=[Algorithms.from_str(alg) for alg in data['algorithms']],
+            files=data['files'],
+            dependencies=data['dependencies'],
+            metadata_source=data['metadata_source'],
+            packages=[
+                IsoManifestPackage(
+                    rr_path=pkg['rr_path'],
+                    offset=pkg['offset'],
+                    size=pkg['size'],
+                    sha256=pkg['sha256'],
+                    package=Package.from_dict(pkg['package']),
+                )
+                for pkg in data['packages']
+            ],
+        )
+
+class IsoManifestCache:
+    """On-disk cache of ISO manifests keyed by the identity of ISO image"""
+    cache_dir: Path
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def load(self, identity: IsoIdentity) -> Optional[IsoManifest]:
+        manifest_path = self._get_manifest_path(identity)
+        try:
+            with open(manifest_path, 'r') as fd:
+                data = json.load(fd)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            _logger.warning(f'Ignoring unreadable ISO manifest {manifest_path}: {e}')
+            return None
+
+        ### NOTE:
+        ##  Merged package metadata depends on the alma-sbom version which produced it
+        if data.get('version') != IsoManifest.VERSION or data.get('alma_sbom_version') != __version__:
+            _logger.info(f'Ignoring ISO manifest {manifest_path} made by another version of alma-sbom')
+            return None
+
+        manifest = IsoManifest.from_dict(data)
+        if manifest.identity != identity:
+            return None
+        return manifest
+
+    def save(self, manifest: IsoManifest) -> None:
+        manifest_path = self._get_manifest_path(manifest.identity)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = manifest_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as fd:
+            json.dump(manifest.to_dict(), fd)
+        os.replace(tmp_path, manifest_path)
+
+    def _get_manifest_path(self, identity: IsoIdentity) -> Path:
+        return self.cache_dir / f'{identity.get_key()}.json'
@@ -0,0 +1,198 @@
+import re
+from typing import Optional
+
+from license_expression import (
+    LicenseExpression,
+    LicenseSymbol,
+    LicenseWithExceptionSymbol,
+    Licensing,
+)
+
+### NOTE:
+##  Version of LEGACY_LICENSES. Bump it whenever the table is changed.
+LEGACY_LICENSES_VERSION = 1
+
+### NOTE:
+##  Fedora legacy license tags, used by EL8-era RPMs, mapped to SPDX license ids.
+##  Only tags with an unambiguous SPDX counterpart are listed. Tags which
+##  cover several SPDX licenses (e.g. "BSD", "GPLv2+ with exceptions") are left
+##  out on purpose, such strings are handled by the SPDX parser as before.
+##  Tags which don't tell the minor version (e.g. "LGPLv2") are mapped literally.
+##  See https://docs.fedoraproject.org/en-US/legal/update-existing-packages/
+LEGACY_LICENSES: dict[str, str] = {
+    'GPLv1': 'GPL-1.0-only',
+    'GPL+': 'GPL-1.0-or-later',
+    'GPLv2': 'GPL-2.0-only',
+    'GPLv2+': 'GPL-2.0-or-later',
+    'GPLv3': 'GPL-3.0-only',
+    'GPLv3+': 'GPL-3.0-or-later',
+    'LGPLv2': 'LGPL-2.0-only',
+    'LGPLv2+': 'LGPL-2.0-or-later',
+    'LGPLv2.1': 'LGPL-2.1-only',
+    'LGPLv2.1+': 'LGPL-2.1-or-later',
+    'LGPLv3': 'LGPL-3.0-only',
+    'LGPLv3+': 'LGPL-3.0-or-later',
+    'AGPLv3': 'AGPL-3.0-only',
+    'AGPLv3+': 'AGPL-3.0-or-later',
+    'GFDLv1.1+': 'GFDL-1.1-or-later',
+    'GFDLv1.2+': 'GFDL-1.2-or-later',
+    'GFDLv1.3+': 'GFDL-1.3-or-later',
+    'ASL 1.0': 'Apache-1.0',
+    'ASL 1.1': 'Apache-1.1',
+    'ASL 2.0': 'Apache-2.0',
+    'MPLv1.0': 'MPL-1.0',
+    'MPLv1.1': 'MPL-1.1',
+    'MPLv2.0': 'MPL-2.0',
+    'EPL': 'EPL-1.0',
+    'EPL-1.0': 'EPL-1.0',
+    'EPL-2.0': 'EPL-2.0',
+    'CDDL': 'CDDL-1.0',
+    'CDDL-1.1': 'CDDL-1.1',
+    'Artistic': 'Artistic-1.0-Perl',
+    'Artistic 2.0': 'Artistic-2.0',
+    'Artistic clarified': 'ClArtistic',
+    'BSD with advertising': 'BSD-4-Clause',
+    'Boost': 'BSL-1.0',
+    'Bitstream Vera': 'Bitstream-Vera',
+    'CC0': 'CC0-1.0',
+    'OFL': 'OFL-1.1',
+    'PHP': 'PHP-3.01',
+    'QPL': 'QPL-1.0',
+    'Sleepycat': 'Sleepycat',
+    'TCL': 'TCL',
+    'IJG': 'IJG',
+    'Vim': 'Vim',
+    'Ruby': 'Ruby',
+    'W3C': 'W3C',
+    'zlib': 'Zlib',
+    'OpenSSL': 'OpenSSL',
+    'PostgreSQL': 'PostgreSQL',
+    'libtiff': 'libtiff',
+    'Rdisc': 'Rdisc',
+    'ISC': 'ISC',
+    'MIT': 'MIT',
+    'NCSA': 'NCSA',
+}
+
+_LEGACY_LICENSES_LOWERCASE = {tag.lower(): spdx_id for tag, spdx_id in LEGACY_LICENSES.items()}
+
+### NOTE:
+##  Tags containing spaces must be matched as a whole before the string is split
+##  into words, longer tags first (e.g. "BSD with advertising" isn't "BSD" with "advertising").
+_TOKEN_RE = re.compile(
+    r'\s*(?:(?P<paren>[()])|(?P<tag>{tags})(?=[\s()]|$)|(?P<word>[^\s()]+))'.format(
+        tags='|'.join(
+            re.escape(tag)
+            for tag in sorted(LEGACY_LICENSES, key=len, reverse=True)
+            if ' ' in tag
+        ),
+    ),
+    re.IGNORECASE,
+)
+_OPERATORS = ('and', 'or')
+_WITH = 'with'
+
+def translate_license_expression(licenses_str: str, licensing: Licensing) -> Optional[LicenseExpression]:
+    """
+    Returns the SPDX license expression of the RPM license string made of Fedora
+    legacy tags and/or SPDX license ids joined by and/or/with, built with licensing
+    from the SPDX license of every tag. Returns None if the string contains anything
+    else or is not a well-formed expression, so it has to be parsed by the SPDX parser.
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(licenses_str):
+        paren, tag, word = match.group('paren', 'tag', 'word')
+        if paren is not None:
+            tokens.append(paren)
+        elif word is not None and word.lower() in _OPERATORS + (_WITH,):
+            tokens.append(word.lower())
+        else:
+            tokens.append(_Symbol(tag or word))
+    try:
+        return _ExpressionBuilder(tokens, licensing).build()
+    except _NotTranslatable:
+        return None
+
+def translate_license_ids(licenses_str: str, licensing: Licensing) -> Optional[list[str]]:
+    """
+    Returns SPDX license ids (and exception ids) of the RPM license string
+    in the order of their first appearance, see translate_license_expression.
+    """
+    expression = translate_license_expression(licenses_str, licensing)
+    if expression is None:
+        return None
+    return [symbol.key for symbol in licensing.license_symbols(expression)]
+
+class _Symbol(str):
+    """License tag or id as written in the RPM license string"""
+
+class _NotTranslatable(Exception):
+    pass
+
+class _ExpressionBuilder:
+    """
+    Recursive descent parser of the tokens of RPM license string.
+    As in SPDX, "with" binds tighter than "and", which binds tighter than "or".
+    """
+    tokens: list[str]
+    pos: int
+    licensing: Licensing
+
+    def __init__(self, tokens: list[str], licensing: Licensing):
+        self.tokens = tokens
+        self.pos = 0
+        self.licensing = licensing
+
+    def build(self) -> LicenseExpression:
+        expression = self._parse_or()
+        if self.pos != len(self.tokens):
+            raise _NotTranslatable()
+        return expression
+
+    def _parse_or(self) -> LicenseExpression:
+        args = [self._parse_and()]
+        while self._accept('or'):
+            args.append(self._parse_and())
+        return args[0] if len(args) == 1 else self.licensing.OR(*args)
+
+    def _parse_and(self) -> LicenseExpression:
+        args = [self._parse_with()]
+        while self._accept('and'):
+            args.append(self._parse_with())
+        return args[0] if len(args) == 1 else self.licensing.AND(*args)
+
+    def _parse_with(self) -> LicenseExpression:
+        if self._accept('('):
+            expression = self._parse_or()
+            if not self._accept(')'):
+                raise _NotTranslatable()
+            return expression
+        license_symbol = self._next_symbol(exception=False)
+        if self._accept(_WITH):
+            return LicenseWithExceptionSymbol(license_symbol, self._next_symbol(exception=True))
+        return license_symbol
+
+    def _accept(self, token: str) -> bool:
+        if self.pos < len(self.tokens) and not isinstance(self.tokens[self.pos], _Symbol) \
+                and self.tokens[self.pos] == token:
+            self.pos += 1
+            return True
+        return False
+
+    def _next_symbol(self, exception: bool) -> LicenseSymbol:
+        if self.pos == len(self.tokens) or not isinstance(self.tokens[self.pos], _Symbol):
+            raise _NotTranslatable()
+        symbol = _lookup_symbol(self.tokens[self.pos], self.licensing, exception)
+        if symbol is None:
+            raise _NotTranslatable()
+        self.pos += 1
+        return symbol
+
+def _lookup_symbol(token: str, licensing: Licensing, exception: bool) -> Optional[LicenseSymbol]:
+    token = token.lower()
+    if not exception and token in _LEGACY_LICENSES_LOWERCASE:
+        return licensing.known_symbols[_LEGACY_LICENSES_LOWERCASE[token]]
+    symbol = licensing.known_symbols_lowercase.get(token)
+    if symbol is None or symbol.is_exception != exception:
+        return None
+    return symbol
@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+import threading
+from logging import getLogger
+from pathlib import Path
+from typing import Any, BinaryIO, ClassVar, Optional
+
+from alma_sbom._version import __version__
+
+_logger = getLogger(__name__)
+
+class ResponseBundle:
+    """
+    Raw responses of immudb and ALBS recorded by one run and replayed by
+    others without any network access. A bundle is a directory with a manifest
+    and gzipped NDJSON segments of responses, one segment per process,
+    so worker processes of --jobs record into the same bundle without locking.
+    """
+    VERSION: ClassVar[int] = 1
+    MANIFEST_FILE: ClassVar[str] = 'manifest.json'
+    SEGMENT_GLOB: ClassVar[str] = 'responses-*.ndjson.gz'
+
+    KIND_IMMUDB: ClassVar[str] = 'immudb'
+    KIND_ALBS: ClassVar[str] = 'albs'
+
+    bundle_dir: Path
+    replay: bool
+    _responses: Optional[dict[tuple[str, str], Any]]
+    _segment: Optional[BinaryIO]
+    _lock: threading.Lock
+
+    def __init__(self, bundle_dir: Path, replay: bool = False):
+        self.bundle_dir = Path(bundle_dir)
+        self.replay = replay
+        self._responses = None
+        self._segment = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'ResponseBundle':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def load(self, kind: str, key: str) -> Any:
+        """
+        Returns the recorded response. Raises KeyError if the bundle doesn't hold it,
+        as the collectors do for packages which are not found.
+        """
+        with self._lock:
+            if self._responses is None:
+                self._responses = self._read_segments()
+        try:
+            return self._responses[(kind, key)]
+        except KeyError:
+            raise KeyError(f'No {kind} response for {key} has been recorded in {self.bundle_dir}')
+
+    def save(self, kind: str, key: str, response: Any) -> None:
+        ### NOTE:
+        ##  Every response is written as a gzip member of its own, so the bundle
+        ##  stays readable even if the run (or a worker process) doesn't close it.
+        member = gzip.compress((json.dumps({'kind': kind, 'key': key, 'response': response}) + '\n').encode('utf8'))
+        with self._lock:
+            if self._segment is None:
+                self._segment = self._open_segment()
+            self._segment.write(member)
+            self._segment.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+
+    def _open_segment(self) -> BinaryIO:
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.bundle_dir / self.MANIFEST_FILE
+        if not manifest_path.exists():
+            tmp_path = manifest_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'w') as fd:
+                json.dump({'version': self.VERSION, 'alma_sbom_version': __version__}, fd)
+            os.replace(tmp_path, manifest_path)
+        segment_path = self.bundle_dir / f'responses-{os.getpid()}.ndjson.gz'
+        _logger.info(f'Recording immudb and ALBS responses into {segment_path}')
+        return open(segment_path, 'ab')
+
+    def _read_segments(self) -> dict[tuple[str, str], Any]:
+        manifest_path = self.bundle_dir / self.MANIFEST_FILE
+        try:
+            with open(manifest_path, 'r') as fd:
+                manifest = json.load(fd)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"'{self.bundle_dir}' is not a bundle of recorded responses")
+        if manifest.get('version') != self.VERSION:
+            raise ValueError(f"Bundle '{self.bundle_dir}' has unsupported version {manifest.get('version')}")
+        if manifest.get('alma_sbom_version') != __version__:
+            _logger.warning(
+                f"Bundle '{self.bundle_dir}' has been recorded by alma-sbom {manifest.get('alma_sbom_version')}"
+            )
+
+        responses = {}
+        for segment_path in sorted(self.bundle_dir.glob(self.SEGMENT_GLOB)):
+            with gzip.open(segment_path, 'rt', encoding='utf8') as fd:
+                try:
+                    for line in fd:
+                        record = json.loads(line)
+                        responses[(record['kind'], record['key'])] = record['response']
+                except (EOFError, gzip.BadGzipFile, ValueError) as e:
+                    ### NOTE:
+                    ##  The recording process could have been killed in the middle of a response
+                    _logger.warning(f'Ignoring the truncated end of {segment_path}: {e}')
+        _logger.info(f'Replaying {len(responses)} responses from {self.bundle_dir}')
+        return responses
@@ -0,0 +1,119 @@
+import bz2
+import gzip
+import lzma
+import xml.etree.ElementTree as ET
+from logging import getLogger
+from typing import BinaryIO, ClassVar, Iterator
+
+from alma_sbom.type import Hash, Algorithms
+from alma_sbom.data.models import Package, PackageNevra
+
+from .dependencies import is_package_requirement
+from .rpm import proc_licenses
+
+_logger = getLogger(__name__)
+
+class RepodataCollector:
+    """
+    Collects package data from repository metadata (repodata) created by createrepo.
+    primary.xml is parsed as a stream, so memory usage doesn't depend on its size.
+    """
+    REPO_NS: ClassVar[str] = '{http://linux.duke.edu/metadata/repo}'
+    COMMON_NS: ClassVar[str] = '{http://linux.duke.edu/metadata/common}'
+    RPM_NS: ClassVar[str] = '{http://linux.duke.edu/metadata/rpm}'
+    PATH_TO_REPOMD: ClassVar[str] = 'repodata/repomd.xml'
+    DECOMPRESSORS: ClassVar[dict] = {
+        '.gz': gzip.GzipFile,
+        '.xz': lzma.LZMAFile,
+        '.bz2': bz2.BZ2File,
+    }
+    CHECKSUM_TYPES: ClassVar[dict[str, Algorithms]] = {
+        'sha256': Algorithms.SHA_256,
+    }
+
+    ### NOTE:
+    ##  Requires and provides of packages, see resolve_dependencies
+    collect_dependencies: bool
+
+    def __init__(self, collect_dependencies: bool = False):
+        self.collect_dependencies = collect_dependencies
+
+    def get_primary_location(self, repomd_fp: BinaryIO) -> str:
+        """Returns location of primary.xml relative to the repository root"""
+        repomd = ET.parse(repomd_fp).getroot()
+        for data in repomd.iter(f'{self.REPO_NS}data'):
+            if data.get('type') == 'primary':
+                return data.find(f'{self.REPO_NS}location').get('href')
+        raise KeyError('Can not find primary metadata in repomd.xml')
+
+    def iter_packages(self, primary_fp: BinaryIO, primary_location: str) -> Iterator[tuple[str, Package]]:
+        """Yields location of each package relative to the repository root and its package data"""
+        with self._open_primary(primary_fp, primary_location) as fp:
+            for event, elem in ET.iterparse(fp, events=('end',)):
+                if elem.tag != f'{self.COMMON_NS}package':
+                    continue
+                if elem.get('type') == 'rpm':
+                    yield self._package_from_element(elem)
+                ### NOTE:
+                ##  Drop parsed package element to keep memory usage flat
+                elem.clear()
+
+    def _open_primary(self, primary_fp: BinaryIO, primary_location: str) -> BinaryIO:
+        for suffix, decompressor in self.DECOMPRESSORS.items():
+            if primary_location.endswith(suffix):
+                return decompressor(fileobj=primary_fp)
+        if primary_location.endswith('.xml'):
+            return primary_fp
+        raise ValueError(f'Unsupported compression of primary metadata: {primary_location}')
+
+    def _package_from_element(self, elem: ET.Element) -> tuple[str, Package]:
+        version = elem.find(f'{self.COMMON_NS}version')
+        epoch = version.get('epoch')
+        package_nevra = PackageNevra(
+            ### NOTE:
+            # repodata doesn't distinguish missing epoch from 0,
+            # treat them as missing like RpmCollector does for most packages.
+            epoch = int(epoch) if epoch and epoch != '0' else None,
+            name = elem.findtext(f'{self.COMMON_NS}name'),
+            version = version.get('ver'),
+            release = version.get('rel'),
+            arch = elem.findtext(f'{self.COMMON_NS}arch'),
+        )
+
+        checksum = elem.find(f'{self.COMMON_NS}checksum')
+        checksum_type = checksum.get('type')
+        if checksum_type not in self.CHECKSUM_TYPES:
+            raise ValueError(f'Unsupported checksum type in primary metadata: {checksum_type}')
+
+        fmt = elem.find(f'{self.COMMON_NS}format')
+        pkg = Package(
+            package_nevra = package_nevra,
+            source_rpm = fmt.findtext(f'{self.RPM_NS}sourcerpm') or None,
+            hashs = [Hash(value=checksum.text, algorithm=self.CHECKSUM_TYPES[checksum_type])],
+        )
+        pkg.licenses = proc_licenses(fmt.findtext(f'{self.RPM_NS}license'))
+        pkg.summary = elem.findtext(f'{self.COMMON_NS}summary')
+        pkg.description = elem.findtext(f'{self.COMMON_NS}description')
+        if self.collect_dependencies:
+            pkg.requires, pkg.provides = self._capabilities_from_format(fmt)
+
+        location = elem.find(f'{self.COMMON_NS}location').get('href')
+        return location, pkg
+
+    def _capabilities_from_format(self, fmt: ET.Element) -> tuple[list[str], list[str]]:
+        """
+        Returns names of capabilities the package requires and provides.
+        primary.xml lists only the files other packages may require by path,
+        which are exactly the files provided by the package.
+        """
+        requires = [
+            name for name in dict.fromkeys(
+                entry.get('name') for entry in fmt.iterfind(f'{self.RPM_NS}requires/{self.RPM_NS}entry')
+            )
+            if is_package_requirement(name)
+        ]
+        provides = list(dict.fromkeys(
+            entry.get('name') for entry in fmt.iterfind(f'{self.RPM_NS}provides/{self.RPM_NS}entry')
+        ))
+        provides += [f.text for f in fmt.iterfind(f'{self.COMMON_NS}file')]
+        return requires, provides
@@ -1,43 +1,221 @@
 import hashlib
-import rpm
-from license_expression import get_spdx_licensing, ExpressionError
+import os
+import sys
+from array import array
+from contextlib import contextmanager
+from functools import lru_cache
+from license_expression import get_spdx_licensing, ExpressionError, Licensing
 from pathlib import Path
-from typing import Union
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Optional, Union
 
-from alma_sbom.type import Hash, Licenses
+from alma_sbom.type import Algorithms, Hash, Licenses, PackageFiles
 from alma_sbom.data.models import Package, PackageNevra
 
+from .dependencies import is_primary_file, is_package_requirement
+from .licenses import translate_license_expression
+from .rpm_header import (
+    RpmHeader,
+    RpmPackageHeaders,
+    RPMTAG_NAME,
+    RPMTAG_VERSION,
+    RPMTAG_RELEASE,
+    RPMTAG_EPOCH,
+    RPMTAG_SUMMARY,
+    RPMTAG_DESCRIPTION,
+    RPMTAG_LICENSE,
+    RPMTAG_ARCH,
+    RPMTAG_SOURCERPM,
+    RPMTAG_DIRNAMES,
+    RPMTAG_DIRINDEXES,
+    RPMTAG_BASENAMES,
+    RPMTAG_FILESIZES,
+    RPMTAG_LONGFILESIZES,
+    RPMTAG_FILEDIGESTS,
+    RPMTAG_FILEDIGESTALGO,
+    RPMTAG_PROVIDENAME,
+    RPMTAG_REQUIRENAME,
+)
+
+### NOTE:
+##  librpm bindings are optional, headers are read
+##  by the pure Python parser of rpm_header without them.
+try:
+    import rpm
+except ImportError:
+    rpm = None
+
+_RPM_ERRORS = (OSError, ValueError) + ((rpm.error,) if rpm else ())
+
+### NOTE:
+##  Algorithms of RPMTAG_FILEDIGESTALGO (PGP hash algorithm ids) which can be put into SBOM
+FILE_DIGEST_ALGORITHMS = {
+    2: Algorithms.SHA_1,
+    8: Algorithms.SHA_256,
+    10: Algorithms.SHA_512,
+}
+
 class RpmCollector:
-    ts: rpm.TransactionSet
+    """
+    Collects package data from headers of RPM packages. Headers are read
+    by librpm (rpm.TransactionSet) or, with use_librpm=False, by the pure
+    Python parser, which has no per-process state and doesn't depend on
+    the RPM version of the host.
+    """
+    use_librpm: bool
+    ### NOTE:
+    ##  Digests of the package put into the SBOM, computed in a single read
+    algorithms: list[Algorithms]
+    ### NOTE:
+    ##  Files of the package are taken from its header, the payload is never read
+    collect_files: bool
+    ### NOTE:
+    ##  Requires and provides of the package, see resolve_dependencies
+    collect_dependencies: bool
+    ts: 'rpm.TransactionSet'
 
-    def __init__(self):
-        self.ts = rpm.TransactionSet()
+    def __init__(
+        self,
+        use_librpm: bool = True,
+        algorithms: Iterable[Algorithms] = (Algorithms.SHA_256,),
+        collect_files: bool = False,
+        collect_dependencies: bool = False,
+    ):
+        self.use_librpm = use_librpm
+        self.algorithms = list(algorithms)
+        self.collect_files = collect_files
+        self.collect_dependencies = collect_dependencies
+        self.ts = None
+        if use_librpm:
+            if rpm is None:
+                raise RuntimeError('librpm Python bindings (rpm module) are not installed, use the Python header parser')
+            self.ts = rpm.TransactionSet()
 
-    def collect_package_from_file(self, rpm_package: Path) -> Package:
+    def collect_package_from_file(
+        self,
+        rpm_package: Path,
+        hash_value: str = None,
+        hashes: list[Hash] = None,
+    ) -> Package:
+        """
+        Collects package data from an RPM package file. If checksums of the
+        package are already known (e.g. computed while the package was
+        extracted), pass them as hashes (or SHA256 checksum as hash_value,
+        if only SHA256 is collected) to avoid reading the whole file again.
+        """
+        with _handle_rpm_errors():
+            with open(rpm_package, 'rb') as fd:
+                hdr = self._read_header(fd.fileno(), 0)
+        return self._package_from_header(hdr, self._get_hashes(
+            hash_value,
+            hashes,
+            lambda algorithms: digest_file(rpm_package, algorithms),
+        ))
+
+    def collect_package_from_buffer(
+        self,
+        buff: Union[bytes, memoryview],
+        hash_value: str = None,
+        hashes: list[Hash] = None,
+    ) -> Package:
+        """
+        Collects package data from an RPM package in memory, e.g. a memoryview
+        of the memory mapped ISO image. Headers are always read by the pure
+        Python parser, because librpm reads packages only from files.
+        """
+        with _handle_rpm_errors():
+            hdr = RpmPackageHeaders.from_buffer(buff).header
+        return self._package_from_header(hdr, self._get_hashes(
+            hash_value,
+            hashes,
+            lambda algorithms: digest_buffer(buff, algorithms),
+        ))
+
+    def collect_package_from_fileobj(
+        self,
+        fileobj: BinaryIO,
+        hash_value: str = None,
+        hashes: list[Hash] = None,
+    ) -> Package:
+        """
+        Collects package data from an RPM package read from the current position
+        of the binary file object up to its end, e.g. HTTP response body.
+        The file object is read once and is never seeked, so it may be a stream.
+        Headers are always read by the pure Python parser. If checksums are not
+        passed, the package is hashed while it is read.
+        """
+        if hashes is None and hash_value is not None and self.algorithms == [Algorithms.SHA_256]:
+            hashes = [Hash(value=hash_value)]
+        reader = fileobj if hashes is not None else _HashingReader(fileobj, MultiHasher(self.algorithms))
+        with _handle_rpm_errors():
+            hdr = RpmPackageHeaders.from_fileobj(reader).header
+        if hashes is None:
+            hashes = _update_hasher(reader.hasher, fileobj).get_hashes()
+        return self._package_from_header(hdr, hashes)
+
+    def collect_package_from_fd(
+        self,
+        fd: int,
+        offset: int,
+        hash_value: str = None,
+        hashes: list[Hash] = None,
+    ) -> Package:
+        """
+        Collects package data from an RPM package stored in the opened file
+        (e.g. ISO image) at the given offset. The file is not copied,
+        only the header region of the package is read, so checksums of
+        the package must be passed by the caller.
+        """
+        with _handle_rpm_errors():
+            hdr = self._read_header(fd, offset)
+        return self._package_from_header(hdr, self._get_hashes(hash_value, hashes))
+
+    def _get_hashes(
+        self,
+        hash_value: Optional[str],
+        hashes: Optional[list[Hash]],
+        digest: Callable[[list[Algorithms]], list[Hash]] = None,
+    ) -> list[Hash]:
+        if hashes is not None:
+            return hashes
+        ### NOTE:
+        ##  SHA256 checksum alone is enough only if no other digests are collected,
+        ##  otherwise the package is read once to compute all of them together.
+        if hash_value is not None and (digest is None or self.algorithms == [Algorithms.SHA_256]):
+            return [Hash(value=hash_value)]
+        if digest is None:
+            raise ValueError('Checksums of RPM package are not provided')
+        return digest(self.algorithms)
+
+    def _read_header(self, fd: int, offset: int) -> Any:
+        if not self.use_librpm:
+            return RpmPackageHeaders.from_fd(fd, offset).header
+        ### NOTE:
+        ##  hdrFromFdno reads from the offset of the descriptor, so the header is read through
+        ##  a descriptor of its own. The offset of the caller's one (e.g. of an ISO image which is
+        ##  read by a buffered file object too) is never moved. os.dup isn't enough for that,
+        ##  as duplicated descriptors share their offset.
+        header_fd = os.open(f'/proc/self/fd/{fd}', os.O_RDONLY)
         try:
-            with open(rpm_package) as fd:
-                hdr = self.ts.hdrFromFdno(fd)
-        except (OSError, rpm.error) as e:
-            e.args = (f'Error opening RPM package: {str(e)}',) + e.args[1:]
-            raise
-        except Exception as e:
-            e.args = (f'Unknown error while processing RPM package: {str(e)}',) + e.args[1:]
-            raise
+            os.lseek(header_fd, offset, os.SEEK_SET)
+            return self.ts.hdrFromFdno(header_fd)
+        finally:
+            os.close(header_fd)
 
+    def _package_from_header(self, hdr: Any, hashes: list[Hash]) -> Package:
         package_nevra = PackageNevra(
             ### NOTE:
             # In alma-sbom, null epoch is represented as 0
             # Please see normalize_epoch implementation for more details
-            epoch = hdr[rpm.RPMTAG_EPOCH],
-            name = hdr[rpm.RPMTAG_NAME],
-            version = hdr[rpm.RPMTAG_VERSION],
-            release = hdr[rpm.RPMTAG_RELEASE],
-            arch = hdr[rpm.RPMTAG_ARCH],
+            epoch = hdr[RPMTAG_EPOCH],
+            name = hdr[RPMTAG_NAME],
+            version = hdr[RPMTAG_VERSION],
+            release = hdr[RPMTAG_RELEASE],
+            arch = hdr[RPMTAG_ARCH],
         )
         pkg = Package(
             package_nevra = package_nevra,
-            source_rpm = hdr[rpm.RPMTAG_SOURCERPM],
-            hashs = [Hash(value=hash_file(rpm_package))],
+            source_rpm = hdr[RPMTAG_SOURCERPM],
+            hashs = hashes,
             ### NOTE:
             ##  There are little bit difference of buildtime between immudb_metadata & rpm_package.
             ##  So, now we don't set buildtime using rpm_package info.
@@ -45,7 +223,7 @@ class RpmCollector:
             ##  info in immudb, None will be stored.
             ##  Or, We should set it anymore? because whenever this code is executed, immudb_metadata is None or lacking.
             ##  If you want do this, uncomment below block.
-            #package_timestamp = hdr[rpm.RPMTAG_BUILDTIME],
+            #package_timestamp = hdr[RPMTAG_BUILDTIME],
             ### NOTE:
             ## data from rpm package doesn't have propeties info
             #package_properties = None,
@@ -53,24 +231,154 @@ class RpmCollector:
             #sbom_properties = None,
         )
 
-        pkg.licenses = _proc_licenses(hdr[rpm.RPMTAG_LICENSE])
-        pkg.summary = hdr[rpm.RPMTAG_SUMMARY]
-        pkg.description = hdr[rpm.RPMTAG_DESCRIPTION]
+        pkg.licenses = proc_licenses(hdr[RPMTAG_LICENSE])
+        pkg.summary = hdr[RPMTAG_SUMMARY]
+        pkg.description = hdr[RPMTAG_DESCRIPTION]
+        if self.collect_files:
+            pkg.files = _files_from_header(hdr)
+        if self.collect_dependencies:
+            pkg.requires, pkg.provides = _capabilities_from_header(hdr)
 
         return pkg
 
-def _proc_licenses(licenses_str: str) -> Licenses:
-    licensing = get_spdx_licensing()
-    licenses = Licenses(ids=[], expression=licenses_str)
+def _get_values(hdr: Any, tag: int) -> list:
+    ### NOTE:
+    ##  librpm returns lists for array tags, RpmHeader returns the first value of them
+    return hdr.get_values(tag) if isinstance(hdr, RpmHeader) else (hdr[tag] or [])
+
+def _iter_paths(hdr: Any) -> Iterator[str]:
+    dirnames = _get_values(hdr, RPMTAG_DIRNAMES)
+    for dirindex, basename in zip(_get_values(hdr, RPMTAG_DIRINDEXES), _get_values(hdr, RPMTAG_BASENAMES)):
+        yield dirnames[dirindex] + basename
+
+def _capabilities_from_header(hdr: Any) -> tuple[list[str], list[str]]:
+    """Returns names of capabilities the package requires and provides, including provided files"""
+    requires = [
+        name for name in dict.fromkeys(_get_values(hdr, RPMTAG_REQUIRENAME))
+        if is_package_requirement(name)
+    ]
+    provides = list(dict.fromkeys(_get_values(hdr, RPMTAG_PROVIDENAME)))
+    provides += [path for path in _iter_paths(hdr) if is_primary_file(path)]
+    return requires, provides
+
+def _files_from_header(hdr: Any) -> PackageFiles:
+    """
+    Returns regular files of the package listed in its header. Directories,
+    symlinks and ghost files have no digest in the header and are skipped.
+    """
+    digest_algo = hdr[RPMTAG_FILEDIGESTALGO]
+    ### NOTE:
+    ##  Sizes of packages with files over 4 GiB are stored in RPMTAG_LONGFILESIZES only
+    sizes = _get_values(hdr, RPMTAG_LONGFILESIZES) or _get_values(hdr, RPMTAG_FILESIZES)
+    files = PackageFiles(
+        ### NOTE:
+        ##  The same directories appear in many packages of an ISO image
+        dirnames=[sys.intern(dirname) for dirname in _get_values(hdr, RPMTAG_DIRNAMES)],
+        dirindexes=array('I'),
+        basenames=[],
+        sizes=array('Q'),
+        digests=[],
+        algorithm=FILE_DIGEST_ALGORITHMS.get(digest_algo if digest_algo is not None else 1),
+    )
+    for dirindex, basename, size, digest in zip(
+        _get_values(hdr, RPMTAG_DIRINDEXES),
+        _get_values(hdr, RPMTAG_BASENAMES),
+        sizes,
+        _get_values(hdr, RPMTAG_FILEDIGESTS),
+    ):
+        if not digest:
+            continue
+        files.dirindexes.append(dirindex)
+        files.basenames.append(basename)
+        files.sizes.append(size)
+        files.digests.append(digest)
+    return files
+
+@contextmanager
+def _handle_rpm_errors() -> Iterator[None]:
     try:
-        parsed = licensing.parse(licenses_str, validate=True)
-    except ExpressionError as err:
-        pass
-    else:
-        symbols = licensing.license_symbols(parsed)
-        for sym in symbols:
-            licenses.ids.append(str(sym))
-    return licenses
+        yield
+    except _RPM_ERRORS as e:
+        e.args = (f'Error opening RPM package: {str(e)}',) + e.args[1:]
+        raise
+    except Exception as e:
+        e.args = (f'Unknown error while processing RPM package: {str(e)}',) + e.args[1:]
+        raise
+
+### NOTE:
+##  Number of distinct license strings kept parsed. An ISO image
+##  has a few hundred of them repeated across thousands of packages.
+LICENSES_CACHE_SIZE = 4096
+
+def proc_licenses(licenses_str: str) -> Licenses:
+    """Returns licenses of the RPM license string, as in RPM headers and repodata"""
+    ids, expression = _parse_licenses(licenses_str)
+    ### NOTE:
+    ##  Licenses are mutable, so every package gets its own copy of the cached ids
+    return Licenses(ids=list(ids), expression=expression)
+
+@lru_cache(maxsize=None)
+def _get_licensing() -> Licensing:
+    ### NOTE:
+    ##  get_spdx_licensing builds the whole SPDX license symbol index on every call
+    return get_spdx_licensing()
+
+@lru_cache(maxsize=LICENSES_CACHE_SIZE)
+def _parse_licenses(licenses_str: str) -> tuple[tuple[str, ...], str]:
+    """Returns SPDX license ids and SPDX license expression of the RPM license string"""
+    licensing = _get_licensing()
+    ### NOTE:
+    ##  Most license strings are made of Fedora legacy tags and/or SPDX ids,
+    ##  which are translated by table lookups. Only the rest goes through
+    ##  the SPDX parser, which raises ExpressionError for legacy tags.
+    ##  Strings which can't be parsed are kept as they are.
+    parsed = translate_license_expression(licenses_str or '', licensing)
+    if parsed is None:
+        try:
+            parsed = licensing.parse(licenses_str, validate=True)
+        except ExpressionError as err:
+            return (), licenses_str
+        if parsed is None:
+            return (), licenses_str
+    return tuple(str(sym) for sym in licensing.license_symbols(parsed)), str(parsed)
+
+def get_licenses_cache_info():
+    """Returns hits, misses, maxsize and currsize of the cache of parsed license strings"""
+    return _parse_licenses.cache_info()
+
+class MultiHasher:
+    """
+    Computes digests of several algorithms over the same data. It has
+    the update() method of hashlib objects, so it can be used in their place,
+    and the data is read only once however many digests are computed.
+    """
+    hashers: dict[Algorithms, 'hashlib._Hash']
+
+    def __init__(self, algorithms: Iterable[Algorithms] = (Algorithms.SHA_256,)):
+        self.hashers = {alg: hashlib.new(alg.get_hashlib_name()) for alg in algorithms}
+
+    def update(self, data: Union[bytes, memoryview]) -> None:
+        for hasher in self.hashers.values():
+            hasher.update(data)
+
+    def hexdigest(self, algorithm: Algorithms = Algorithms.SHA_256) -> str:
+        return self.hashers[algorithm].hexdigest()
+
+    def get_hashes(self) -> list[Hash]:
+        return [Hash(value=hasher.hexdigest(), algorithm=alg) for alg, hasher in self.hashers.items()]
+
+class _HashingReader:
+    """Binary file object wrapper which hashes everything read through it"""
+    fileobj: BinaryIO
+
+    def __init__(self, fileobj: BinaryIO, hasher: MultiHasher):
+        self.fileobj = fileobj
+        self.hasher = hasher
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.hasher.update(data)
+        return data
 
 def hash_file(file_path: Union[str, Path], buff_size: int = 1048576) -> str:
     """
@@ -88,13 +396,138 @@ def hash_file(file_path: Union[str, Path], buff_size: int = 1048576) -> str:
     str
         Checksum (hexadecimal digest) of the file.
     """
-    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as fd:
+        return hash_fileobj(fd, buff_size)
+
+
+def hash_fileobj(fileobj: BinaryIO, buff_size: int = 1048576) -> str:
+    """
+    Returns SHA256 checksum (hexadecimal digest) of the binary file object,
+    read from its current position up to its end.
+
+    Parameters
+    ----------
+    fileobj : BinaryIO
+        File object to hash, e.g. opened file or HTTP response body.
+    buff_size : int
+        Number of bytes to read at once.
+
+    Returns
+    -------
+    str
+        Checksum (hexadecimal digest) of the file object.
+    """
+    return _update_hasher(hashlib.sha256(), fileobj, buff_size).hexdigest()
+
 
+def hash_buffer(buff: Union[bytes, memoryview]) -> str:
+    """
+    Returns SHA256 checksum (hexadecimal digest) of the buffer.
+
+    Parameters
+    ----------
+    buff : bytes or memoryview
+        Data to hash, e.g. a view of the memory mapped ISO image.
+
+    Returns
+    -------
+    str
+        Checksum (hexadecimal digest) of the buffer.
+    """
+    return hashlib.sha256(buff).hexdigest()
+
+
+def digest_file(
+    file_path: Union[str, Path],
+    algorithms: Iterable[Algorithms] = (Algorithms.SHA_256,),
+    buff_size: int = 1048576,
+) -> list[Hash]:
+    """
+    Returns checksums of the file for each of the algorithms, computed in a single read.
+
+    Parameters
+    ----------
+    file_path : str
+        File path to hash.
+    algorithms : Iterable[Algorithms]
+        Algorithms of the checksums.
+    buff_size : int
+        Number of bytes to read at once.
+
+    Returns
+    -------
+    list[Hash]
+        Checksums of the file, in the order of algorithms.
+    """
     with open(file_path, 'rb') as fd:
-        buff = fd.read(buff_size)
-        while len(buff):
-            hasher.update(buff)
-            buff = fd.read(buff_size)
+        return digest_fileobj(fd, algorithms, buff_size)
 
-    return hasher.hexdigest()
 
+def digest_fileobj(
+    fileobj: BinaryIO,
+    algorithms: Iterable[Algorithms] = (Algorithms.SHA_256,),
+    buff_size: int = 1048576,
+) -> list[Hash]:
+    """
+    Returns checksums of the binary file object for each of the algorithms,
+    read once from its current position up to its end.
+
+    Parameters
+    ----------
+    fileobj : BinaryIO
+        File object to hash, e.g. opened file or HTTP response body.
+    algorithms : Iterable[Algorithms]
+        Algorithms of the checksums.
+    buff_size : int
+        Number of bytes to read at once.
+
+    Returns
+    -------
+    list[Hash]
+        Checksums of the file object, in the order of algorithms.
+    """
+    return _update_hasher(MultiHasher(algorithms), fileobj, buff_size).get_hashes()
+
+
+def digest_buffer(
+    buff: Union[bytes, memoryview],
+    algorithms: Iterable[Algorithms] = (Algorithms.SHA_256,),
+) -> list[Hash]:
+    """
+    Returns checksums of the buffer for each of the algorithms.
+
+    Parameters
+    ----------
+    buff : bytes or memoryview
+        Data to hash, e.g. a view of the memory mapped ISO image.
+    algorithms : Iterable[Algorithms]
+        Algorithms of the checksums.
+
+    Returns
+    -------
+    list[Hash]
+        Checksums of the buffer, in the order of algorithms.
+    """
+    hasher = MultiHasher(algorithms)
+    hasher.update(buff)
+    return hasher.get_hashes()
+
+
+def _update_hasher(
+    hasher: Union['hashlib._Hash', MultiHasher],
+    fileobj: BinaryIO,
+    buff_size: int = 1048576,
+) -> Union['hashlib._Hash', MultiHasher]:
+    ### NOTE:
+    ##  Read into the same buffer over and over instead of allocating a new one for every chunk
+    if not hasattr(fileobj, 'readinto'):
+        for buff in iter(lambda: fileobj.read(buff_size), b''):
+            hasher.update(buff)
+        return hasher
+    buff = bytearray(buff_size)
+    view = memoryview(buff)
+    size = fileobj.readinto(view)
+    while size:
+        hasher.update(view[:size])
+        size = fileobj.readinto(view)
+    return hasher
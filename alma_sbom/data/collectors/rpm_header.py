@@ -0,0 +1,279 @@
+import hashlib
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any, BinaryIO, ClassVar, Optional, Union
+
+### NOTE:
+##  Header tags used by alma-sbom. The values are the same as rpm.RPMTAG_*
+##  and rpm.RPMSIGTAG_*, so the tags can be used with headers of librpm too.
+##  See https://github.com/rpm-software-management/rpm/blob/master/include/rpm/rpmtag.h
+RPMTAG_NAME = 1000
+RPMTAG_VERSION = 1001
+RPMTAG_RELEASE = 1002
+RPMTAG_EPOCH = 1003
+RPMTAG_SUMMARY = 1004
+RPMTAG_DESCRIPTION = 1005
+RPMTAG_BUILDTIME = 1006
+RPMTAG_LICENSE = 1014
+RPMTAG_ARCH = 1022
+RPMTAG_FILESIZES = 1028
+RPMTAG_FILEDIGESTS = 1035
+RPMTAG_SOURCERPM = 1044
+RPMTAG_PROVIDENAME = 1047
+RPMTAG_REQUIRENAME = 1049
+RPMTAG_DIRINDEXES = 1116
+RPMTAG_BASENAMES = 1117
+RPMTAG_DIRNAMES = 1118
+RPMTAG_LONGFILESIZES = 5008
+RPMTAG_FILEDIGESTALGO = 5011
+RPMTAG_PAYLOADDIGEST = 5092
+RPMTAG_PAYLOADDIGESTALGO = 5093
+RPMSIGTAG_SHA1 = 269
+RPMSIGTAG_SHA256 = 273
+RPMSIGTAG_MD5 = 1004
+
+### NOTE:
+##  Digest algorithms of RPMTAG_PAYLOADDIGESTALGO and RPMTAG_FILEDIGESTALGO (PGP hash algorithm ids).
+##  Packages without RPMTAG_FILEDIGESTALGO have MD5 file digests.
+PAYLOAD_DIGEST_ALGORITHMS = {
+    1: 'md5',
+    2: 'sha1',
+    8: 'sha256',
+    9: 'sha384',
+    10: 'sha512',
+}
+
+RPM_TYPE_NULL = 0
+RPM_TYPE_CHAR = 1
+RPM_TYPE_INT8 = 2
+RPM_TYPE_INT16 = 3
+RPM_TYPE_INT32 = 4
+RPM_TYPE_INT64 = 5
+RPM_TYPE_STRING = 6
+RPM_TYPE_BIN = 7
+RPM_TYPE_STRING_ARRAY = 8
+RPM_TYPE_I18NSTRING = 9
+
+class RpmHeader:
+    """
+    Header structure (signature or main header) of an RPM package.
+    Only the index is parsed up front, values are decoded from the data store on access.
+    See https://rpm-software-management.github.io/rpm/manual/format_v4.html
+    """
+    MAGIC: ClassVar[bytes] = b'\x8e\xad\xe8\x01'
+    INTRO: ClassVar[struct.Struct] = struct.Struct('>4s4xII')
+    ENTRY: ClassVar[struct.Struct] = struct.Struct('>IIiI')
+    INTEGER_FORMATS: ClassVar[dict[int, str]] = {
+        RPM_TYPE_CHAR: 'B',
+        RPM_TYPE_INT8: 'B',
+        RPM_TYPE_INT16: 'H',
+        RPM_TYPE_INT32: 'I',
+        RPM_TYPE_INT64: 'Q',
+    }
+    STRING_TYPES: ClassVar[tuple[int, ...]] = (RPM_TYPE_STRING, RPM_TYPE_STRING_ARRAY, RPM_TYPE_I18NSTRING)
+
+    blob: bytes
+    index: dict[int, tuple[int, int, int]]
+    store: bytes
+
+    def __init__(self, buff: Union[bytes, memoryview]) -> None:
+        """
+        Parses the header at the beginning of buff. Only the header itself
+        is copied out of buff, so buff may be a view of the whole package or ISO image.
+        """
+        nindex, hsize = self.parse_intro(buff[:self.INTRO.size])
+        index_end = self.INTRO.size + nindex * self.ENTRY.size
+        if len(buff) < index_end + hsize:
+            raise ValueError('RPM header is truncated')
+        self.blob = bytes(buff[:index_end + hsize])
+        self.index = {}
+        for tag, tag_type, offset, count in self.ENTRY.iter_unpack(self.blob[self.INTRO.size:index_end]):
+            if offset < 0 or offset > hsize:
+                raise ValueError(f'RPM header tag {tag} points out of the header')
+            self.index[tag] = (tag_type, offset, count)
+        self.store = self.blob[index_end:]
+
+    @classmethod
+    def parse_intro(cls, intro: Union[bytes, memoryview]) -> tuple[int, int]:
+        """Returns number of index entries and size of data store of the header"""
+        if len(intro) < cls.INTRO.size:
+            raise ValueError('RPM header is truncated')
+        magic, nindex, hsize = cls.INTRO.unpack(intro)
+        if magic != cls.MAGIC:
+            raise ValueError('Bad magic of RPM header')
+        return nindex, hsize
+
+    @classmethod
+    def get_size(cls, intro: Union[bytes, memoryview]) -> int:
+        """Returns size of the whole header by its intro (the first 16 bytes)"""
+        nindex, hsize = cls.parse_intro(intro)
+        return cls.INTRO.size + nindex * cls.ENTRY.size + hsize
+
+    def __len__(self) -> int:
+        return len(self.blob)
+
+    def __contains__(self, tag: int) -> bool:
+        return tag in self.index
+
+    def __getitem__(self, tag: int) -> Any:
+        """
+        Returns the value of the tag like rpm.hdr does for scalar tags:
+        the first value of numeric and i18n string tags, a list for string
+        arrays and bytes for binary tags. Returns None if the tag is missing.
+        """
+        if tag not in self.index:
+            return None
+        tag_type = self.index[tag][0]
+        values = self.get_values(tag)
+        if tag_type in (RPM_TYPE_BIN, RPM_TYPE_STRING_ARRAY):
+            return values
+        return values[0] if values else None
+
+    def get_values(self, tag: int) -> Union[list, bytes]:
+        """Returns all values of the tag, or bytes for binary tags"""
+        if tag not in self.index:
+            return []
+        tag_type, offset, count = self.index[tag]
+        if tag_type in self.INTEGER_FORMATS:
+            fmt = struct.Struct(f'>{count}{self.INTEGER_FORMATS[tag_type]}')
+            return list(fmt.unpack_from(self.store, offset))
+        if tag_type == RPM_TYPE_BIN:
+            return bytes(self.store[offset:offset + count])
+        if tag_type in self.STRING_TYPES:
+            return self._read_strings(offset, 1 if tag_type == RPM_TYPE_STRING else count)
+        if tag_type == RPM_TYPE_NULL:
+            return []
+        raise ValueError(f'Unknown type {tag_type} of RPM header tag {tag}')
+
+    def _read_strings(self, offset: int, count: int) -> list[str]:
+        values = []
+        for _ in range(count):
+            end = self.store.find(b'\0', offset)
+            if end < 0:
+                raise ValueError('Unterminated string in RPM header')
+            values.append(self.store[offset:end].decode('utf8', errors='replace'))
+            offset = end + 1
+        return values
+
+@dataclass
+class RpmPackageHeaders:
+    """
+    Lead, signature header and main header of an RPM package,
+    read without the payload and without librpm.
+    """
+    LEAD_MAGIC: ClassVar[bytes] = b'\xed\xab\xee\xdb'
+    LEAD_SIZE: ClassVar[int] = 96
+    ### NOTE:
+    ##  The signature header is padded to a multiple of 8 bytes
+    SIGNATURE_ALIGNMENT: ClassVar[int] = 8
+
+    signature: RpmHeader
+    header: RpmHeader
+
+    @classmethod
+    def from_buffer(cls, buff: Union[bytes, memoryview]) -> 'RpmPackageHeaders':
+        """Parses headers of the RPM package at the beginning of buff (e.g. a memoryview of ISO image)"""
+        buff = memoryview(buff)
+        cls._check_lead(buff[:cls.LEAD_SIZE])
+        signature = RpmHeader(buff[cls.LEAD_SIZE:])
+        header = RpmHeader(buff[cls.LEAD_SIZE + cls._align(len(signature)):])
+        return cls(signature=signature, header=header)
+
+    @classmethod
+    def from_fd(cls, fd: int, offset: int = 0) -> 'RpmPackageHeaders':
+        """
+        Reads headers of the RPM package stored in the opened file at the given offset.
+        Only the header region is read, its size is taken from the intro of each header.
+        The file position is not used, so the same fd can be shared across threads.
+        """
+        intro_size = RpmHeader.INTRO.size
+        lead = cls._pread(fd, cls.LEAD_SIZE + intro_size, offset)
+        cls._check_lead(lead[:cls.LEAD_SIZE])
+
+        signature_offset = offset + cls.LEAD_SIZE
+        signature_size = RpmHeader.get_size(lead[cls.LEAD_SIZE:])
+        header_offset = signature_offset + cls._align(signature_size)
+        ### NOTE:
+        ##  Read the signature together with the intro of the main header
+        buff = cls._pread(fd, header_offset - signature_offset + intro_size, signature_offset)
+        signature = RpmHeader(buff)
+        header_size = RpmHeader.get_size(buff[-intro_size:])
+        header = RpmHeader(cls._pread(fd, header_size, header_offset))
+        return cls(signature=signature, header=header)
+
+    @classmethod
+    def from_fileobj(cls, fileobj: BinaryIO) -> 'RpmPackageHeaders':
+        """
+        Reads headers of the RPM package from the current position of the binary
+        file object (e.g. HTTP response body or archive member). The file object
+        is read sequentially and left at the beginning of the payload.
+        """
+        intro_size = RpmHeader.INTRO.size
+        lead = cls._read(fileobj, cls.LEAD_SIZE + intro_size)
+        cls._check_lead(lead[:cls.LEAD_SIZE])
+
+        signature_size = RpmHeader.get_size(lead[cls.LEAD_SIZE:])
+        ### NOTE:
+        ##  Read the rest of the signature, its padding and the intro of the main header
+        buff = lead[cls.LEAD_SIZE:] + cls._read(fileobj, cls._align(signature_size))
+        signature = RpmHeader(buff)
+        header_size = RpmHeader.get_size(buff[-intro_size:])
+        header = RpmHeader(buff[-intro_size:] + cls._read(fileobj, header_size - intro_size))
+        return cls(signature=signature, header=header)
+
+    def get_digests(self) -> dict[str, str]:
+        """
+        Returns digests stored in the package as hexadecimal strings: digests of
+        the main header (header-sha1, header-sha256), of the header and payload
+        (header-payload-md5), and of the compressed payload (payload-<algorithm>)
+        """
+        digests = {}
+        if RPMSIGTAG_SHA1 in self.signature:
+            digests['header-sha1'] = self.signature[RPMSIGTAG_SHA1]
+        if RPMSIGTAG_SHA256 in self.signature:
+            digests['header-sha256'] = self.signature[RPMSIGTAG_SHA256]
+        if RPMSIGTAG_MD5 in self.signature:
+            digests['header-payload-md5'] = self.signature[RPMSIGTAG_MD5].hex()
+        if RPMTAG_PAYLOADDIGEST in self.header:
+            algorithm = PAYLOAD_DIGEST_ALGORITHMS.get(self.header[RPMTAG_PAYLOADDIGESTALGO], 'unknown')
+            digests[f'payload-{algorithm}'] = self.header[RPMTAG_PAYLOADDIGEST][0]
+        return digests
+
+    def verify_header_digest(self) -> None:
+        """Checks the main header against its SHA256 (or SHA1) digest from the signature header"""
+        digests = self.get_digests()
+        for name, algorithm in (('header-sha256', 'sha256'), ('header-sha1', 'sha1')):
+            if name in digests:
+                actual = hashlib.new(algorithm, self.header.blob).hexdigest()
+                if actual != digests[name]:
+                    raise ValueError(f'RPM header digest mismatch: {name} is {digests[name]}, got {actual}')
+                return
+        raise ValueError('RPM package has no header digest')
+
+    @classmethod
+    def _check_lead(cls, lead: Union[bytes, memoryview]) -> None:
+        if len(lead) < cls.LEAD_SIZE or bytes(lead[:4]) != cls.LEAD_MAGIC:
+            raise ValueError('Not an RPM package: bad magic of lead')
+
+    @classmethod
+    def _align(cls, size: int) -> int:
+        return (size + cls.SIGNATURE_ALIGNMENT - 1) // cls.SIGNATURE_ALIGNMENT * cls.SIGNATURE_ALIGNMENT
+
+    @staticmethod
+    def _read(fileobj: BinaryIO, size: int) -> bytes:
+        chunks = []
+        while size > 0:
+            chunk = fileobj.read(size)
+            if not chunk:
+                raise ValueError('RPM package is truncated')
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    @staticmethod
+    def _pread(fd: int, size: int, offset: int) -> bytes:
+        buff = os.pread(fd, size, offset)
+        if len(buff) < size:
+            raise ValueError('RPM package is truncated')
+        return buff
@@ -1,8 +1,9 @@
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, asdict
 from enum import Enum
 from logging import getLogger
 
-from alma_sbom.type import Hash, PackageNevra, Licenses
+from alma_sbom.type import Hash, PackageNevra, PackageFiles, Licenses, Algorithms
 from alma_sbom.data.attributes.property import (
     Property,
     PackageProperties,
@@ -25,6 +26,16 @@ class Package:
     licenses: Licenses = None
     summary: str = None
     description: str = None
+    ### NOTE:
+    ##  Only collected on request (see RpmCollector), None otherwise
+    files: PackageFiles = None
+    ### NOTE:
+    ##  Names of capabilities the package requires and provides (including
+    ##  provided file paths), and SHA256 checksums of the packages it depends on.
+    ##  Only collected on request and resolved by resolve_dependencies.
+    requires: list[str] = None
+    provides: list[str] = None
+    dependencies: list[str] = None
 
     ### properties (got from database?? (or include package info))
     package_properties: PackageProperties = None
@@ -58,14 +69,66 @@ class Package:
             package_nevra = self.package_nevra or pkg2.package_nevra,
             source_rpm = self.source_rpm or pkg2.source_rpm,
             package_timestamp = self.package_timestamp or pkg2.package_timestamp,
-            hashs = self.hashs or pkg2.hashs, ### need to rethink if there were multiple data in the future
+            hashs = _merge_hashs(self.hashs, pkg2.hashs),
             licenses = self.licenses or pkg2.licenses,
             summary = self.summary or pkg2.summary,
             description = self.description or pkg2.description,
+            files = self.files or pkg2.files,
+            requires = self.requires or pkg2.requires,
+            provides = self.provides or pkg2.provides,
+            dependencies = self.dependencies or pkg2.dependencies,
             package_properties = self.package_properties or pkg2.package_properties,
             build_properties = self.build_properties or pkg2.build_properties,
             sbom_properties = self.sbom_properties or pkg2.sbom_properties,
         )
 
+    def to_dict(self) -> dict:
+        """Returns JSON serializable representation of the package"""
+        return asdict(self, dict_factory=_dict_factory)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Package':
+        """Restores the package from the output of Package.to_dict"""
+        def _opt(factory, value):
+            return factory(value) if value is not None else None
+
+        return cls(
+            package_nevra = _opt(lambda d: PackageNevra(**d), data.get('package_nevra')),
+            source_rpm = data.get('source_rpm'),
+            package_timestamp = data.get('package_timestamp'),
+            hashs = _opt(lambda l: [
+                Hash(value=h['value'], algorithm=Algorithms.from_str(h['algorithm'])) for h in l
+            ], data.get('hashs')),
+            licenses = _opt(lambda d: Licenses(**d), data.get('licenses')),
+            summary = data.get('summary'),
+            description = data.get('description'),
+            files = _opt(PackageFiles.from_dict, data.get('files')),
+            requires = data.get('requires'),
+            provides = data.get('provides'),
+            dependencies = data.get('dependencies'),
+            package_properties = _opt(lambda d: PackageProperties(**d), data.get('package_properties')),
+            build_properties = _opt(BuildProperties.from_dict, data.get('build_properties')),
+            sbom_properties = _opt(lambda d: SBOMProperties(**d), data.get('sbom_properties')),
+        )
+
+def _merge_hashs(hashs1: list[Hash], hashs2: list[Hash]) -> list[Hash]:
+    ### NOTE:
+    ##  Checksums of both packages are kept, but only one per algorithm,
+    ##  the one of the first package wins.
+    if not hashs1 or not hashs2:
+        return hashs1 or hashs2
+    algorithms = {h.algorithm for h in hashs1}
+    return hashs1 + [h for h in hashs2 if h.algorithm not in algorithms]
+
+def _dict_factory(items: list[tuple]) -> dict:
+    return {k: _to_serializable(v) for k, v in items}
+
+def _to_serializable(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, array):
+        return value.tolist()
+    return value
+
 NullPackage = Package()
 
@@ -6,12 +6,14 @@ from cyclonedx.model.component import Component, ComponentType
 from packageurl import PackageURL
 
 from alma_sbom import constants
-from alma_sbom.type import Hash, Algorithms, Licenses
+from alma_sbom.type import Hash, Algorithms, Licenses, PackageFiles
 from alma_sbom.data import Package, Build, Iso, Property
 
 _logger = getLogger(__name__)
 lc_factory = LicenseFactory()
 
+FILE_SIZE_PROPERTY = 'almalinux:package:file:size'
+
 def component_from_package(package: Package) -> Component:
     return Component(
         type=ComponentType.LIBRARY,
@@ -28,6 +30,8 @@ def component_from_package(package: Package) -> Component:
             if package.licenses else None ,
         description=package.description
             if package.description else None ,
+        components=_make_file_components(package.files)
+            if package.files else None ,
     )
 
 def component_from_build(build: Build) -> Component:
@@ -52,6 +56,18 @@ def _make_hash(hash: Hash) -> HashType:
         content=hash.value,
     )
 
+def _make_file_components(files: PackageFiles) -> list[Component]:
+    return [
+        Component(
+            type=ComponentType.FILE,
+            name=f.path,
+            hashes=[_make_hash(Hash(value=f.digest, algorithm=files.algorithm))]
+                if files.algorithm else None ,
+            properties=[CDXProperty(name=FILE_SIZE_PROPERTY, value=f'{f.size}')],
+        )
+        for f in files
+    ]
+
 def _make_property(prop: Property) -> CDXProperty:
     # See Property spec:
     # https://cyclonedx.org/docs/1.4/json/#components_items_properties_items_value
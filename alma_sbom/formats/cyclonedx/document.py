@@ -1,22 +1,25 @@
+import json
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, ClassVar, Iterable
 from logging import getLogger
 from pathlib import Path
 
 from cyclonedx.builder.this import this_component as cdx_lib_component
 from cyclonedx.model.bom import Bom
 from cyclonedx.model.component import Component
-from cyclonedx.output import make_outputter
+from cyclonedx.output import BomRefDiscriminator, make_outputter
 from cyclonedx.schema import OutputFormat, SchemaVersion
+from cyclonedx.schema.schema import SCHEMA_VERSIONS
 
 if TYPE_CHECKING:
     from cyclonedx.output import BaseOutput
 
 from alma_sbom import constants
 from alma_sbom.data.models import Package, Build, Iso
-from alma_sbom.type import SbomFileFormatType
+from alma_sbom.type import SbomFileFormatType, get_hash_value
 from alma_sbom.formats.document import Document as AlmasbomDocument
+from alma_sbom.formats.stream import JsonStreamWriter
 
 from .component import component_from_package, component_from_build, component_from_iso
 
@@ -47,6 +50,13 @@ class CDXFormatter:
         output = outputter.output_as_string(indent=4)
         return output
 
+    def component_as_dict(self, component: Component) -> dict:
+        ### NOTE:
+        ##  Component gets a unique bom-ref only while it is serialized,
+        ##  so return the bom-ref as a part of the serialized component.
+        with BomRefDiscriminator([component.bom_ref]):
+            return json.loads(component.as_json(view_=SCHEMA_VERSIONS[self.SCHEMA_VERSION]))
+
 @dataclass
 class CDXDocument(AlmasbomDocument):
     bom: Bom
@@ -81,8 +91,7 @@ class CDXDocument(AlmasbomDocument):
     def from_build(cls, build: Build, file_format_type: SbomFileFormatType) -> 'CDXDocument':
         doc = cls._construct(file_format_type)
         doc.bom.metadata.component = component_from_build(build)
-        for pkg in build.packages:
-            doc.bom.components.add(component_from_package(pkg))
+        doc._add_package_components(build.packages)
 
         return doc
 
@@ -90,11 +99,51 @@ class CDXDocument(AlmasbomDocument):
     def from_iso(cls, iso: Iso, file_format_type: SbomFileFormatType) -> 'CDXDocument':
         doc = cls._construct(file_format_type)
         doc.bom.metadata.component = component_from_iso(iso)
-        for pkg in iso.packages:
-            doc.bom.components.add(component_from_package(pkg))
+        doc._add_package_components(iso.packages)
 
         return doc
 
+    @classmethod
+    def stream_iso(
+        cls,
+        iso: Iso,
+        packages: Iterable[Package],
+        file_format_type: SbomFileFormatType,
+        output_file: Path,
+    ) -> None:
+        if file_format_type != SbomFileFormatType.JSON:
+            raise ValueError(f'Streaming of CycloneDX documents is supported only in JSON, not in {file_format_type.value}')
+        doc = cls._construct(file_format_type)
+        doc.bom.metadata.component = component_from_iso(iso)
+        head = json.loads(doc.formatter.write(doc.bom))
+
+        with open(output_file, 'w') as fd, JsonStreamWriter(fd) as writer:
+            for key, value in head.items():
+                if key == 'dependencies':
+                    for dependency in value:
+                        writer.defer_item(key, dependency)
+                else:
+                    writer.write_member(key, value)
+            writer.begin_array('components')
+            for pkg in packages:
+                component = doc.formatter.component_as_dict(component_from_package(pkg))
+                writer.write_item(component)
+                writer.defer_item('dependencies', {'ref': component['bom-ref']})
+            writer.end_array()
+
+    def _add_package_components(self, packages: list[Package]) -> None:
+        components = {}
+        for pkg in packages:
+            component = component_from_package(pkg)
+            self.bom.components.add(component)
+            components.setdefault(get_hash_value(pkg.hashs), component)
+        for pkg in packages:
+            if pkg.dependencies:
+                self.bom.register_dependency(
+                    components[get_hash_value(pkg.hashs)],
+                    [components[dependency] for dependency in pkg.dependencies if dependency in components],
+                )
+
     def write(self, output_file: Path) -> None:
         pretty_output = self.formatter.write(self.bom)
         with open(output_file, 'w') as fd:
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Iterable
 
 from alma_sbom.data.models import Package, Build, Iso
 from alma_sbom.type import SbomFileFormatType
@@ -20,6 +21,21 @@ class Document(ABC):
     def from_iso(cls, iso: Iso, file_format_type: SbomFileFormatType) -> 'Document':
         pass
 
+    @classmethod
+    @abstractmethod
+    def stream_iso(
+        cls,
+        iso: Iso,
+        packages: Iterable[Package],
+        file_format_type: SbomFileFormatType,
+        output_file: Path,
+    ) -> None:
+        """
+        Writes SBOM of the ISO image to output_file, emitting each package
+        as soon as it is taken from packages instead of building the whole document
+        """
+        pass
+
     @abstractmethod
     def write(self, output_file: Path) -> None:
         pass
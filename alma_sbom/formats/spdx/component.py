@@ -25,7 +25,9 @@ _logger = getLogger(__name__)
 
 def _make_hash(hash: Hash) -> Checksum:
     ALGO_MAP = {
+        "SHA-1": ChecksumAlgorithm.SHA1,
         "SHA-256": ChecksumAlgorithm.SHA256,
+        "SHA-512": ChecksumAlgorithm.SHA512,
     }
     algo = hash.algorithm.value
 
@@ -81,6 +83,10 @@ def component_from_package(package: Package, pkgid: int) -> tuple[PackageCompone
         ),
     ]
     pkg.built_date = datetime.fromtimestamp(package.package_timestamp) if package.package_timestamp else None
+    ### NOTE:
+    ##  Files of the package (package.files) are not put into SPDX document,
+    ##  since SPDX 2.3 requires SHA1 checksum of every file and RPM headers
+    ##  hold SHA256 digests of files. See CommonConfig.rpm_files.
     pkg.files_analyzed = False
 
     if package.licenses:
@@ -1,23 +1,28 @@
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Callable, ClassVar
+from typing import Callable, ClassVar, Iterable
 from logging import getLogger
 from pathlib import Path
+from spdx_tools.spdx.jsonschema.document_converter import DocumentConverter
 from spdx_tools.spdx.model import (
     CreationInfo,
     Document,
+    Relationship,
+    RelationshipType,
 )
+from spdx_tools.spdx.validation.document_validator import validate_full_spdx_document
 from spdx_tools.spdx.writer.json import json_writer
 from spdx_tools.spdx.writer.tagvalue import tagvalue_writer
 from spdx_tools.spdx.writer.xml import xml_writer
 from spdx_tools.spdx.writer.yaml import yaml_writer
 from spdx_tools.spdx.writer.rdf import rdf_writer
 
-from alma_sbom.type import SbomFileFormatType
+from alma_sbom.type import SbomFileFormatType, get_hash_value
 from alma_sbom.data.models import Package, Build, Iso
 from alma_sbom.formats.document import Document as AlmasbomDocument
+from alma_sbom.formats.stream import JsonStreamWriter
 
 from . import constants as spdx_consts
 from .component import set_package_component, set_build_component, set_iso_component
@@ -47,6 +52,9 @@ class SPDXDocument(AlmasbomDocument):
     doc_name: str
     doc_uuid: str
     _next_id: int = 0
+    ### NOTE:
+    ##  SPDX ids of packages by their SHA256 checksums, to refer to dependencies
+    _package_ids: dict[str, str] = field(default_factory=dict)
 
     @classmethod
     def _construct(cls, file_format_type: SbomFileFormatType, doc_name: str) -> 'CDXDocument':
@@ -86,6 +94,7 @@ class SPDXDocument(AlmasbomDocument):
 
         for pkg in build.packages:
             doc._add_each_package_component(pkg)
+        doc._add_dependencies(build.packages)
 
         return doc
 
@@ -98,9 +107,44 @@ class SPDXDocument(AlmasbomDocument):
 
         for pkg in iso.packages:
             doc._add_each_package_component(pkg)
+        doc._add_dependencies(iso.packages)
 
         return doc
 
+    @classmethod
+    def stream_iso(
+        cls,
+        iso: Iso,
+        packages: Iterable[Package],
+        file_format_type: SbomFileFormatType,
+        output_file: Path,
+    ) -> None:
+        if file_format_type != SbomFileFormatType.JSON:
+            raise ValueError(f'Streaming of SPDX documents is supported only in JSON, not in {file_format_type.value}')
+        doc_name = iso.get_doc_name()
+        doc = cls._construct(file_format_type, doc_name)
+        set_iso_component(doc.document, iso, doc.document.creation_info.spdx_id)
+
+        converter = DocumentConverter()
+        with open(output_file, 'w') as fd, JsonStreamWriter(fd) as writer:
+            for key, value in converter.convert(doc.document).items():
+                writer.write_member(key, value)
+            writer.begin_array('packages')
+            for pkg in packages:
+                ### NOTE:
+                ##  Each package is validated and converted in a document of its own,
+                ##  which shares creation info with the streamed one. Relationships
+                ##  are written after all packages.
+                package_doc = Document(doc.document.creation_info)
+                set_package_component(package_doc, pkg, doc._get_next_package_id())
+                doc._validate(package_doc)
+                package_dict = converter.convert(package_doc)
+                for package in package_dict['packages']:
+                    writer.write_item(package)
+                for relationship in package_dict.get('relationships', []):
+                    writer.defer_item('relationships', relationship)
+            writer.end_array()
+
     def write(self, output_file: Path) -> None:
         self.formatter.formatter.write_document_to_file(
             self.document,
@@ -108,6 +152,12 @@ class SPDXDocument(AlmasbomDocument):
             validate=True,
         )
 
+    @staticmethod
+    def _validate(document: Document) -> None:
+        validation_messages = validate_full_spdx_document(document)
+        if validation_messages:
+            raise ValueError(f'Document is not valid. The following errors were detected: {validation_messages}')
+
     @staticmethod
     def _make_document_namespace(doc_name, doc_uuid) -> str:
         return f"{spdx_consts.SPDX_ALMAOS_NAMESPACE}-{doc_name}-{doc_uuid}"
@@ -126,5 +176,20 @@ class SPDXDocument(AlmasbomDocument):
         return f"SPDXRef-{cur_id}"
 
     def _add_each_package_component(self, package: Package) -> None:
-        set_package_component(self.document, package, self._get_next_package_id())
+        pkgid = self._get_next_package_id()
+        self._package_ids.setdefault(get_hash_value(package.hashs), pkgid)
+        set_package_component(self.document, package, pkgid)
+
+    def _add_dependencies(self, packages: Iterable[Package]) -> None:
+        for pkg in packages:
+            pkgid = self._package_ids[get_hash_value(pkg.hashs)]
+            self.document.relationships += [
+                Relationship(
+                    spdx_element_id=pkgid,
+                    relationship_type=RelationshipType.DEPENDS_ON,
+                    related_spdx_element_id=self._package_ids[dependency],
+                )
+                for dependency in pkg.dependencies or []
+                if dependency in self._package_ids
+            ]
 
@@ -0,0 +1,84 @@
+import json
+import shutil
+import tempfile
+from typing import Any, ClassVar, TextIO
+
+class JsonStreamWriter:
+    """
+    Writes a JSON object to a file member by member, so the whole object
+    never has to be kept in memory. Items of an array member are written
+    one by one as they are produced. Items of the members which are only
+    complete after everything else (e.g. relationships between packages)
+    are deferred into temporary files and written when the object is closed.
+    """
+    INDENT: ClassVar[int] = 4
+
+    fd: TextIO
+    _first_member: bool
+    _first_item: bool
+    _deferred: dict[str, TextIO]
+
+    def __init__(self, fd: TextIO) -> None:
+        self.fd = fd
+        self._first_member = True
+        self._first_item = True
+        self._deferred = {}
+
+    def __enter__(self) -> 'JsonStreamWriter':
+        self.fd.write('{')
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if exc_type is None:
+                self._write_deferred()
+                self.fd.write('\n}\n')
+        finally:
+            for spool in self._deferred.values():
+                spool.close()
+
+    def write_member(self, key: str, value: Any) -> None:
+        self._begin_member(key)
+        self.fd.write(self._dumps(value, 1))
+
+    def begin_array(self, key: str) -> None:
+        self._begin_member(key)
+        self.fd.write('[')
+        self._first_item = True
+
+    def write_item(self, value: Any) -> None:
+        self.fd.write(self._item_separator(self._first_item) + self._dumps(value, 2))
+        self._first_item = False
+
+    def end_array(self) -> None:
+        self.fd.write(']' if self._first_item else f"\n{' ' * self.INDENT}]")
+
+    def defer_item(self, key: str, value: Any) -> None:
+        spool = self._deferred.get(key)
+        first = spool is None
+        if first:
+            spool = tempfile.TemporaryFile('w+', encoding='utf8')
+            self._deferred[key] = spool
+        spool.write(self._item_separator(first) + self._dumps(value, 2))
+
+    def _write_deferred(self) -> None:
+        for key, spool in self._deferred.items():
+            self.begin_array(key)
+            spool.seek(0)
+            shutil.copyfileobj(spool, self.fd)
+            self._first_item = False
+            self.end_array()
+
+    def _begin_member(self, key: str) -> None:
+        separator = '\n' if self._first_member else ',\n'
+        self.fd.write(f"{separator}{' ' * self.INDENT}{json.dumps(key)}: ")
+        self._first_member = False
+
+    def _item_separator(self, first: bool) -> str:
+        return f"{'' if first else ','}\n{' ' * self.INDENT * 2}"
+
+    def _dumps(self, value: Any, level: int) -> str:
+        ### NOTE:
+        ##  json.dumps escapes line breaks in strings,
+        ##  so every line break in its output is an indentation point.
+        return json.dumps(value, indent=self.INDENT).replace('\n', '\n' + ' ' * self.INDENT * level)
@@ -1,8 +1,9 @@
 import argparse
 import re
+from array import array
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Iterator, NamedTuple, Optional
 
 class SbomRecordType(Enum):
     SPDX = 'spdx'
@@ -108,7 +109,9 @@ class SbomType:
 
 ### See the pythondx-python-libs Document: https://cyclonedx-python-library.readthedocs.io/en/latest/autoapi/cyclonedx/model/index.html#cyclonedx.model.HashAlgorithm
 class Algorithms(Enum):
+    SHA_1 = 'SHA-1'
     SHA_256 = 'SHA-256'
+    SHA_512 = 'SHA-512'
 
     @classmethod
     def from_str(cls, string: str) -> 'Algorithms':
@@ -117,11 +120,25 @@ class Algorithms(Enum):
                 return alg
         raise ValueError(f'Invalid Algorithms string: {string}')
 
+    @classmethod
+    def choices(cls) -> list[str]:
+        return [alg.value for alg in cls]
+
+    def get_hashlib_name(self) -> str:
+        return self.value.replace('-', '').lower()
+
 @dataclass
 class Hash:
     value: str
     algorithm: Algorithms = Algorithms.SHA_256
 
+def get_hash_value(hashes: Optional[list[Hash]], algorithm: Algorithms = Algorithms.SHA_256) -> Optional[str]:
+    """Returns the checksum of the given algorithm from hashes, or None if there is no such checksum"""
+    for h in hashes or []:
+        if h.algorithm == algorithm:
+            return h.value
+    return None
+
 @dataclass
 class PackageNevra:
     name: str
@@ -229,3 +246,41 @@ class Licenses:
     ids: list[str]
     expression: str
 
+class PackageFile(NamedTuple):
+    path: str
+    size: int
+    digest: str
+
+@dataclass
+class PackageFiles:
+    """
+    Regular files of a package, stored the way RPM header stores them:
+    every directory name is kept once and shared by the files in it,
+    sizes and directory indexes are packed into arrays.
+    """
+    dirnames: list[str]
+    dirindexes: array
+    basenames: list[str]
+    sizes: array
+    digests: list[str]
+    ### NOTE:
+    ##  None if the digests are made by an algorithm we don't support
+    algorithm: Optional[Algorithms] = None
+
+    def __len__(self) -> int:
+        return len(self.basenames)
+
+    def __iter__(self) -> Iterator[PackageFile]:
+        for dirindex, basename, size, digest in zip(self.dirindexes, self.basenames, self.sizes, self.digests):
+            yield PackageFile(self.dirnames[dirindex] + basename, size, digest)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PackageFiles':
+        return cls(
+            dirnames=data['dirnames'],
+            dirindexes=array('I', data['dirindexes']),
+            basenames=data['basenames'],
+            sizes=array('Q', data['sizes']),
+            digests=data['digests'],
+            algorithm=Algorithms.from_str(data['algorithm']) if data['algorithm'] else None,
+        )
@@ -0,0 +1,92 @@
+"""
+Benchmarks lookups of packages in immudb by ImmudbCollector against
+the local stand-in of immudb (see fake_immudb.py), without any network:
+one by one, concurrently, through the record cache and with deferred verification.
+
+Usage:
+    $ python tests/benchmarks/bench_immudb.py --records 2000 --latency 0.02 --jitter 0.01
+    $ python tests/benchmarks/bench_immudb.py --fixture records.ndjson --error-rate 0.01
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fake_immudb import FakeImmudbServicer, generate_records, read_fixture, serve
+
+from alma_sbom.data.collectors import ImmudbCollector
+from alma_sbom.data.collectors.immudb.cache import ImmudbRecordCache
+
+def make_collector(port: int, **kwargs) -> ImmudbCollector:
+    return ImmudbCollector(
+        username='immudb',
+        password='immudb',
+        database='almalinux',
+        immudb_address=f'localhost:{port}',
+        public_key_file=None,
+        **kwargs,
+    )
+
+def collect_one_by_one(collector: ImmudbCollector, hashes: list[str]) -> int:
+    failed = 0
+    for hash in hashes:
+        try:
+            collector.collect_package_by_hash(hash)
+        except Exception:
+            failed += 1
+    return failed
+
+def collect_batch(collector: ImmudbCollector, hashes: list[str]) -> int:
+    return sum(1 for _, _, error in collector.collect_packages_by_hashes(hashes) if error is not None)
+
+def bench(name: str, func, servicer: FakeImmudbServicer, collector: ImmudbCollector, hashes: list[str]) -> None:
+    requests = servicer.requests
+    start = time.perf_counter()
+    failed = func(collector, hashes)
+    elapsed = time.perf_counter() - start
+    print(
+        f'{name:>28}: {elapsed:8.3f}s total, {elapsed / len(hashes) * 1e3:8.2f}ms per package, '
+        f'{servicer.requests - requests:6d} lookups, {failed} failed'
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    records_group = parser.add_mutually_exclusive_group()
+    records_group.add_argument('--fixture', type=Path, help='JSON list or NDJSON of immudb records')
+    records_group.add_argument('--records', type=int, default=1000, help='Number of records to make up (default: %(default)s)')
+    parser.add_argument('--latency', type=float, default=0.01, help='Seconds added to every lookup (default: %(default)s)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many seconds added at random')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of lookups failing with UNAVAILABLE')
+    parser.add_argument(
+        '--max-in-flight', type=int, action='append',
+        help='Concurrency of batched lookups, can be specified several times (default: 8 and 32)',
+    )
+    args = parser.parse_args()
+
+    records = read_fixture(args.fixture) if args.fixture else generate_records(args.records)
+    hashes = [record['Hash'] for record in records]
+    servicer = FakeImmudbServicer(records, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    server, port = serve(servicer, max_workers=max(args.max_in_flight or [32]) * 2)
+    print(f'{len(hashes)} records, {args.latency * 1e3:.1f}ms latency, {args.error_rate:.1%} errors')
+    try:
+        bench('one by one', collect_one_by_one, servicer, make_collector(port), hashes)
+        for max_in_flight in args.max_in_flight or [8, 32]:
+            bench(
+                f'{max_in_flight} in flight', collect_batch, servicer,
+                make_collector(port, max_in_flight=max_in_flight), hashes,
+            )
+            bench(
+                f'{max_in_flight} in flight, deferred', collect_batch, servicer,
+                make_collector(port, max_in_flight=max_in_flight, deferred_verification=True), hashes,
+            )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            collector = make_collector(port, record_cache=ImmudbRecordCache(Path(tmp_dir) / 'immudb.sqlite'))
+            bench('cold record cache', collect_batch, servicer, collector, hashes)
+            bench('warm record cache', collect_batch, servicer, collector, hashes)
+    finally:
+        server.stop(0)
+
+if __name__ == '__main__':
+    main()
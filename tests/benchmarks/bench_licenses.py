@@ -0,0 +1,78 @@
+"""
+Compares translation of RPM license strings by the legacy license table
+with parsing them by the SPDX parser only.
+
+The corpus is either a text file with one license string per line, e.g.
+    $ dnf repoquery --repo appstream --qf '%{license}' > appstream-licenses.txt
+or primary metadata of a repository, e.g. repodata/<checksum>-primary.xml.gz
+
+Usage:
+    $ python tests/benchmarks/bench_licenses.py appstream-licenses.txt
+"""
+import argparse
+import bz2
+import gzip
+import lzma
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from license_expression import get_spdx_licensing, ExpressionError
+
+from alma_sbom.data.collectors.licenses import LEGACY_LICENSES_VERSION, translate_license_ids
+
+RPM_LICENSE_TAG = '{http://linux.duke.edu/metadata/rpm}license'
+OPENERS = {
+    '.gz': gzip.open,
+    '.xz': lzma.open,
+    '.bz2': bz2.open,
+}
+
+def read_corpus(corpus: Path) -> list[str]:
+    if 'primary.xml' not in corpus.name:
+        return [line.strip() for line in corpus.read_text().splitlines() if line.strip()]
+    with OPENERS.get(corpus.suffix, open)(corpus, 'rb') as fp:
+        return [
+            elem.text for event, elem in ET.iterparse(fp, events=('end',))
+            if elem.tag == RPM_LICENSE_TAG and elem.text
+        ]
+
+def parse_ids(licensing, licenses_str: str) -> list[str]:
+    try:
+        parsed = licensing.parse(licenses_str, validate=True)
+    except ExpressionError:
+        return []
+    return [str(sym) for sym in licensing.license_symbols(parsed)]
+
+def translate_ids(licensing, licenses_str: str) -> list[str]:
+    ids = translate_license_ids(licenses_str, licensing)
+    if ids is None:
+        return parse_ids(licensing, licenses_str)
+    return ids
+
+def bench(name: str, func, licensing, corpus: list[str]) -> None:
+    start = time.perf_counter()
+    with_ids = sum(1 for licenses_str in corpus if func(licensing, licenses_str))
+    elapsed = time.perf_counter() - start
+    print(
+        f'{name:>10}: {elapsed:8.3f}s total, {elapsed / len(corpus) * 1e6:10.1f}us per string, '
+        f'{with_ids / len(corpus):6.1%} strings with SPDX ids'
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', type=Path, help='License strings, one per line, or primary.xml of a repository')
+    args = parser.parse_args()
+
+    corpus = read_corpus(args.corpus)
+    licensing = get_spdx_licensing()
+    translated = sum(1 for licenses_str in corpus if translate_license_ids(licenses_str, licensing) is not None)
+    print(
+        f'{len(corpus)} license strings ({len(set(corpus))} distinct), legacy table v{LEGACY_LICENSES_VERSION} '
+        f'translates {translated / len(corpus):.1%} of them without the SPDX parser'
+    )
+    bench('parser', parse_ids, licensing, corpus)
+    bench('table', translate_ids, licensing, corpus)
+
+if __name__ == '__main__':
+    main()
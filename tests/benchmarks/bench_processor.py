@@ -0,0 +1,69 @@
+"""
+Benchmarks the conversion of immudb records into packages: one processor
+per record (processor_factory) against the batch processor (process_immudb_infos),
+on synthetic records of sbom_api_ver 0.2 mixed with ones of 0.1.
+
+Usage:
+    $ python tests/benchmarks/bench_processor.py --records 10000 --v01-share 0.1
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fake_immudb import generate_records
+
+from alma_sbom.data.collectors.immudb.processor import process_immudb_infos, processor_factory
+
+def make_immudb_infos(count: int, v01_share: float, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    immudb_infos = []
+    for record in generate_records(count, seed):
+        if rng.random() < v01_share:
+            record['Metadata'] = {
+                key: value for key, value in record['Metadata'].items()
+                if key not in ('sbom_api_ver', 'epoch', 'name', 'version', 'release', 'arch', 'sourcerpm')
+            }
+            record['Metadata']['sbom_api'] = '0.1'
+        record['timestamp'] = 1714500330
+        immudb_infos.append(record)
+    return immudb_infos
+
+def convert_one_by_one(immudb_infos: list[dict]) -> list:
+    return [processor_factory(immudb_info, immudb_info['Hash']).get_package() for immudb_info in immudb_infos]
+
+def convert_batch(immudb_infos: list[dict]) -> list:
+    return process_immudb_infos(immudb_infos, [immudb_info['Hash'] for immudb_info in immudb_infos])
+
+def bench(name: str, func, immudb_infos: list[dict], repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        ### NOTE:
+        ##  Packages of previous runs are dropped first, so that
+        ##  the garbage collector has the same work to do in every run
+        gc.collect()
+        start = time.perf_counter()
+        func(immudb_infos)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f'{name:>12}: {best:8.3f}s best of {repeat}, {best / len(immudb_infos) * 1e6:8.2f}us per record')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=10000, help='Number of records to make up (default: %(default)s)')
+    parser.add_argument('--v01-share', type=float, default=0.1, help='Share of records of sbom_api 0.1 (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs of every conversion (default: %(default)s)')
+    args = parser.parse_args()
+
+    immudb_infos = make_immudb_infos(args.records, args.v01_share)
+    print(f'{len(immudb_infos)} records, {args.v01_share:.0%} of sbom_api 0.1')
+    bench('one by one', convert_one_by_one, immudb_infos, args.repeat)
+    bench('batch', convert_batch, immudb_infos, args.repeat)
+    if convert_batch(immudb_infos) != convert_one_by_one(immudb_infos):
+        sys.exit('Packages of the batch processor differ from the ones of processor_factory')
+
+if __name__ == '__main__':
+    main()
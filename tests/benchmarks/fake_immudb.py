@@ -0,0 +1,56 @@
+"""
+Runs the stand-in for the AlmaLinux immudb of tests/pytest/conftest.py,
+serving package records from a fixture. Latency and errors can be
+injected into every lookup.
+
+The fixture is a JSON list or NDJSON of immudb records, each one keyed by its
+"Hash" field, e.g. {"Hash": "05dc1b...", "Name": "bash-...", "Metadata": {...}}.
+Records can also be generated with --generate.
+
+Usage:
+    $ python tests/benchmarks/fake_immudb.py --fixture records.ndjson --port 3322 --latency 0.05
+    $ alma-sbom --immudb-address localhost:3322 --no-immudb-cache package --rpm-package-hash 05dc1b...
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / 'pytest'))
+from conftest import FakeImmudbServicer, generate_records, serve
+
+def read_fixture(fixture: Path) -> list[dict]:
+    text = fixture.read_text()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    records_group = parser.add_mutually_exclusive_group(required=True)
+    records_group.add_argument('--fixture', type=Path, help='JSON list or NDJSON of immudb records')
+    records_group.add_argument('--generate', type=int, help='Number of records to make up')
+    parser.add_argument('--port', type=int, default=3322, help='Port to listen on (default: %(default)s)')
+    parser.add_argument('--database', default='almalinux', help='Database name (default: %(default)s)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every lookup')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many seconds added at random')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of lookups failing with UNAVAILABLE')
+    parser.add_argument('--dump', type=Path, help='Write the records as NDJSON, e.g. to keep generated ones')
+    args = parser.parse_args()
+
+    records = read_fixture(args.fixture) if args.fixture else generate_records(args.generate)
+    if args.dump:
+        args.dump.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    servicer = FakeImmudbServicer(
+        records,
+        database=args.database,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+    server, port = serve(servicer, f'[::]:{args.port}')
+    print(f'Serving {len(servicer.records)} records on port {port}')
+    server.wait_for_termination()
+
+if __name__ == '__main__':
+    main()
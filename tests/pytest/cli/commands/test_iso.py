@@ -0,0 +1,221 @@
+import pytest
+from pathlib import Path
+
+from alma_sbom.cli.commands.iso import IsoCommand, IsoPackageProcessor
+from alma_sbom.cli.config import CommonConfig, IsoConfig
+from alma_sbom.cli.main import Main
+from alma_sbom.data.collectors import ImmudbCollector
+from alma_sbom.data.collectors.iso import IsoPackageEntry
+from alma_sbom.data.collectors.recording import ResponseBundle
+from alma_sbom.data.models import Iso, NullPackage, Package
+from alma_sbom.data.attributes.property import SBOMProperties
+from alma_sbom.type import Hash, PackageNevra
+
+TESTED_HASH_VALUE = '05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1'
+
+
+def make_package(name: str, hash_value: str, immudb_hash: str = None) -> Package:
+    return Package(
+        package_nevra=PackageNevra(epoch=None, name=name, version='1.0', release='1.el9', arch='x86_64'),
+        hashs=[Hash(value=hash_value)],
+        sbom_properties=SBOMProperties(immudb_hash=immudb_hash) if immudb_hash else None,
+    )
+
+
+def make_iso_config(*args: str) -> IsoConfig:
+    parsed_args = Main.create_parser().parse_args(['iso', *args])
+    return IsoConfig.from_base_args(CommonConfig.from_args(parsed_args), parsed_args)
+
+
+class FakeImmudbCollector:
+    """Knows the packages by their SHA256 checksum"""
+    def __init__(self, packages: dict[str, Package]):
+        self.packages = packages
+        self.lookups = []
+
+    def collect_package_by_hash(self, hash_value: str) -> Package:
+        self.lookups.append(hash_value)
+        return self.packages[hash_value]
+
+
+class FakeIsoCollector:
+    def __init__(self, packages: list[Package]):
+        self.packages = packages
+        self.saved = None
+
+    def get_cached_packages(self) -> list[Package]:
+        return self.packages
+
+    def iter_package_entries(self):
+        return iter(range(len(self.packages)))
+
+    def save_manifest(self, entries: list, packages: list[Package]) -> None:
+        self.saved = (entries, list(packages))
+
+
+def make_iso_command(processor: IsoPackageProcessor) -> IsoCommand:
+    ### NOTE:
+    ##  Only the processor of the command is used by the tested methods
+    command = IsoCommand.__new__(IsoCommand)
+    command.processor = processor
+    return command
+
+
+def test_cached_packages_missed_by_immudb_are_looked_up_again() -> None:
+    found = make_package('bash', 'a' * 64, immudb_hash='immudb-hash-of-bash')
+    missed = make_package('zsh', TESTED_HASH_VALUE)
+    immudb_collector = FakeImmudbCollector({
+        TESTED_HASH_VALUE: make_package('zsh', TESTED_HASH_VALUE, immudb_hash='immudb-hash-of-zsh'),
+    })
+    iso_collector = FakeIsoCollector([found, missed])
+    command = make_iso_command(IsoPackageProcessor(immudb_collector, rpm_collector=None))
+
+    packages = list(command._iter_iso_packages(None, iso_collector))
+    assert packages[0] is found
+    assert packages[1].sbom_properties.immudb_hash == 'immudb-hash-of-zsh'
+    assert immudb_collector.lookups == [TESTED_HASH_VALUE]
+    assert iso_collector.saved == ([0, 1], packages)
+
+
+def test_cached_packages_still_missed_by_immudb() -> None:
+    missed = make_package('zsh', TESTED_HASH_VALUE)
+    immudb_collector = FakeImmudbCollector({})
+    iso_collector = FakeIsoCollector([missed])
+    command = make_iso_command(IsoPackageProcessor(immudb_collector, rpm_collector=None))
+
+    assert list(command._iter_iso_packages(None, iso_collector)) == [missed]
+    assert immudb_collector.lookups == [TESTED_HASH_VALUE]
+    assert iso_collector.saved is None
+
+
+class FakeRpmCollector:
+    def __init__(self):
+        self.collected = []
+
+    def collect_package_from_file(self, rpm_package: Path, hashes: list[Hash]) -> Package:
+        self.collected.append(rpm_package)
+        return Package(summary=str(rpm_package), hashs=hashes)
+
+
+class FakeImageCollector:
+    """Serves the packages of an image, each of them identified by its SHA256 checksum"""
+    def __init__(self, images: dict[Path, dict[str, str]]):
+        self.images = images
+        self.packages = None
+        self.closed = False
+
+    def __enter__(self) -> 'FakeImageCollector':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.closed = True
+
+    def collect_iso_by_file(self, iso_image: Path) -> Iso:
+        self.packages = self.images[iso_image]
+        return Iso(releasever='9', image_type='DVD', packages=[])
+
+    def get_cached_packages(self) -> None:
+        return None
+
+    def iter_package_entries(self):
+        for i, rr_path in enumerate(self.packages):
+            yield IsoPackageEntry(rr_path=rr_path, offset=i * 2048, size=2048)
+
+    def iter_with_readahead(self, entries: list[IsoPackageEntry]):
+        return iter(entries)
+
+    def extract_package(self, entry: IsoPackageEntry) -> list[Hash]:
+        self.extracted = entry
+        return [Hash(value=self.packages[entry.rr_path])]
+
+    def get_fd_path(self) -> Path:
+        return Path(self.extracted.rr_path)
+
+    def save_manifest(self, entries: list, packages: list[Package]) -> None:
+        pass
+
+
+class FakeCollectorFactory:
+    def __init__(self, images: dict[Path, dict[str, str]]):
+        self.images = images
+        self.iso_collectors = []
+        self.closed = False
+
+    def __enter__(self) -> 'FakeCollectorFactory':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.closed = True
+
+    def gen_iso_collector(self, manifest_cache_dir: Path = None, metadata_source: str = 'rpm') -> FakeImageCollector:
+        iso_collector = FakeImageCollector(self.images)
+        self.iso_collectors.append(iso_collector)
+        return iso_collector
+
+
+class FakeDocumentFactory:
+    def __init__(self):
+        self.written = {}
+
+    def gen_from_iso(self, iso: Iso) -> 'FakeDocumentFactory':
+        self.iso = iso
+        return self
+
+    def write(self, output_file: Path) -> None:
+        self.written[output_file] = [pkg.summary for pkg in self.iso.packages]
+
+
+def test_package_not_recorded_in_replayed_bundle(tmp_path: Path) -> None:
+    with ResponseBundle(tmp_path) as bundle:
+        bundle.save(ResponseBundle.KIND_ALBS, '11363', {})
+    immudb_collector = ImmudbCollector(
+        username=None,
+        password=None,
+        database=None,
+        immudb_address=None,
+        public_key_file=None,
+        response_bundle=ResponseBundle(tmp_path, replay=True),
+    )
+    processor = IsoPackageProcessor(immudb_collector, rpm_collector=None)
+    assert processor._collect_from_immudb(TESTED_HASH_VALUE) is NullPackage
+
+
+def test_run_with_several_iso_images(tmp_path: Path) -> None:
+    images = {
+        Path('images/dvd.iso'): {'/BaseOS/Packages/bash.rpm': 'a' * 64, '/AppStream/Packages/vim.rpm': 'b' * 64},
+        Path('images/minimal.iso'): {'/Minimal/Packages/bash.rpm': 'a' * 64},
+    }
+    rpm_collector = FakeRpmCollector()
+    immudb_collector = FakeImmudbCollector({})
+    command = make_iso_command(IsoPackageProcessor(immudb_collector, rpm_collector))
+    command.executor = None
+    command.config = make_iso_config(*(f'--iso-image={image}' for image in images), f'--output-dir={tmp_path}')
+    command.collector_factory = FakeCollectorFactory(images)
+    command.document_factory = FakeDocumentFactory()
+    command.runner = command._runner_with_iso_images
+
+    assert command.run() == 0
+    assert command.document_factory.written == {
+        tmp_path / 'dvd.spdx.json': ['/BaseOS/Packages/bash.rpm', '/AppStream/Packages/vim.rpm'],
+        ### NOTE:
+        ##  bash is byte-identical to the one of the DVD image, so its package is reused
+        tmp_path / 'minimal.spdx.json': ['/BaseOS/Packages/bash.rpm'],
+    }
+    assert rpm_collector.collected == [Path('/BaseOS/Packages/bash.rpm'), Path('/AppStream/Packages/vim.rpm')]
+    assert immudb_collector.lookups == ['a' * 64, 'b' * 64]
+    assert [iso_collector.closed for iso_collector in command.collector_factory.iso_collectors] == [True, True]
+    assert command.collector_factory.closed
+
+
+def test_iso_images_with_same_name(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match='dvd'):
+        make_iso_config('--iso-image=a/dvd.iso', '--iso-image=b/dvd.iso', f'--output-dir={tmp_path}')
+
+
+def test_repodata_with_other_hash_algorithms() -> None:
+    parsed_args = Main.create_parser().parse_args(
+        ['--hash-algorithm=SHA-512', 'iso', '--iso-image=dvd.iso', '--metadata-source=repodata'],
+    )
+    with pytest.raises(ValueError, match='SHA-256'):
+        IsoConfig.from_base_args(CommonConfig.from_args(parsed_args), parsed_args)
+    assert make_iso_config('--iso-image=dvd.iso', '--metadata-source=repodata').metadata_source == 'repodata'
@@ -0,0 +1,45 @@
+import os
+import shutil
+import pytest
+from pathlib import Path
+
+from alma_sbom.cli.main import Main
+from alma_sbom.data.collectors.recording import ResponseBundle
+
+TESTED_PACKAGE_NAME = 'bash-5.1.8-9.el9.x86_64'
+TESTED_PACKAGE_PATH = Path(__file__).parents[2] / 'data' / 'collectors' / f'{TESTED_PACKAGE_NAME}.rpm'
+
+
+@pytest.fixture
+def replay_dir(tmp_path: Path) -> Path:
+    ### NOTE:
+    ##  No immudb response is recorded, so packages are made from their headers alone
+    ##  and the run doesn't touch the network
+    replay_dir = tmp_path / 'bundle'
+    with ResponseBundle(replay_dir) as bundle:
+        bundle.save(ResponseBundle.KIND_ALBS, '0', {})
+    return replay_dir
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_run_with_failed_package(tmp_path: Path, replay_dir: Path, jobs: int) -> None:
+    packages_dir = tmp_path / 'packages'
+    (packages_dir / 'BaseOS').mkdir(parents=True)
+    shutil.copy(TESTED_PACKAGE_PATH, packages_dir / 'BaseOS')
+    (packages_dir / 'broken-1.0-1.el9.x86_64.rpm').write_bytes(b'not an RPM package')
+    output_dir = tmp_path / 'sboms'
+
+    exit_code = Main([
+        f'--replay={replay_dir}',
+        '--no-immudb-cache',
+        '--rpm-header-parser=python',
+        'package',
+        f'--rpm-package={packages_dir}',
+        f'--output-dir={output_dir}',
+        f'--jobs={jobs}',
+    ]).run()
+
+    ### NOTE:
+    ##  The broken package doesn't stop the other one, but fails the run
+    assert exit_code == 1
+    assert os.listdir(output_dir) == [f'{TESTED_PACKAGE_NAME}.spdx.json']
@@ -0,0 +1,98 @@
+import pytest
+from pathlib import Path
+
+from alma_sbom.cli.config import CommonConfig, PackageConfig
+from alma_sbom.cli.main import Main
+
+TESTED_HASH_VALUE = '05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1'
+
+
+def make_package_config(*args: str) -> PackageConfig:
+    parsed_args = Main.create_parser().parse_args(['package', *args])
+    return PackageConfig.from_base_args(CommonConfig.from_args(parsed_args), parsed_args)
+
+
+@pytest.fixture
+def rpm_tree(tmp_path: Path) -> Path:
+    for path in (
+        'BaseOS/Packages/bash-5.1.8-9.el9.x86_64.rpm',
+        'BaseOS/Packages/vim-8.2.2637-20.el9.x86_64.rpm',
+        'BaseOS/Packages/README',
+        'BaseOS/repodata/repomd.xml',
+        'AppStream/Packages/nano-5.6.1-5.el9.x86_64.rpm',
+    ):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_bytes(b'')
+    ### NOTE:
+    ##  Directories are never taken as packages, whatever their names
+    (tmp_path / 'AppStream' / 'Packages' / 'directory.rpm').mkdir()
+    return tmp_path
+
+
+def test_expand_directory(rpm_tree: Path) -> None:
+    config = make_package_config(f'--rpm-package={rpm_tree}', f'--output-dir={rpm_tree / "sboms"}')
+    assert config.rpm_packages == [
+        rpm_tree / 'AppStream/Packages/nano-5.6.1-5.el9.x86_64.rpm',
+        rpm_tree / 'BaseOS/Packages/bash-5.1.8-9.el9.x86_64.rpm',
+        rpm_tree / 'BaseOS/Packages/vim-8.2.2637-20.el9.x86_64.rpm',
+    ]
+
+
+def test_expand_glob(rpm_tree: Path) -> None:
+    config = make_package_config(f'--rpm-package={rpm_tree}/BaseOS/**/*', f'--output-dir={rpm_tree / "sboms"}')
+    assert config.rpm_packages == [
+        rpm_tree / 'BaseOS/Packages/bash-5.1.8-9.el9.x86_64.rpm',
+        rpm_tree / 'BaseOS/Packages/vim-8.2.2637-20.el9.x86_64.rpm',
+    ]
+    with pytest.raises(FileNotFoundError):
+        make_package_config(f'--rpm-package={rpm_tree}/BaseOS/repodata/*')
+
+
+def test_expand_package_found_several_times(rpm_tree: Path) -> None:
+    config = make_package_config(
+        f'--rpm-package={rpm_tree}/BaseOS/Packages/bash-5.1.8-9.el9.x86_64.rpm',
+        f'--rpm-package={rpm_tree}/BaseOS',
+        f'--output-dir={rpm_tree / "sboms"}',
+    )
+    assert config.rpm_packages == [
+        rpm_tree / 'BaseOS/Packages/bash-5.1.8-9.el9.x86_64.rpm',
+        rpm_tree / 'BaseOS/Packages/vim-8.2.2637-20.el9.x86_64.rpm',
+    ]
+
+
+def test_packages_with_same_name(rpm_tree: Path) -> None:
+    copy = rpm_tree / 'AppStream/Packages/bash-5.1.8-9.el9.x86_64.rpm'
+    copy.write_bytes(b'')
+    with pytest.raises(ValueError, match='bash-5.1.8-9.el9.x86_64'):
+        make_package_config(f'--rpm-package={rpm_tree}', f'--output-dir={rpm_tree / "sboms"}')
+
+
+def test_dependencies_are_rejected() -> None:
+    parsed_args = Main.create_parser().parse_args(
+        ['--dependencies', 'package', f'--rpm-package-hash={TESTED_HASH_VALUE}'],
+    )
+    with pytest.raises(ValueError, match='ISO image'):
+        PackageConfig.from_base_args(CommonConfig.from_args(parsed_args), parsed_args)
+
+
+def test_read_hash_file(tmp_path: Path) -> None:
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text(
+        '# packages of the build\n'
+        f'{TESTED_HASH_VALUE}\n'
+        '\n'
+        f'  {"1" * 64}  # glibc\n'
+        f'{TESTED_HASH_VALUE}\n'
+    )
+    config = make_package_config(f'--rpm-package-hash-file={hash_file}', f'--output-dir={tmp_path}')
+    assert config.rpm_package_hashes == [TESTED_HASH_VALUE, '1' * 64]
+
+
+def test_get_output_file(rpm_tree: Path) -> None:
+    config = make_package_config(f'--rpm-package={rpm_tree}', f'--output-dir={rpm_tree / "sboms"}')
+    name = PackageConfig.get_output_name(config.rpm_packages[0])
+    assert name == 'nano-5.6.1-5.el9.x86_64'
+    assert config.get_output_file(name) == rpm_tree / 'sboms' / 'nano-5.6.1-5.el9.x86_64.spdx.json'
+
+    config = make_package_config(f'--rpm-package-hash={TESTED_HASH_VALUE}')
+    assert config.get_output_file(TESTED_HASH_VALUE) == Path(CommonConfig.DEF_OUTPUT)
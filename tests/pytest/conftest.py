@@ -0,0 +1,226 @@
+"""
+Stand-in for the AlmaLinux immudb, serving package records over the subset
+of the immudb gRPC API used by ImmudbWrapper and ImmudbCollector:
+Login, UseDatabase, Health, CurrentState, Get, VerifiableGet and VerifiableTxById.
+
+All records are written in a single transaction, so the proofs it returns are
+genuine and pass the verification of immudb-py. Latency and errors can be
+injected into every lookup.
+
+Tests get the server and its records by the fake_immudb and fake_immudb_records
+fixtures, tests/benchmarks import it from here to run against it.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from concurrent import futures
+from typing import ClassVar, Iterable, Iterator
+
+import grpc
+import pytest
+from google.protobuf import empty_pb2
+from immudb import schema
+from immudb.constants import PLAIN_VALUE_PREFIX, SET_KEY_PREFIX
+from immudb.grpc import schema_pb2, schema_pb2_grpc
+
+TX_ID = 1
+TX_TS = 1714500330
+TOKEN = 'fake-immudb-token'
+### NOTE:
+##  ImmudbClient.login assigns its response to schema_pb2.LoginResponse,
+##  so the class is taken before any client in the same process logs in.
+LoginResponse = schema_pb2.LoginResponse
+
+def generate_records(count: int, seed: int = 0) -> list[dict]:
+    """Makes records of sbom_api_ver 0.2 of count made-up packages"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        name = f'package{i}'
+        records.append({
+            'Name': f'{name}-1.0-1.el9.x86_64.rpm',
+            'Hash': hashlib.sha256(rng.randbytes(32)).hexdigest(),
+            'Kind': 'file',
+            'Metadata': {
+                'sbom_api_ver': '0.2',
+                'epoch': None,
+                'name': name,
+                'version': '1.0',
+                'release': '1.el9',
+                'arch': 'x86_64',
+                'sourcerpm': f'{name}-1.0-1.el9.src.rpm',
+                'build_id': 11363,
+                'build_host': 'x64-builder01.almalinux.org',
+                'built_by': 'eabdullin1 <55892454+eabdullin1@users.noreply.github.com>',
+                'source_type': 'git',
+                'git_url': f'https://git.almalinux.org/rpms/{name}.git',
+                'git_ref': f'imports/c9/{name}-1.0-1.el9',
+                'git_commit': '4533026da95ca85fab57eafbc91c28a3a2dabd79',
+            },
+        })
+    return records
+
+def _inclusion_proof(levels: list[list[bytes]], width: int, leaf: int) -> list[bytes]:
+    ### NOTE:
+    ##  Same walk as immudb.embedded.htree.HTree.InclusionProof, which
+    ##  joins the terms into bytes instead of a list for trees wider than 1.
+    terms = []
+    m, n, offset = leaf, width, 0
+    while n > 1:
+        k = 1 << ((n - 1).bit_length() - 1)
+        if m < k:
+            l, r = offset + k, offset + n - 1
+            n = k
+        else:
+            l, r = offset, offset + k - 1
+            m, n, offset = m - k, n - k, offset + k
+        layer = (r - l).bit_length()
+        terms.insert(0, levels[layer][l >> layer])
+    return terms
+
+class FakeImmudbServicer(schema_pb2_grpc.ImmuServiceServicer):
+    ### NOTE:
+    ##  Transaction all the records are written in
+    TX_ID: ClassVar[int] = TX_ID
+    TX_TS: ClassVar[int] = TX_TS
+
+    records: dict[bytes, bytes]
+    latency: float
+    jitter: float
+    error_rate: float
+    requests: int
+
+    def __init__(
+        self,
+        records: Iterable[dict],
+        database: str = 'almalinux',
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.records = {
+            record['Hash'].encode(): json.dumps(record).encode()
+            for record in records
+        }
+        self.database = database
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._build_ledger()
+
+    def _build_ledger(self) -> None:
+        keys = list(self.records)
+        self._tx = schema_pb2.Tx(
+            header=schema_pb2.TxHeader(
+                id=TX_ID,
+                prevAlh=b'\x00' * 32,
+                ts=TX_TS,
+                nentries=len(keys),
+                version=1,
+                blTxId=0,
+                blRoot=b'\x00' * 32,
+            ),
+            entries=[
+                schema_pb2.TxEntry(
+                    key=SET_KEY_PREFIX + key,
+                    hValue=hashlib.sha256(PLAIN_VALUE_PREFIX + self.records[key]).digest(),
+                    vLen=len(PLAIN_VALUE_PREFIX + self.records[key]),
+                )
+                for key in keys
+            ],
+        )
+        tx = schema.TxFromProto(self._tx)
+        self._tx.header.eH = tx.header.eh
+        self._alh = tx.header.Alh()
+        self._levels = tx.htree.levels
+        self._leaves = {key: i for i, key in enumerate(keys)}
+        self._dual_proof = schema_pb2.DualProof(
+            sourceTxHeader=self._tx.header,
+            targetTxHeader=self._tx.header,
+            linearProof=schema_pb2.LinearProof(sourceTxId=TX_ID, TargetTxId=TX_ID, terms=[self._alh]),
+        )
+
+    def _handle_request(self, context: grpc.ServicerContext) -> None:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            failed = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            context.abort(grpc.StatusCode.UNAVAILABLE, 'injected error')
+
+    def _get_value(self, key: bytes, context: grpc.ServicerContext) -> bytes:
+        self._handle_request(context)
+        if key not in self.records:
+            context.abort(grpc.StatusCode.NOT_FOUND, 'key not found')
+        return self.records[key]
+
+    def Login(self, request, context):
+        return LoginResponse(token=TOKEN)
+
+    def Logout(self, request, context):
+        return empty_pb2.Empty()
+
+    def UseDatabase(self, request, context):
+        return schema_pb2.UseDatabaseReply(token=TOKEN)
+
+    def Health(self, request, context):
+        return schema_pb2.HealthResponse(status=True, version='fake')
+
+    def CurrentState(self, request, context):
+        return schema_pb2.ImmutableState(db=self.database, txId=TX_ID, txHash=self._alh)
+
+    def Get(self, request, context):
+        value = self._get_value(request.key, context)
+        return schema_pb2.Entry(tx=TX_ID, key=request.key, value=value)
+
+    def VerifiableGet(self, request, context):
+        key = request.keyRequest.key
+        value = self._get_value(key, context)
+        return schema_pb2.VerifiableEntry(
+            entry=schema_pb2.Entry(tx=TX_ID, key=key, value=value),
+            verifiableTx=schema_pb2.VerifiableTx(
+                tx=schema_pb2.Tx(header=self._tx.header),
+                dualProof=self._dual_proof,
+            ),
+            inclusionProof=schema_pb2.InclusionProof(
+                leaf=self._leaves[key],
+                width=len(self._leaves),
+                terms=_inclusion_proof(self._levels, len(self._leaves), self._leaves[key]),
+            ),
+        )
+
+    def VerifiableTxById(self, request, context):
+        self._handle_request(context)
+        if request.tx != TX_ID:
+            context.abort(grpc.StatusCode.NOT_FOUND, 'tx not found')
+        return schema_pb2.VerifiableTx(tx=self._tx, dualProof=self._dual_proof)
+
+def serve(servicer: FakeImmudbServicer, address: str = 'localhost:0', max_workers: int = 32) -> tuple[grpc.Server, int]:
+    """Starts the server in background threads, returns it with the port it listens on"""
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    schema_pb2_grpc.add_ImmuServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port(address)
+    server.start()
+    return server, port
+
+@pytest.fixture
+def fake_immudb_records() -> list[dict]:
+    return generate_records(13)
+
+@pytest.fixture
+def fake_immudb(fake_immudb_records: list[dict]) -> Iterator[tuple[FakeImmudbServicer, int]]:
+    """Serves fake_immudb_records, yields the servicer with the port it listens on"""
+    servicer = FakeImmudbServicer(fake_immudb_records)
+    server, port = serve(servicer)
+    try:
+        yield servicer, port
+    finally:
+        server.stop(0)
@@ -0,0 +1,62 @@
+import pytest
+
+TESTED_IMMUDB_INFO_V1 = {
+    'Name': 'bash-4.4.20-4.el8_6.x86_64.rpm',
+    'Kind': 'file',
+    'Size': 1621188,
+    'Hash': 'aeb7b7d638ebad749c8ef2ec7c8b699201e176101f129a49dcb5781158e95632',
+    'Metadata': {
+        'alma_commit_sbom_hash': '7893d8abfaebb88e3910b2f9b7a06497bee84e8e01b00f316097df6f70f976de',
+        'build_arch': 'x86_64',
+        'build_host': 'https://build.almalinux.org/api/v1/',
+        'build_id': '3823',
+        'built_by': 'andrewlukoshko <andrew.lukoshko@gmail.com>',
+        'git_commit': '5cd0d67a640d79bbbbd09ed867f699136b4db8b6',
+        'git_ref': 'imports/c8/bash-4.4.20-4.el8_6',
+        'git_url': 'https://git.almalinux.org/rpms/bash.git',
+        'sbom_api': '0.1',
+        'source_type': 'git',
+        'unsigned_hash': 'b59d13c0413084a6ee8cddf94038e7b7f772da2fdbcd57cc5101a52d1dc4d23f'
+    },
+    'Signer': 'sbom_signer_almalinux',
+    'Original_timestamp': '0001-01-01T00:00:00Z',
+    'timestamp': 1695042331
+}
+
+TESTED_IMMUDB_INFO_V2 = {
+    'Name': 'bash-5.1.8-9.el9.x86_64.rpm',
+    'Kind': 'file',
+    'Size': '1.66 MB',
+    'Hash': '05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1',
+    'Signer': 'sbom_signer_almalinux',
+    'Metadata': {
+        'sbom_api_ver': '0.2',
+        'unsigned_hash': 'c4def308974a4a3fad42c37d1e85da789be4966104473f39adc569f1dc8a271e',
+        'build_id': 11363,
+        'build_host': 'x64-builder01.almalinux.org',
+        'build_arch': 'x86_64',
+        'built_by': 'eabdullin1 <55892454+eabdullin1@users.noreply.github.com>',
+        'alma_commit_sbom_hash': '4533026da95ca85fab57eafbc91c28a3a2dabd79',
+        'source_type': 'git',
+        'git_url': 'https://git.almalinux.org/rpms/bash.git',
+        'git_ref': 'imports/c9/bash-5.1.8-9.el9',
+        'git_commit': '4533026da95ca85fab57eafbc91c28a3a2dabd79',
+        'name': 'bash',
+        'epoch': None,
+        'version': '5.1.8',
+        'release': '9.el9',
+        'arch': 'x86_64',
+        'sourcerpm': 'bash-5.1.8-9.el9.src.rpm',
+    },
+    'timestamp': 1714500330,
+}
+
+
+@pytest.fixture
+def tested_immudb_info_v1() -> dict:
+    return TESTED_IMMUDB_INFO_V1
+
+
+@pytest.fixture
+def tested_immudb_info_v2() -> dict:
+    return TESTED_IMMUDB_INFO_V2
@@ -0,0 +1,46 @@
+import pytest
+
+from alma_sbom.type import Hash
+from alma_sbom.data.collectors.immudb.processor import process_immudb_infos, processor_factory
+
+
+def test_process_immudb_infos_as_processors(
+    tested_immudb_info_v1: dict,
+    tested_immudb_info_v2: dict,
+    fake_immudb_records: list[dict],
+) -> None:
+    srpm_info = {
+        **tested_immudb_info_v2,
+        'Metadata': {
+            **tested_immudb_info_v2['Metadata'],
+            'source_type': 'srpm',
+            'srpm_url': 'https://example.org/bash-5.1.8-9.el9.src.rpm',
+            'srpm_sha256': '0' * 64,
+            'srpm_nevra': 'bash-0:5.1.8-9.el9.src',
+        },
+    }
+    no_epoch_info = {**tested_immudb_info_v2, 'Metadata': dict(tested_immudb_info_v2['Metadata'])}
+    del no_epoch_info['Metadata']['epoch']
+    immudb_infos = [tested_immudb_info_v2, tested_immudb_info_v1, srpm_info, no_epoch_info, *fake_immudb_records]
+
+    packages = process_immudb_infos(immudb_infos)
+    assert packages == [processor_factory(immudb_info, hash=None).get_package() for immudb_info in immudb_infos]
+    assert packages[0].hashs == [Hash(value=tested_immudb_info_v2['Hash'])]
+
+
+def test_process_immudb_infos_with_malformed_records(tested_immudb_info_v2: dict) -> None:
+    immudb_infos = [
+        {'Hash': '0' * 64},
+        {'Hash': '0' * 64, 'Metadata': {'sbom_api_ver': '9.9'}},
+        {**tested_immudb_info_v2, 'Metadata': {**tested_immudb_info_v2['Metadata'], 'source_type': 'cvs'}},
+        tested_immudb_info_v2,
+        tested_immudb_info_v2,
+    ]
+    hashes = [None, None, None, '1' * 64, tested_immudb_info_v2['Hash']]
+
+    results = process_immudb_infos(immudb_infos, hashes)
+    assert isinstance(results[0], KeyError)
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], ValueError)
+    assert isinstance(results[3], ValueError)
+    assert results[4] == processor_factory(tested_immudb_info_v2, tested_immudb_info_v2['Hash']).get_package()
@@ -0,0 +1,80 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from alma_sbom.data.collectors.immudb import cache as cache_module
+from alma_sbom.data.collectors.immudb.cache import ImmudbRecordCache
+
+TESTED_HASH_VALUE = '05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1'
+TESTED_SCOPE = ('immudb.almalinux.org:3322', 'almalinux', 'almalinux_ro')
+FOUND_RESPONSE = {
+    'value': {'Hash': TESTED_HASH_VALUE, 'Metadata': {'sbom_api_ver': '0.2'}},
+    'timestamp': 1714500330,
+}
+NOT_FOUND_RESPONSE = {'error': 'key not found'}
+
+
+def test_found_record(tmp_path: Path) -> None:
+    cache = ImmudbRecordCache(tmp_path / 'immudb.sqlite')
+    assert cache.get(TESTED_HASH_VALUE, *TESTED_SCOPE) is None
+    cache.put(TESTED_HASH_VALUE, *TESTED_SCOPE, FOUND_RESPONSE)
+    assert cache.get(TESTED_HASH_VALUE, *TESTED_SCOPE) == FOUND_RESPONSE
+    ### records of other servers, databases and users are kept apart
+    assert cache.get(TESTED_HASH_VALUE, 'localhost:3322', 'almalinux', 'almalinux_ro') is None
+    assert cache.get(TESTED_HASH_VALUE, 'immudb.almalinux.org:3322', 'other', 'almalinux_ro') is None
+    assert cache.get(TESTED_HASH_VALUE, 'immudb.almalinux.org:3322', 'almalinux', 'other') is None
+    cache.close()
+
+    ### records are kept between runs
+    assert ImmudbRecordCache(tmp_path / 'immudb.sqlite').get(TESTED_HASH_VALUE, *TESTED_SCOPE) == FOUND_RESPONSE
+
+
+def test_not_found_record_expires(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(cache_module.time, 'time', lambda: now)
+    cache = ImmudbRecordCache(tmp_path / 'immudb.sqlite', negative_ttl=60.0)
+    cache.put(TESTED_HASH_VALUE, *TESTED_SCOPE, NOT_FOUND_RESPONSE)
+    assert cache.get(TESTED_HASH_VALUE, *TESTED_SCOPE) == NOT_FOUND_RESPONSE
+    now = 1060.0
+    assert cache.get(TESTED_HASH_VALUE, *TESTED_SCOPE) is None
+
+
+
+def test_found_record_expires(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(cache_module.time, 'time', lambda: now)
+    cache = ImmudbRecordCache(tmp_path / 'immudb.sqlite', negative_ttl=60.0, positive_ttl=600.0)
+    cache.put(TESTED_HASH_VALUE, *TESTED_SCOPE, FOUND_RESPONSE)
+    now = 1060.0
+    assert cache.get(TESTED_HASH_VALUE, *TESTED_SCOPE) == FOUND_RESPONSE
+    now = 1600.0
+    assert cache.get(TESTED_HASH_VALUE, *TESTED_SCOPE) is None
+
+
+def test_found_record_without_ttl(tmp_path: Path) -> None:
+    cache = ImmudbRecordCache(tmp_path / 'immudb.sqlite', positive_ttl=0)
+    cache.put(TESTED_HASH_VALUE, *TESTED_SCOPE, FOUND_RESPONSE)
+    assert cache.get(TESTED_HASH_VALUE, *TESTED_SCOPE) is None
+
+
+def test_not_found_record_without_ttl(tmp_path: Path) -> None:
+    cache = ImmudbRecordCache(tmp_path / 'immudb.sqlite', negative_ttl=0)
+    cache.put(TESTED_HASH_VALUE, *TESTED_SCOPE, NOT_FOUND_RESPONSE)
+    assert cache.get(TESTED_HASH_VALUE, *TESTED_SCOPE) is None
+
+
+def test_error_record_is_not_cached(tmp_path: Path) -> None:
+    cache = ImmudbRecordCache(tmp_path / 'immudb.sqlite')
+    cache.put(TESTED_HASH_VALUE, *TESTED_SCOPE, {'error': 'failed to connect to all addresses'})
+    assert cache.get(TESTED_HASH_VALUE, *TESTED_SCOPE) is None
+
+
+def test_other_version_is_dropped(tmp_path: Path) -> None:
+    cache = ImmudbRecordCache(tmp_path / 'immudb.sqlite')
+    cache.put(TESTED_HASH_VALUE, *TESTED_SCOPE, FOUND_RESPONSE)
+    cache.close()
+    with sqlite3.connect(tmp_path / 'immudb.sqlite') as conn:
+        conn.execute(f'PRAGMA user_version = {ImmudbRecordCache.VERSION + 1}')
+    conn.close()
+    assert ImmudbRecordCache(tmp_path / 'immudb.sqlite').get(TESTED_HASH_VALUE, *TESTED_SCOPE) is None
@@ -1,8 +1,17 @@
+import json
 import os
+import threading
+import time
+from types import SimpleNamespace
+
 import pytest
 
 from alma_sbom.type import Hash, PackageNevra, Licenses, Algorithms
 from alma_sbom.data.collectors import ImmudbCollector
+from alma_sbom.data.collectors.immudb import collector as collector_module
+from alma_sbom.data.collectors.immudb import pool as pool_module
+from alma_sbom.data.collectors.immudb.cache import ImmudbRecordCache
+from alma_sbom.data.collectors.recording import ResponseBundle
 from alma_sbom.data.attributes.property import (
     # Property,
     PackageProperties,
@@ -86,8 +95,175 @@ def test_collect_package_by_package(immudb_collector_instance: ImmudbCollector)
     assert immudb_collector_instance.collect_package_by_package(TESTED_PACKAGE_PATH) == EXPECTED_PACKAGE
 
 
+def test_collect_package_by_buffer_and_fileobj(immudb_collector_instance: ImmudbCollector) -> None:
+    with open(TESTED_PACKAGE_PATH, 'rb') as fd:
+        assert immudb_collector_instance.collect_package_by_fileobj(fd) == EXPECTED_PACKAGE
+        fd.seek(0)
+        assert immudb_collector_instance.collect_package_by_buffer(fd.read()) == EXPECTED_PACKAGE
+
+
 # def test_______immudb_info(immudb_collector_instance: ImmudbCollector) -> None:
 #     # def _extract_immudb_info_about_package(self, hash: str = None, rpm_package: str = None) -> dict:
 #     immudb_info = immudb_collector_instance._extract_immudb_info_about_package(hash=TESTED_HASH_VALUE)
 #     assert immudb_info == None
 
+
+
+def test_collect_packages_by_hashes(immudb_collector_instance: ImmudbCollector) -> None:
+    results = list(immudb_collector_instance.collect_packages_by_hashes([TESTED_HASH_VALUE, '0' * 64]))
+    assert [(hash, pkg) for hash, pkg, _ in results] == [(TESTED_HASH_VALUE, EXPECTED_PACKAGE), ('0' * 64, None)]
+    assert isinstance(results[1][2], KeyError)
+
+
+class FakeImmudbWrapper:
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    instances = 0
+
+    def __init__(self, **kwargs) -> None:
+        with self.lock:
+            FakeImmudbWrapper.instances += 1
+
+    def authenticate(self, hash: str) -> dict:
+        with self.lock:
+            FakeImmudbWrapper.in_flight += 1
+            FakeImmudbWrapper.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            FakeImmudbWrapper.in_flight -= 1
+        if hash.startswith('bad'):
+            raise ConnectionError(hash)
+        return {'value': {'hash': hash}, 'timestamp': None}
+
+
+class FakeProcessor:
+    def __init__(self, immudb_info: dict, hash: str) -> None:
+        self.hash = immudb_info['hash']
+
+    def get_package(self) -> str:
+        return self.hash
+
+
+def fake_process_immudb_infos(immudb_infos: list[dict], hashes: list[str]) -> list:
+    return [
+        KeyError('Immudb info is malformed') if 'hash' not in immudb_info else immudb_info['hash']
+        for immudb_info in immudb_infos
+    ]
+
+
+def test_collect_packages_by_hashes_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pool_module, 'ImmudbWrapper', FakeImmudbWrapper)
+    monkeypatch.setattr(FakeImmudbWrapper, 'max_in_flight', 0)
+    monkeypatch.setattr(FakeImmudbWrapper, 'instances', 0)
+    monkeypatch.setattr(collector_module, 'processor_factory', FakeProcessor)
+    collector = ImmudbCollector(
+        username=None,
+        password=None,
+        database=None,
+        immudb_address=None,
+        public_key_file=None,
+        max_in_flight=3,
+    )
+    hashes = [f'bad{i}' if i % 7 == 0 else f'{i}' for i in range(30)]
+    results = list(collector.collect_packages_by_hashes(hashes))
+
+    assert [hash for hash, _, _ in results] == hashes
+    for hash, pkg, error in results:
+        if hash.startswith('bad'):
+            assert pkg is None and isinstance(error, ConnectionError)
+        else:
+            assert pkg == hash and error is None
+    assert 1 < FakeImmudbWrapper.max_in_flight <= 3
+    assert FakeImmudbWrapper.instances <= 3
+
+
+def test_collect_package_by_hash_with_record_cache(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pool_module, 'ImmudbWrapper', FakeImmudbWrapper)
+    monkeypatch.setattr(collector_module, 'processor_factory', FakeProcessor)
+    authenticated = []
+    monkeypatch.setattr(FakeImmudbWrapper, 'authenticate', lambda self, hash: authenticated.append(hash) or (
+        {'error': 'key not found'} if hash.startswith('bad') else
+        {'error': 'failed to connect to all addresses'} if hash.startswith('down') else
+        {'value': {'hash': hash}, 'timestamp': None}
+    ))
+    def make_collector(immudb_address: str) -> ImmudbCollector:
+        return ImmudbCollector(
+            username=None,
+            password=None,
+            database='almalinux',
+            immudb_address=immudb_address,
+            public_key_file=None,
+            record_cache=ImmudbRecordCache(tmp_path / 'immudb.sqlite'),
+        )
+    collector = make_collector(None)
+    for _ in range(2):
+        assert collector.collect_package_by_hash('1') == '1'
+        with pytest.raises(KeyError):
+            collector.collect_package_by_hash('bad1')
+        with pytest.raises(KeyError):
+            collector.collect_package_by_hash('down1')
+    ### failures of the network are looked up again
+    assert authenticated == ['1', 'bad1', 'down1', 'down1']
+
+    ### records of another immudb server are not taken from the cache
+    assert make_collector('localhost:3323').collect_package_by_hash('1') == '1'
+    assert authenticated == ['1', 'bad1', 'down1', 'down1', '1']
+
+
+def test_collect_packages_by_hashes_with_deferred_verification(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pool_module, 'ImmudbWrapper', FakeImmudbWrapper)
+    monkeypatch.setattr(collector_module, 'process_immudb_infos', fake_process_immudb_infos)
+    monkeypatch.setattr(FakeImmudbWrapper, 'get', lambda self, key: None if key.startswith(b'bad') else SimpleNamespace(
+        tx=int(key) % 2,
+        value=json.dumps({'hash': key.decode()}).encode(),
+    ), raising=False)
+    monkeypatch.setattr(collector_module, 'get_verified_state', lambda client: 'state')
+    verified = []
+    def verify_tx_entries(client, state, tx, entries):
+        verified.append((state, tx, sorted(entries)))
+        return 1714500330
+    monkeypatch.setattr(collector_module, 'verify_tx_entries', verify_tx_entries)
+    collector = ImmudbCollector(
+        username=None,
+        password=None,
+        database=None,
+        immudb_address=None,
+        public_key_file=None,
+        deferred_verification=True,
+    )
+    hashes = ['1', 'bad', '2', '3', '1']
+    results = list(collector.collect_packages_by_hashes(hashes))
+
+    assert [(hash, pkg) for hash, pkg, _ in results] == [('1', '1'), ('bad', None), ('2', '2'), ('3', '3'), ('1', '1')]
+    assert isinstance(results[1][2], KeyError)
+    assert sorted(verified) == [('state', 0, [b'2']), ('state', 1, [b'1', b'3'])]
+
+    def fail_verification(client, state, tx, entries):
+        raise ValueError(f'Transaction {tx} is not consistent')
+    monkeypatch.setattr(collector_module, 'verify_tx_entries', fail_verification)
+    with pytest.raises(ValueError):
+        list(collector.collect_packages_by_hashes(hashes))
+
+
+def test_record_and_replay_immudb_responses(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pool_module, 'ImmudbWrapper', FakeImmudbWrapper)
+    monkeypatch.setattr(collector_module, 'processor_factory', FakeProcessor)
+    def make_collector(response_bundle: ResponseBundle) -> ImmudbCollector:
+        return ImmudbCollector(
+            username=None,
+            password=None,
+            database=None,
+            immudb_address=None,
+            public_key_file=None,
+            response_bundle=response_bundle,
+        )
+    hashes = ['1', 'bad2', '3']
+    recorded = list(make_collector(ResponseBundle(tmp_path)).collect_packages_by_hashes(hashes))
+
+    def fail_to_connect(**kwargs):
+        raise ConnectionError('No network access while replaying')
+    monkeypatch.setattr(pool_module, 'ImmudbWrapper', fail_to_connect)
+    replayed = list(make_collector(ResponseBundle(tmp_path, replay=True)).collect_packages_by_hashes(hashes))
+    assert [(hash, pkg) for hash, pkg, _ in replayed] == [('1', '1'), ('bad2', None), ('3', '3')]
+    assert [(hash, pkg) for hash, pkg, _ in recorded] == [('1', '1'), ('bad2', None), ('3', '3')]
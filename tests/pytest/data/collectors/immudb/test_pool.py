@@ -0,0 +1,126 @@
+import threading
+import time
+
+import grpc
+import pytest
+
+from alma_sbom.data.collectors.immudb import pool as pool_module
+from alma_sbom.data.collectors.immudb.pool import ImmudbClientPool
+
+
+class FakeRpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode) -> None:
+        self._code = code
+
+    def code(self) -> grpc.StatusCode:
+        return self._code
+
+
+class FakeImmudbWrapper:
+    lock = threading.Lock()
+    instances = []
+
+    def __init__(self, **kwargs) -> None:
+        self.logins = 0
+        self.shut_down = False
+        self.health_error = None
+        self.healthy = True
+        with self.lock:
+            FakeImmudbWrapper.instances.append(self)
+
+    def login(self, username: str, password: str, database: str) -> None:
+        self.logins += 1
+        self.health_error = None
+
+    def healthCheck(self) -> bool:
+        if self.health_error is not None:
+            raise self.health_error
+        return self.healthy
+
+    def shutdown(self) -> None:
+        self.shut_down = True
+
+
+@pytest.fixture
+def client_pool(monkeypatch: pytest.MonkeyPatch) -> ImmudbClientPool:
+    monkeypatch.setattr(pool_module, 'ImmudbWrapper', FakeImmudbWrapper)
+    monkeypatch.setattr(FakeImmudbWrapper, 'instances', [])
+    return ImmudbClientPool(
+        username='immudb',
+        password='immudb',
+        database='almalinux',
+        immudb_address='localhost:3322',
+        public_key_file=None,
+        max_size=2,
+    )
+
+
+def test_checkout_within_size_limit(client_pool: ImmudbClientPool) -> None:
+    lock = threading.Lock()
+    in_use = set()
+    max_in_use = 0
+    def lookup(client: FakeImmudbWrapper, i: int) -> int:
+        nonlocal max_in_use
+        with lock:
+            assert client not in in_use
+            in_use.add(client)
+            max_in_use = max(max_in_use, len(in_use))
+        time.sleep(0.01)
+        with lock:
+            in_use.remove(client)
+        return i
+
+    threads = [threading.Thread(target=client_pool.run, args=(lookup, i)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max_in_use == 2
+    assert len(FakeImmudbWrapper.instances) == 2
+
+
+def test_checkout_in_same_thread(client_pool: ImmudbClientPool) -> None:
+    with client_pool.checkout() as client:
+        with client_pool.checkout() as nested_client:
+            assert nested_client is client
+    with client_pool.checkout() as client_again:
+        assert client_again is client
+    assert len(FakeImmudbWrapper.instances) == 1
+
+
+def test_login_again_on_expired_token(client_pool: ImmudbClientPool) -> None:
+    calls = []
+    def lookup(client: FakeImmudbWrapper) -> str:
+        calls.append(client)
+        if len(calls) == 1:
+            raise FakeRpcError(grpc.StatusCode.UNAUTHENTICATED)
+        return 'found'
+
+    assert client_pool.run(lookup) == 'found'
+    assert calls[0] is calls[1]
+    assert calls[0].logins == 1
+
+    def fail_lookup(client: FakeImmudbWrapper) -> str:
+        raise FakeRpcError(grpc.StatusCode.NOT_FOUND)
+    with pytest.raises(FakeRpcError):
+        client_pool.run(fail_lookup)
+    assert calls[0].logins == 1
+
+
+def test_health_check(client_pool: ImmudbClientPool) -> None:
+    client_pool.health_check_interval = 0
+    with client_pool.checkout() as client:
+        pass
+    client.health_error = FakeRpcError(grpc.StatusCode.UNAUTHENTICATED)
+    with client_pool.checkout() as same_client:
+        assert same_client is client and client.logins == 1
+
+    client.health_error = FakeRpcError(grpc.StatusCode.UNAVAILABLE)
+    with client_pool.checkout() as new_client:
+        assert new_client is not client and client.shut_down
+    assert FakeImmudbWrapper.instances == [client, new_client]
+
+    new_client.healthy = False
+    with client_pool.checkout() as healthy_client:
+        assert healthy_client is not new_client and new_client.shut_down
+    assert FakeImmudbWrapper.instances == [client, new_client, healthy_client]
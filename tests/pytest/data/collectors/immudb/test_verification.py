@@ -0,0 +1,191 @@
+import hashlib
+import json
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+from immudb import ImmudbClient, schema
+from immudb.constants import PLAIN_VALUE_PREFIX, SET_KEY_PREFIX
+from immudb.grpc import schema_pb2
+from immudb.rootService import RootService, State
+
+from alma_sbom.data.collectors.immudb.verification import get_verified_state, verify_tx_entries
+
+TESTED_TX = 5
+TESTED_TS = 1714500330
+TESTED_ENTRIES = {
+    b'05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1': json.dumps({'Name': 'bash'}).encode(),
+    b'aeb7b7d638ebad749c8ef2ec7c8b699201e176101f129a49dcb5781158e95632': json.dumps({'Name': 'zsh'}).encode(),
+}
+
+
+def make_ledger(entries: dict[bytes, bytes]) -> tuple[State, schema_pb2.VerifiableTx]:
+    """Makes the last transaction of a ledger holding entries, and the state right after it"""
+    tx = schema_pb2.Tx(
+        header=schema_pb2.TxHeader(
+            id=TESTED_TX,
+            prevAlh=b'\x01' * 32,
+            ts=TESTED_TS,
+            nentries=len(entries),
+            version=1,
+            blTxId=0,
+            blRoot=b'\x00' * 32,
+        ),
+        entries=[
+            schema_pb2.TxEntry(
+                key=SET_KEY_PREFIX + key,
+                hValue=hashlib.sha256(PLAIN_VALUE_PREFIX + value).digest(),
+                vLen=len(PLAIN_VALUE_PREFIX + value),
+            )
+            for key, value in entries.items()
+        ],
+    )
+    header = schema.TxFromProto(tx).header
+    tx.header.eH = header.eh
+    alh = header.Alh()
+    vtx = schema_pb2.VerifiableTx(
+        tx=tx,
+        dualProof=schema_pb2.DualProof(
+            sourceTxHeader=tx.header,
+            targetTxHeader=tx.header,
+            linearProof=schema_pb2.LinearProof(sourceTxId=TESTED_TX, TargetTxId=TESTED_TX, terms=[alh]),
+        ),
+    )
+    return State(db='almalinux', txId=TESTED_TX, txHash=alh, publicKey=None, signature=None), vtx
+
+
+def make_client(vtx: schema_pb2.VerifiableTx) -> SimpleNamespace:
+    def verifiable_tx_by_id(request: schema_pb2.VerifiableTxRequest) -> schema_pb2.VerifiableTx:
+        assert request.tx == TESTED_TX and request.proveSinceTx == TESTED_TX
+        return vtx
+    return SimpleNamespace(_stub=SimpleNamespace(VerifiableTxById=verifiable_tx_by_id), _vk=None)
+
+
+def test_verify_tx_entries() -> None:
+    state, vtx = make_ledger(TESTED_ENTRIES)
+    assert verify_tx_entries(make_client(vtx), state, TESTED_TX, TESTED_ENTRIES) == TESTED_TS
+
+
+def test_verify_tampered_value() -> None:
+    state, vtx = make_ledger(TESTED_ENTRIES)
+    key = next(iter(TESTED_ENTRIES))
+    with pytest.raises(ValueError, match='does not verify'):
+        verify_tx_entries(make_client(vtx), state, TESTED_TX, {key: json.dumps({'Name': 'ksh'}).encode()})
+
+
+def test_verify_unknown_key() -> None:
+    state, vtx = make_ledger(TESTED_ENTRIES)
+    with pytest.raises(ValueError, match='not a part of transaction'):
+        verify_tx_entries(make_client(vtx), state, TESTED_TX, {b'0' * 64: b'{}'})
+
+
+def test_verify_other_state() -> None:
+    state, vtx = make_ledger(TESTED_ENTRIES)
+    state.txHash = b'\x02' * 32
+    with pytest.raises(ValueError, match='not consistent'):
+        verify_tx_entries(make_client(vtx), state, TESTED_TX, TESTED_ENTRIES)
+
+
+def test_verify_tampered_tx() -> None:
+    state, vtx = make_ledger(TESTED_ENTRIES)
+    del vtx.tx.entries[1]
+    with pytest.raises(ValueError, match='not consistent'):
+        verify_tx_entries(make_client(vtx), state, TESTED_TX, dict(list(TESTED_ENTRIES.items())[:1]))
+
+
+def make_state_client(
+    trusted_state: State,
+    state: State,
+    vtx: schema_pb2.VerifiableTx = None,
+) -> SimpleNamespace:
+    def verifiable_tx_by_id(request: schema_pb2.VerifiableTxRequest) -> schema_pb2.VerifiableTx:
+        assert request.tx == state.txId and request.proveSinceTx == trusted_state.txId
+        return vtx
+    root_service = RootService()
+    root_service.set(trusted_state)
+    return SimpleNamespace(
+        _stub=SimpleNamespace(
+            CurrentState=lambda request: schema_pb2.ImmutableState(db=state.db, txId=state.txId, txHash=state.txHash),
+            VerifiableTxById=verifiable_tx_by_id,
+        ),
+        _rs=root_service,
+        _vk=None,
+    )
+
+
+def make_next_states() -> tuple[State, State, schema_pb2.VerifiableTx]:
+    """Makes the states after transactions TESTED_TX - 1 and TESTED_TX, with the proof that the latter follows"""
+    source_header = schema_pb2.TxHeader(
+        id=TESTED_TX - 1,
+        prevAlh=b'\x01' * 32,
+        ts=TESTED_TS,
+        nentries=1,
+        version=1,
+        eH=b'\x03' * 32,
+        blTxId=0,
+        blRoot=b'\x00' * 32,
+    )
+    source_alh = schema.TxHeaderFromProto(source_header).Alh()
+    target_header = schema_pb2.TxHeader()
+    target_header.CopyFrom(source_header)
+    target_header.id = TESTED_TX
+    target_header.prevAlh = source_alh
+    target = schema.TxHeaderFromProto(target_header)
+    vtx = schema_pb2.VerifiableTx(dualProof=schema_pb2.DualProof(
+        sourceTxHeader=source_header,
+        targetTxHeader=target_header,
+        linearProof=schema_pb2.LinearProof(
+            sourceTxId=TESTED_TX - 1,
+            TargetTxId=TESTED_TX,
+            terms=[source_alh, target.innerHash()],
+        ),
+    ))
+    return (
+        State(db='almalinux', txId=TESTED_TX - 1, txHash=source_alh, publicKey=b'', signature=b''),
+        State(db='almalinux', txId=TESTED_TX, txHash=target.Alh(), publicKey=b'', signature=b''),
+        vtx,
+    )
+
+
+def test_get_verified_state() -> None:
+    trusted_state, state, vtx = make_next_states()
+    client = make_state_client(trusted_state, state, vtx)
+    assert get_verified_state(client) == state
+    assert client._rs.get() == state
+
+    ### the trusted state is returned once more
+    assert get_verified_state(client) == state
+
+
+def test_get_forged_state() -> None:
+    trusted_state, state, vtx = make_next_states()
+    state.txHash = b'\x02' * 32
+    client = make_state_client(trusted_state, state, vtx)
+    with pytest.raises(ValueError, match='not consistent'):
+        get_verified_state(client)
+    assert client._rs.get() == trusted_state
+
+
+def test_get_rewritten_state() -> None:
+    trusted_state, _ = make_ledger(TESTED_ENTRIES)
+    client = make_state_client(trusted_state, replace(trusted_state, txHash=b'\x02' * 32))
+    with pytest.raises(ValueError, match='differs'):
+        get_verified_state(client)
+    client = make_state_client(trusted_state, replace(trusted_state, txId=TESTED_TX - 1))
+    with pytest.raises(ValueError, match='older'):
+        get_verified_state(client)
+    assert client._rs.get() == trusted_state
+
+
+def test_verify_tx_entries_from_fake_immudb(fake_immudb, fake_immudb_records: list[dict]) -> None:
+    servicer, port = fake_immudb
+    client = ImmudbClient(f'localhost:{port}')
+    client.login('immudb', 'immudb', b'almalinux')
+    state = get_verified_state(client)
+    entries = {}
+    for record in fake_immudb_records[::2]:
+        entry = client.get(record['Hash'].encode())
+        assert entry.tx == servicer.TX_ID
+        entries[entry.key] = entry.value
+    assert verify_tx_entries(client, state, servicer.TX_ID, entries) == servicer.TX_TS
+    assert client.verifiedGet(fake_immudb_records[5]['Hash'].encode()).verified
@@ -1,3 +1,6 @@
+import requests
+from types import SimpleNamespace
+
 import pytest
 
 from alma_sbom.data import Build
@@ -31,3 +34,42 @@ def test_collect_build_by_id_and_iter_package_hash(albs_collector_instance: Albs
         tested_pkg_hash_list.append(pkg)
     assert tested_pkg_hash_list == albs_collector_instance.package_hash_list
 
+
+
+def test_collect_build_with_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    build_info = {
+        'id': 11363,
+        'created_at': '2024-04-30T14:02:23.231308',
+        'owner': {'username': 'eabdullin1', 'email': '55892454+eabdullin1@users.noreply.github.com'},
+        'tasks': [],
+    }
+    responses = [
+        SimpleNamespace(ok=False, status_code=502, raw=SimpleNamespace(retries=None)),
+        SimpleNamespace(ok=True, status_code=200, raw=SimpleNamespace(retries=SimpleNamespace(history=[None])), json=lambda: build_info),
+    ]
+    def raise_for_status(response=None):
+        raise requests.HTTPError('502 Server Error')
+    responses[0].raise_for_status = raise_for_status
+    responses[1].raise_for_status = lambda: None
+    requested = []
+    session = SimpleNamespace(get=lambda url, timeout: requested.append((url, timeout)) or responses.pop(0))
+    albs_collector = AlbsCollector(CommonConfig.DEF_ALBS_URL, session=session, timeout=10.0)
+
+    with pytest.raises(requests.HTTPError):
+        albs_collector.collect_build_by_id('11363')
+    assert albs_collector.collect_build_by_id('11363') == EXPECTED_BUILD
+    assert requested == [(f'{CommonConfig.DEF_ALBS_URL}/api/v1/builds/11363', 10.0)] * 2
+    assert albs_collector.metrics.failures == 1 and albs_collector.metrics.retries == 1
+
+
+def test_collect_build_with_malformed_response() -> None:
+    def json():
+        raise requests.JSONDecodeError('Expecting value', '<html>', 0)
+    response = SimpleNamespace(ok=True, status_code=200, raw=SimpleNamespace(retries=None), json=json)
+    response.raise_for_status = lambda: None
+    session = SimpleNamespace(get=lambda url, timeout: response)
+    albs_collector = AlbsCollector(CommonConfig.DEF_ALBS_URL, session=session)
+
+    with pytest.raises(requests.JSONDecodeError):
+        albs_collector.collect_build_by_id('11363')
+    assert albs_collector.metrics.failures == 1
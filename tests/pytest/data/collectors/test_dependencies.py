@@ -0,0 +1,51 @@
+import os
+import pytest
+
+from alma_sbom.type import Hash
+from alma_sbom.data.collectors import RpmCollector
+from alma_sbom.data.collectors.dependencies import is_primary_file, resolve_dependencies
+from alma_sbom.data.models import Package
+
+TESTED_PACKAGE_PATH = os.path.dirname(__file__) + '/bash-5.1.8-9.el9.x86_64.rpm'
+
+
+def _package(hash_value: str, requires: list[str], provides: list[str]) -> Package:
+    return Package(hashs=[Hash(value=hash_value)], requires=requires, provides=provides)
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('/usr/bin/bash', True),
+    ('/usr/sbin/ldconfig', True),
+    ('/etc/skel/.bashrc', True),
+    ('/usr/lib/sendmail', True),
+    ('/usr/share/doc/bash/FAQ', False),
+    ('/usr/lib64/libc.so.6', False),
+])
+def test_is_primary_file(path: str, expected: bool) -> None:
+    assert is_primary_file(path) == expected
+
+
+def test_resolve_dependencies() -> None:
+    bash = _package('1' * 64, ['/usr/bin/sh', 'config(bash)', 'libc.so.6()(64bit)', 'libtinfo.so.6()(64bit)'], ['bash', 'config(bash)', '/usr/bin/sh'])
+    glibc = _package('2' * 64, ['/usr/bin/sh', 'unknown-capability'], ['glibc', 'libc.so.6()(64bit)'])
+    ncurses_libs = _package('3' * 64, ['libc.so.6()(64bit)'], ['ncurses-libs', 'libtinfo.so.6()(64bit)'])
+    ### NOTE: The second provider of a capability is never chosen
+    other_libc = _package('4' * 64, [], ['libc.so.6()(64bit)'])
+    without_requires = Package(hashs=[Hash(value='5' * 64)])
+
+    resolve_dependencies([bash, glibc, ncurses_libs, other_libc, without_requires])
+    assert bash.dependencies == ['2' * 64, '3' * 64]
+    assert glibc.dependencies == ['1' * 64]
+    assert ncurses_libs.dependencies == ['2' * 64]
+    assert other_libc.dependencies == []
+    assert without_requires.dependencies is None
+
+
+def test_collect_package_capabilities() -> None:
+    rpm_collector = RpmCollector(use_librpm=False, collect_dependencies=True)
+    pkg = rpm_collector.collect_package_from_file(TESTED_PACKAGE_PATH)
+    assert 'filesystem' in pkg.requires
+    assert not any(name.startswith('rpmlib(') for name in pkg.requires)
+    assert pkg.provides[:5] == ['/bin/bash', '/bin/sh', 'bash', 'bash(x86-64)', 'config(bash)']
+    assert '/usr/bin/bash' in pkg.provides
+    assert '/usr/share/doc/bash/FAQ' not in pkg.provides
@@ -0,0 +1,86 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+import requests
+
+from alma_sbom.data.collectors import http as http_module
+from alma_sbom.data.collectors.http import RequestMetrics, RetryWithJitter, make_session
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    ### status codes to answer with before answering 200
+    failures: list[int] = []
+
+    def do_GET(self) -> None:
+        status = self.failures.pop(0) if self.failures else 200
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    monkeypatch.setattr(FlakyHandler, 'failures', [])
+    server = ThreadingHTTPServer(('localhost', 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://localhost:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_retry_with_jitter(monkeypatch: pytest.MonkeyPatch) -> None:
+    jitters = []
+    def uniform(a: float, b: float) -> float:
+        jitters.append((a, b))
+        return b / 2
+    monkeypatch.setattr(http_module.random, 'uniform', uniform)
+    retry = RetryWithJitter(total=5, backoff_factor=1, jitter=0.5)
+    assert retry.get_backoff_time() == 0 and jitters == []
+
+    delays = []
+    for _ in range(3):
+        retry = retry.increment(method='GET', url='/')
+        delays.append(retry.get_backoff_time())
+    assert isinstance(retry, RetryWithJitter) and retry.jitter == 0.5
+    ### urllib3 retries at once the first time, then after backoff_factor * 2 ** (retries - 1) seconds
+    assert delays == [0, 2.25, 4.25]
+    assert jitters == [(0, 0.5)] * 2
+
+
+def test_session_retries_transient_errors(server_url: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    session = make_session(retries=3, backoff_factor=0.01, jitter=0.01)
+    FlakyHandler.failures.extend([502, 503])
+    response = session.get(f'{server_url}/api/v1/builds/1', timeout=5)
+    assert response.status_code == 200
+    assert response.json() == {'path': '/api/v1/builds/1'}
+    assert len(response.raw.retries.history) == 2
+
+    FlakyHandler.failures.extend([502] * 4)
+    response = session.get(f'{server_url}/api/v1/builds/1', timeout=5)
+    assert response.status_code == 502
+    with pytest.raises(requests.HTTPError):
+        response.raise_for_status()
+
+    FlakyHandler.failures.append(404)
+    assert session.get(f'{server_url}/api/v1/builds/1', timeout=5).status_code == 404
+
+
+def test_request_metrics() -> None:
+    metrics = RequestMetrics()
+    assert metrics.summary() == 'no requests'
+    metrics.add(0.5, 0, failed=False)
+    metrics.add(0.1, 2, failed=False)
+    metrics.add(2.0, 3, failed=True)
+    assert metrics.summary() == (
+        '3 requests, 1 failed, 5 retries, latency min 0.100s, median 0.500s, max 2.000s'
+    )
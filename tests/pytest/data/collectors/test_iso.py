@@ -1,8 +1,13 @@
+import errno
+import hashlib
 import os
 import pytest
 
 from alma_sbom.data.collectors import IsoCollector
-from alma_sbom.data.models import Iso
+from alma_sbom.data.collectors.iso import IsoPackageEntry
+from alma_sbom.data.collectors.iso_manifest import IsoIdentity, IsoManifest, IsoManifestPackage
+from alma_sbom.data.models import Iso, Package
+from alma_sbom.type import Algorithms, Hash
 
 
 TESTED_ISOIMAGE_NAME = 'AlmaLinux-9-latest-x86_64-minimal.iso'
@@ -30,5 +35,158 @@ def test_get_fd_path(iso_collector_instance: IsoCollector) -> None:
     assert iso_collector_instance.get_fd_path() == expected_fd_path
 
 
+def test_get_package_view(iso_collector_instance: IsoCollector, tmp_path) -> None:
+    image = tmp_path / 'image.iso'
+    image.write_bytes(b'\0' * 2048 + b'package-data' + b'\0' * 2036)
+    iso_collector_instance.iso_fp = open(image, 'rb')
+    entry = IsoPackageEntry(rr_path='/BaseOS/Packages/package.rpm', offset=2048, size=12)
+
+    with iso_collector_instance.get_package_view(entry) as view:
+        assert view.readonly
+        assert view.tobytes() == b'package-data'
+
+
+def test_copy_package(iso_collector_instance: IsoCollector, tmp_path) -> None:
+    image = tmp_path / 'image.iso'
+    image.write_bytes(b'\0' * 2048 + b'package-data' + b'\0' * 2036)
+    iso_collector_instance.iso_fp = open(image, 'rb')
+    entry = IsoPackageEntry(rr_path='/BaseOS/Packages/package.rpm', offset=2048, size=12)
+
+    ### NOTE:
+    ##  The first round uses whatever the kernel supports, the second one the pure Python fallback
+    for copy_methods in (
+        iso_collector_instance._copy_methods,
+        [iso_collector_instance._copy_by_python],
+    ):
+        iso_collector_instance._copy_methods = copy_methods
+        hashes = iso_collector_instance.copy_package(entry)
+        assert hashes == [Hash(value=hashlib.sha256(b'package-data').hexdigest())]
+        assert iso_collector_instance.get_fd_path().read_bytes() == b'package-data'
+
+
+def test_copy_package_errors(iso_collector_instance: IsoCollector, tmp_path) -> None:
+    image = tmp_path / 'image.iso'
+    image.write_bytes(b'\0' * 2048 + b'package-data' + b'\0' * 2036)
+    iso_collector_instance.iso_fp = open(image, 'rb')
+    entry = IsoPackageEntry(rr_path='/BaseOS/Packages/package.rpm', offset=2048, size=12)
+
+    def copy_unsupported(entry: IsoPackageEntry) -> None:
+        raise OSError(errno.EXDEV, 'Invalid cross-device link')
+
+    def copy_failed(entry: IsoPackageEntry) -> None:
+        raise OSError(errno.EIO, 'Input/output error')
+
+    iso_collector_instance._copy_methods = [copy_unsupported, copy_failed, iso_collector_instance._copy_by_python]
+    with pytest.raises(OSError, match='Input/output error'):
+        iso_collector_instance.copy_package(entry)
+    ### NOTE:
+    ##  The failed method is kept, only the unsupported one is dropped
+    assert iso_collector_instance._copy_methods[0] is copy_failed
+
+
+def test_close(tmp_path) -> None:
+    image = tmp_path / 'image.iso'
+    image.write_bytes(b'\0' * 4096)
+    with IsoCollector() as iso_collector:
+        iso_collector.iso_fp = open(image, 'rb')
+        iso_fp = iso_collector.iso_fp
+        with iso_collector.get_package_view(IsoPackageEntry(rr_path='/package.rpm', offset=0, size=1)):
+            pass
+        memfd_path = iso_collector.get_fd_path()
+        assert memfd_path.exists()
+    assert iso_fp.closed
+    assert iso_collector.iso_mmap is None
+    assert not memfd_path.exists()
+
+
+def test_iter_with_readahead(iso_collector_instance: IsoCollector, monkeypatch) -> None:
+    monkeypatch.setattr(IsoCollector, 'READAHEAD_SIZE', 3 * 2048)
+    advised = []
+    monkeypatch.setattr(iso_collector_instance, '_advise', lambda entry, advice: advised.append(entry))
+    entries = [
+        IsoPackageEntry(rr_path=f'/BaseOS/Packages/package{i}.rpm', offset=i * 2048, size=2048)
+        for i in range(5)
+    ]
+
+    tested_iter = iso_collector_instance.iter_with_readahead(entries)
+    assert next(tested_iter) == entries[0]
+    assert advised == entries[:3]
+    assert list(tested_iter) == entries[1:]
+    assert advised == entries
+
+
+def test_is_manifest_usable_with_metadata_source() -> None:
+    manifest = IsoManifest(
+        identity=IsoIdentity(size=0, mtime_ns=0, volume_id=''),
+        treeinfo='',
+        algorithms=[Algorithms.SHA_256],
+        packages=[],
+        metadata_source='repodata',
+    )
+    assert IsoCollector(metadata_source='repodata')._is_manifest_usable(manifest)
+    assert not IsoCollector(metadata_source='rpm')._is_manifest_usable(manifest)
+
+
+def test_is_manifest_usable_with_files() -> None:
+    manifest = IsoManifest(
+        identity=IsoIdentity(size=0, mtime_ns=0, volume_id=''),
+        treeinfo='',
+        algorithms=[Algorithms.SHA_256],
+        packages=[],
+        files=True,
+    )
+    assert IsoCollector(collect_files=True)._is_manifest_usable(manifest)
+    assert not IsoCollector(collect_files=False)._is_manifest_usable(manifest)
+    manifest.files = False
+    assert not IsoCollector(collect_files=True)._is_manifest_usable(manifest)
+
+
+def test_is_manifest_usable_with_algorithms() -> None:
+    manifest = IsoManifest(
+        identity=IsoIdentity(size=0, mtime_ns=0, volume_id=''),
+        treeinfo='',
+        algorithms=[Algorithms.SHA_256, Algorithms.SHA_512],
+        packages=[],
+    )
+    assert IsoCollector(algorithms=[Algorithms.SHA_256, Algorithms.SHA_512])._is_manifest_usable(manifest)
+    assert not IsoCollector(algorithms=[Algorithms.SHA_256])._is_manifest_usable(manifest)
+    assert not IsoCollector(
+        algorithms=[Algorithms.SHA_256, Algorithms.SHA_512, Algorithms.SHA_1],
+    )._is_manifest_usable(manifest)
+
+
+class FakeRepodataCollector:
+    PATH_TO_REPOMD = 'repodata/repomd.xml'
+
+    def get_primary_location(self, repomd) -> str:
+        return 'repodata/primary.xml.gz'
+
+    def iter_packages(self, primary, primary_location: str):
+        yield 'Packages/listed.rpm', Package(summary='listed')
+
+
+def test_iter_repodata_packages_not_listed(iso_collector_instance: IsoCollector, monkeypatch) -> None:
+    entries = [
+        IsoPackageEntry(rr_path='/BaseOS/Packages/listed.rpm', offset=2048, size=2048),
+        IsoPackageEntry(rr_path='/BaseOS/Packages/unlisted.rpm', offset=4096, size=2048),
+    ]
+    iso_collector_instance.manifest = IsoManifest(
+        identity=IsoIdentity(size=0, mtime_ns=0, volume_id=''),
+        treeinfo='',
+        algorithms=[Algorithms.SHA_256],
+        packages=[
+            IsoManifestPackage(rr_path=entry.rr_path, offset=entry.offset, size=entry.size, sha256='', package=None)
+            for entry in entries
+        ],
+    )
+    monkeypatch.setattr(iso_collector_instance, '_get_repositories_path', lambda: {'BaseOS': 'BaseOS'})
+    monkeypatch.setattr(iso_collector_instance, 'read_file', lambda rr_path: None)
+
+    assert list(iso_collector_instance.iter_repodata_packages(FakeRepodataCollector())) == [
+        (entries[0], Package(summary='listed')),
+        (entries[1], None),
+    ]
+
+
 # TODO: Implement in the future
 # def test_iter_packages(self) -> None:
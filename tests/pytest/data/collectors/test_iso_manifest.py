@@ -0,0 +1,61 @@
+import pytest
+from pathlib import Path
+
+from alma_sbom.data.collectors.iso_manifest import (
+    IsoIdentity,
+    IsoManifest,
+    IsoManifestCache,
+    IsoManifestPackage,
+)
+from alma_sbom.type import Algorithms
+
+from ..models.test_package import package_instance
+
+TESTED_VOLUME_ID = 'AlmaLinux-9-4-x86_64-dvd'
+
+
+@pytest.fixture
+def iso_image(tmp_path: Path) -> Path:
+    data = bytearray(IsoIdentity.PVD_OFFSET + 2048)
+    offset = IsoIdentity.PVD_OFFSET + IsoIdentity.VOLUME_ID_OFFSET
+    data[offset:offset + IsoIdentity.VOLUME_ID_LENGTH] = TESTED_VOLUME_ID.encode('ascii').ljust(32)
+    image = tmp_path / 'image.iso'
+    image.write_bytes(data)
+    return image
+
+
+def test_iso_identity_from_file(iso_image: Path) -> None:
+    identity = IsoIdentity.from_file(iso_image)
+    assert identity.volume_id == TESTED_VOLUME_ID
+    assert identity.size == iso_image.stat().st_size
+
+
+def test_manifest_cache_save_load(iso_image: Path, tmp_path: Path, package_instance) -> None:
+    identity = IsoIdentity.from_file(iso_image)
+    cache = IsoManifestCache(tmp_path / 'cache')
+    manifest = IsoManifest(
+        identity=identity,
+        treeinfo='[general]\nfamily = AlmaLinux\n',
+        algorithms=[Algorithms.SHA_256, Algorithms.SHA_512],
+        packages=[IsoManifestPackage(
+            rr_path='/BaseOS/Packages/bash-5.1.8-9.el9.x86_64.rpm',
+            offset=2048,
+            size=1024,
+            sha256=package_instance.hashs[0].value,
+            package=package_instance,
+        )],
+        metadata_source='repodata',
+    )
+    assert cache.load(identity) is None
+
+    cache.save(manifest)
+    assert cache.load(identity) == manifest
+
+
+def test_manifest_cache_load_changed_image(iso_image: Path, tmp_path: Path) -> None:
+    identity = IsoIdentity.from_file(iso_image)
+    cache = IsoManifestCache(tmp_path / 'cache')
+    cache.save(IsoManifest(identity=identity, treeinfo='', algorithms=[Algorithms.SHA_256], packages=[]))
+
+    iso_image.write_bytes(iso_image.read_bytes() + b'\0')
+    assert cache.load(IsoIdentity.from_file(iso_image)) is None
@@ -0,0 +1,64 @@
+import pytest
+from license_expression import get_spdx_licensing
+
+from alma_sbom.data.collectors.licenses import (
+    LEGACY_LICENSES,
+    translate_license_expression,
+    translate_license_ids,
+)
+
+@pytest.fixture(scope='module')
+def licensing():
+    return get_spdx_licensing()
+
+def test_legacy_licenses_are_spdx(licensing) -> None:
+    for tag, spdx_id in LEGACY_LICENSES.items():
+        assert licensing.known_symbols[spdx_id].key == spdx_id, tag
+
+@pytest.mark.parametrize(
+    'licenses_str, expected_ids',
+    [
+        ('GPLv3+', ['GPL-3.0-or-later']),
+        ('GPL+ or Artistic', ['GPL-1.0-or-later', 'Artistic-1.0-Perl']),
+        ('ASL 2.0 and MIT', ['Apache-2.0', 'MIT']),
+        ('(GPLv2+ or LGPLv3+) and BSD with advertising', ['GPL-2.0-or-later', 'LGPL-3.0-or-later', 'BSD-4-Clause']),
+        ('LGPLv2+ and LGPLv2+ and zlib', ['LGPL-2.0-or-later', 'Zlib']),
+        ('GPL-2.0-or-later WITH Classpath-exception-2.0 OR MIT', ['GPL-2.0-or-later', 'Classpath-exception-2.0', 'MIT']),
+    ],
+)
+def test_translate_license_ids(licensing, licenses_str: str, expected_ids: list[str]) -> None:
+    assert translate_license_ids(licenses_str, licensing) == expected_ids
+
+@pytest.mark.parametrize(
+    'licenses_str',
+    [
+        '',
+        'BSD',
+        'GPLv2+ with exceptions',
+        'GPLv2+ and',
+        'GPLv2+ MIT',
+        '(GPLv2+ or MIT',
+        'GPLv2+) or MIT',
+        '(GPLv2+ or MIT) with Classpath-exception-2.0',
+        'GPL-2.0+',
+    ],
+)
+def test_translate_license_ids_fallback(licensing, licenses_str: str) -> None:
+    assert translate_license_ids(licenses_str, licensing) is None
+    assert translate_license_expression(licenses_str, licensing) is None
+
+@pytest.mark.parametrize(
+    'licenses_str, expected_expression',
+    [
+        ('GPLv3+', 'GPL-3.0-or-later'),
+        ('GPL+ or Artistic', 'GPL-1.0-or-later OR Artistic-1.0-Perl'),
+        ('(GPLv2+ or LGPLv3+) and BSD with advertising', '(GPL-2.0-or-later OR LGPL-3.0-or-later) AND BSD-4-Clause'),
+        ('GPLv2+ and (LGPLv2+ or ASL 2.0) and MIT', 'GPL-2.0-or-later AND (LGPL-2.0-or-later OR Apache-2.0) AND MIT'),
+        ('ASL 2.0 or GPLv3+ and zlib', 'Apache-2.0 OR (GPL-3.0-or-later AND Zlib)'),
+        ('GPLv2+ with Classpath-exception-2.0 or MIT', 'GPL-2.0-or-later WITH Classpath-exception-2.0 OR MIT'),
+    ],
+)
+def test_translate_license_expression(licensing, licenses_str: str, expected_expression: str) -> None:
+    expression = translate_license_expression(licenses_str, licensing)
+    assert str(expression) == expected_expression
+    assert expression == licensing.parse(expected_expression, validate=True)
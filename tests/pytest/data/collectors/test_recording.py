@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from alma_sbom.data.collectors.recording import ResponseBundle
+
+TESTED_HASH_VALUE = '05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1'
+TESTED_IMMUDB_INFO = {'Hash': TESTED_HASH_VALUE, 'Metadata': {'sbom_api_ver': '0.2'}, 'timestamp': 1714500330}
+TESTED_BUILD_INFO = {'id': 11363, 'owner': {'username': 'eabdullin1'}, 'tasks': []}
+
+
+def test_record_and_replay(tmp_path: Path) -> None:
+    with ResponseBundle(tmp_path) as bundle:
+        bundle.save(ResponseBundle.KIND_IMMUDB, TESTED_HASH_VALUE, TESTED_IMMUDB_INFO)
+        bundle.save(ResponseBundle.KIND_ALBS, '11363', TESTED_BUILD_INFO)
+    assert bundle._segment is None
+
+    replayed = ResponseBundle(tmp_path, replay=True)
+    assert replayed.load(ResponseBundle.KIND_IMMUDB, TESTED_HASH_VALUE) == TESTED_IMMUDB_INFO
+    assert replayed.load(ResponseBundle.KIND_ALBS, '11363') == TESTED_BUILD_INFO
+    with pytest.raises(KeyError):
+        replayed.load(ResponseBundle.KIND_ALBS, TESTED_HASH_VALUE)
+
+
+def test_replay_segments_of_several_processes(tmp_path: Path) -> None:
+    bundle = ResponseBundle(tmp_path)
+    bundle.save(ResponseBundle.KIND_IMMUDB, TESTED_HASH_VALUE, TESTED_IMMUDB_INFO)
+    bundle.close()
+    ### another process, which has been killed in the middle of a response
+    segment = (tmp_path / next(tmp_path.glob(ResponseBundle.SEGMENT_GLOB)).name).read_bytes()
+    (tmp_path / 'responses-1.ndjson.gz').write_bytes(segment + segment[:len(segment) // 2])
+
+    replayed = ResponseBundle(tmp_path, replay=True)
+    assert replayed.load(ResponseBundle.KIND_IMMUDB, TESTED_HASH_VALUE) == TESTED_IMMUDB_INFO
+
+
+def test_replay_without_bundle(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        ResponseBundle(tmp_path, replay=True).load(ResponseBundle.KIND_ALBS, '11363')
+
+    (tmp_path / ResponseBundle.MANIFEST_FILE).write_text(json.dumps({'version': ResponseBundle.VERSION + 1}))
+    with pytest.raises(ValueError):
+        ResponseBundle(tmp_path, replay=True).load(ResponseBundle.KIND_ALBS, '11363')
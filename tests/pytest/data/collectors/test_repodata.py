@@ -0,0 +1,92 @@
+import gzip
+import io
+import pytest
+
+from alma_sbom.type import Hash, PackageNevra, Licenses, Algorithms
+from alma_sbom.data.collectors import RepodataCollector
+from alma_sbom.data.models import Package
+
+TESTED_REPOMD = b'''<?xml version="1.0" encoding="UTF-8"?>
+<repomd xmlns="http://linux.duke.edu/metadata/repo" xmlns:rpm="http://linux.duke.edu/metadata/rpm">
+  <data type="filelists">
+    <location href="repodata/0123-filelists.xml.gz"/>
+  </data>
+  <data type="primary">
+    <location href="repodata/4567-primary.xml.gz"/>
+  </data>
+</repomd>
+'''
+TESTED_PRIMARY = b'''<?xml version="1.0" encoding="UTF-8"?>
+<metadata xmlns="http://linux.duke.edu/metadata/common" xmlns:rpm="http://linux.duke.edu/metadata/rpm" packages="1">
+<package type="rpm">
+  <name>bash</name>
+  <arch>x86_64</arch>
+  <version epoch="0" ver="5.1.8" rel="9.el9"/>
+  <checksum type="sha256" pkgid="YES">05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1</checksum>
+  <summary>The GNU Bourne Again shell</summary>
+  <description>The GNU Bourne Again shell (Bash) is a shell or command language
+interpreter that is compatible with the Bourne shell (sh). Bash
+incorporates useful features from the Korn shell (ksh) and the C shell
+(csh). Most sh scripts can be run by bash without modification.</description>
+  <location href="Packages/bash-5.1.8-9.el9.x86_64.rpm"/>
+  <format>
+    <rpm:license>GPLv3+</rpm:license>
+    <rpm:sourcerpm>bash-5.1.8-9.el9.src.rpm</rpm:sourcerpm>
+    <rpm:provides>
+      <rpm:entry name="bash" flags="EQ" epoch="0" ver="5.1.8" rel="9.el9"/>
+      <rpm:entry name="/bin/sh"/>
+    </rpm:provides>
+    <rpm:requires>
+      <rpm:entry name="filesystem" pre="1"/>
+      <rpm:entry name="libc.so.6()(64bit)"/>
+      <rpm:entry name="rpmlib(PayloadIsZstd)" flags="LE" epoch="0" ver="5.4.18" rel="1"/>
+    </rpm:requires>
+    <file>/usr/bin/bash</file>
+  </format>
+</package>
+</metadata>
+'''
+
+EXPECTED_LOCATION = 'Packages/bash-5.1.8-9.el9.x86_64.rpm'
+EXPECTED_PACKAGE = Package(
+    package_nevra=PackageNevra(
+        epoch = None,
+        name = 'bash',
+        version = '5.1.8',
+        release = '9.el9',
+        arch = 'x86_64',
+    ),
+    source_rpm='bash-5.1.8-9.el9.src.rpm',
+    package_timestamp=None,
+    hashs=[Hash(
+        value='05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1',
+        algorithm=Algorithms.SHA_256,
+    )],
+    licenses=Licenses(ids=['GPL-3.0-or-later'], expression='GPL-3.0-or-later'),
+    summary='The GNU Bourne Again shell',
+    description='The GNU Bourne Again shell (Bash) is a shell or command language\ninterpreter that is compatible with the Bourne shell (sh). Bash\nincorporates useful features from the Korn shell (ksh) and the C shell\n(csh). Most sh scripts can be run by bash without modification.',
+)
+
+
+@pytest.fixture
+def repodata_collector_instance() -> RepodataCollector:
+    return RepodataCollector()
+
+
+def test_get_primary_location(repodata_collector_instance: RepodataCollector) -> None:
+    location = repodata_collector_instance.get_primary_location(io.BytesIO(TESTED_REPOMD))
+    assert location == 'repodata/4567-primary.xml.gz'
+
+
+def test_iter_packages(repodata_collector_instance: RepodataCollector) -> None:
+    primary = io.BytesIO(gzip.compress(TESTED_PRIMARY))
+    packages = list(repodata_collector_instance.iter_packages(primary, 'repodata/4567-primary.xml.gz'))
+    assert packages == [(EXPECTED_LOCATION, EXPECTED_PACKAGE)]
+
+
+def test_iter_packages_with_dependencies() -> None:
+    repodata_collector = RepodataCollector(collect_dependencies=True)
+    primary = io.BytesIO(TESTED_PRIMARY)
+    [(_, pkg)] = repodata_collector.iter_packages(primary, 'repodata/4567-primary.xml')
+    assert pkg.requires == ['filesystem', 'libc.so.6()(64bit)']
+    assert pkg.provides == ['bash', '/bin/sh', '/usr/bin/bash']
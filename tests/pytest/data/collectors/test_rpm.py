@@ -1,9 +1,23 @@
+import io
 import os
 import pytest
+from dataclasses import replace
+from types import SimpleNamespace
 
-from alma_sbom.type import Hash, PackageNevra, Licenses, Algorithms
+from alma_sbom.type import Hash, PackageNevra, PackageFile, Licenses, Algorithms
 from alma_sbom.data.collectors import RpmCollector
-from alma_sbom.data.collectors.rpm import hash_file
+from alma_sbom.data.collectors import rpm as rpm_module
+from alma_sbom.data.collectors.rpm_header import RpmPackageHeaders
+from alma_sbom.data.collectors.rpm import (
+    hash_file,
+    hash_fileobj,
+    hash_buffer,
+    digest_file,
+    digest_fileobj,
+    digest_buffer,
+    proc_licenses,
+    get_licenses_cache_info,
+)
 from alma_sbom.data.models import Package
 from alma_sbom.data.attributes.property import (
     Property,
@@ -16,7 +30,9 @@ from alma_sbom.data.attributes.property import (
 TESTED_PACKAGE_NAME = 'bash-5.1.8-9.el9.x86_64.rpm'
 TESTED_PACKAGE_PATH = os.path.dirname(__file__) + f'/{TESTED_PACKAGE_NAME}'
 
-EXPECTED_LICENSES = licenses=Licenses(ids=[], expression='GPLv3+'),
+EXPECTED_LICENSES = licenses=Licenses(ids=['GPL-3.0-or-later'], expression='GPL-3.0-or-later'),
+### Not the checksum of the tested package, so the tests see whether the passed one is used
+TESTED_SENTINEL_HASH_VALUE = '0' * 64
 EXPECTED_HASH_VALUE = '05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1'
 EXPECTED_PACKAGE = Package(
     package_nevra=PackageNevra( # 0:bash-5.1.8-9.el9.x86_64
@@ -32,10 +48,21 @@ EXPECTED_PACKAGE = Package(
         value='05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1',
         algorithm=Algorithms.SHA_256,
     )],
-    licenses=Licenses(ids=[], expression='GPLv3+'),
+    licenses=Licenses(ids=['GPL-3.0-or-later'], expression='GPL-3.0-or-later'),
     summary='The GNU Bourne Again shell',
     description='The GNU Bourne Again shell (Bash) is a shell or command language\ninterpreter that is compatible with the Bourne shell (sh). Bash\nincorporates useful features from the Korn shell (ksh) and the C shell\n(csh). Most sh scripts can be run by bash without modification.',
 )
+EXPECTED_HASHES = [
+    Hash(value=EXPECTED_HASH_VALUE, algorithm=Algorithms.SHA_256),
+    Hash(value='5c54709add6a603db6858fe62bdcd619d81290c9', algorithm=Algorithms.SHA_1),
+    Hash(
+        value=(
+            '6b985dabfd9cad06d9c33d0c2d3dc3570463f186e5e3766ab50d0ebb24d9d1bc'
+            'b366dc746140a1b6f9e16fc3c4e0b68ff6bafcc9b33f3abf9123b4bc4bbc7bba'
+        ),
+        algorithm=Algorithms.SHA_512,
+    ),
+]
 
 @pytest.fixture
 def rpm_collector_instance() -> RpmCollector:
@@ -47,6 +74,155 @@ def test_collect_package_from_file(rpm_collector_instance: RpmCollector) -> None
     assert rpm_collector_instance.collect_package_from_file(TESTED_PACKAGE_PATH) == EXPECTED_PACKAGE
 
 
+def test_collect_package_from_file_with_hash_value(rpm_collector_instance: RpmCollector, monkeypatch) -> None:
+    ### NOTE:
+    ##  The passed checksum must be used as is, the package must not be hashed again
+    def digest_file(*args, **kwargs):
+        raise AssertionError('package is hashed although its checksum is passed')
+    monkeypatch.setattr(rpm_module, 'digest_file', digest_file)
+    assert rpm_collector_instance.collect_package_from_file(
+        TESTED_PACKAGE_PATH,
+        hash_value=TESTED_SENTINEL_HASH_VALUE,
+    ) == replace(EXPECTED_PACKAGE, hashs=[Hash(value=TESTED_SENTINEL_HASH_VALUE)])
+
+
+def test_collect_package_from_file_without_librpm() -> None:
+    rpm_collector = RpmCollector(use_librpm=False)
+    assert rpm_collector.collect_package_from_file(TESTED_PACKAGE_PATH) == EXPECTED_PACKAGE
+
+
+def test_collect_package_from_buffer() -> None:
+    rpm_collector = RpmCollector(use_librpm=False)
+    with open(TESTED_PACKAGE_PATH, 'rb') as fd:
+        data = fd.read()
+    assert rpm_collector.collect_package_from_buffer(data) == EXPECTED_PACKAGE
+    assert rpm_collector.collect_package_from_buffer(memoryview(data)) == EXPECTED_PACKAGE
+
+
+class _Stream(io.RawIOBase):
+    """Non-seekable stream returning short reads, like a socket"""
+    def __init__(self, data: bytes):
+        self.data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buff) -> int:
+        data = self.data.read(min(len(buff), 1000))
+        buff[:len(data)] = data
+        return len(data)
+
+
+def test_collect_package_from_fileobj() -> None:
+    rpm_collector = RpmCollector(use_librpm=False)
+    with open(TESTED_PACKAGE_PATH, 'rb') as fd:
+        data = fd.read()
+    assert rpm_collector.collect_package_from_fileobj(_Stream(data)) == EXPECTED_PACKAGE
+    assert rpm_collector.collect_package_from_fileobj(
+        io.BytesIO(data),
+        hash_value=TESTED_SENTINEL_HASH_VALUE,
+    ) == replace(EXPECTED_PACKAGE, hashs=[Hash(value=TESTED_SENTINEL_HASH_VALUE)])
+
+
+def test_collect_package_from_fd_keeps_offset(tmp_path) -> None:
+    rpm_collector = RpmCollector(use_librpm=False)
+    ### NOTE:
+    ##  hdrFromFdno of librpm reads from the offset of the descriptor it gets
+    rpm_collector.use_librpm = True
+    rpm_collector.ts = SimpleNamespace(
+        hdrFromFdno=lambda fd: RpmPackageHeaders.from_fd(fd, os.lseek(fd, 0, os.SEEK_CUR)).header,
+    )
+    padding = b'\x00' * 1000
+    with open(TESTED_PACKAGE_PATH, 'rb') as fd:
+        data = fd.read()
+    image = tmp_path / 'image'
+    image.write_bytes(padding + data)
+    with open(image, 'rb') as fp:
+        assert fp.read(16) == padding[:16]
+        assert rpm_collector.collect_package_from_fd(
+            fp.fileno(),
+            len(padding),
+            hash_value=TESTED_SENTINEL_HASH_VALUE,
+        ) == replace(EXPECTED_PACKAGE, hashs=[Hash(value=TESTED_SENTINEL_HASH_VALUE)])
+        ### the buffered file object goes on reading where it stopped
+        assert fp.read() == (padding + data)[16:]
+
+
 def test_hash_file() -> None:
     assert hash_file(TESTED_PACKAGE_PATH) == EXPECTED_HASH_VALUE
 
+
+def test_hash_fileobj_and_buffer() -> None:
+    with open(TESTED_PACKAGE_PATH, 'rb') as fd:
+        data = fd.read()
+    assert hash_fileobj(io.BytesIO(data), buff_size=4096) == EXPECTED_HASH_VALUE
+    assert hash_fileobj(_Stream(data)) == EXPECTED_HASH_VALUE
+    assert hash_buffer(memoryview(data)) == EXPECTED_HASH_VALUE
+
+
+def test_digest_file_fileobj_and_buffer() -> None:
+    algorithms = [Algorithms.SHA_256, Algorithms.SHA_1, Algorithms.SHA_512]
+    with open(TESTED_PACKAGE_PATH, 'rb') as fd:
+        data = fd.read()
+    for hashes in (
+        digest_file(TESTED_PACKAGE_PATH, algorithms),
+        digest_fileobj(_Stream(data), algorithms, buff_size=4096),
+        digest_buffer(memoryview(data), algorithms),
+    ):
+        assert hashes == EXPECTED_HASHES
+
+
+def test_collect_package_with_several_algorithms() -> None:
+    rpm_collector = RpmCollector(
+        use_librpm=False,
+        algorithms=[Algorithms.SHA_256, Algorithms.SHA_1, Algorithms.SHA_512],
+    )
+    with open(TESTED_PACKAGE_PATH, 'rb') as fd:
+        data = fd.read()
+    for pkg in (
+        rpm_collector.collect_package_from_file(TESTED_PACKAGE_PATH),
+        ### NOTE: SHA256 checksum alone doesn't stop the package from being hashed
+        rpm_collector.collect_package_from_file(TESTED_PACKAGE_PATH, hash_value=EXPECTED_HASH_VALUE),
+        rpm_collector.collect_package_from_buffer(data),
+        rpm_collector.collect_package_from_fileobj(_Stream(data)),
+    ):
+        assert pkg.hashs == EXPECTED_HASHES
+
+
+@pytest.mark.parametrize('use_librpm', [False, True])
+def test_collect_package_files(use_librpm: bool) -> None:
+    if use_librpm:
+        pytest.importorskip('rpm')
+    rpm_collector = RpmCollector(use_librpm=use_librpm, collect_files=True)
+    files = rpm_collector.collect_package_from_file(TESTED_PACKAGE_PATH).files
+    assert files.algorithm == Algorithms.SHA_256
+    ### NOTE: Directories and symlinks of the package are skipped
+    assert len(files) == 123
+    assert list(files)[0] == PackageFile(
+        path='/etc/skel/.bash_logout',
+        size=18,
+        digest='2584c4ba8b0d2a52d94023f420b7e356a1b1a3f2291ad5eba06683d58c48570d',
+    )
+    assert rpm_collector.collect_package_from_file(TESTED_PACKAGE_PATH) == rpm_collector.collect_package_from_buffer(
+        open(TESTED_PACKAGE_PATH, 'rb').read(),
+    )
+
+
+def test_proc_licenses_cached() -> None:
+    licenses = proc_licenses('MIT and BSD-3-Clause')
+    hits = get_licenses_cache_info().hits
+    cached_licenses = proc_licenses('MIT and BSD-3-Clause')
+    assert get_licenses_cache_info().hits == hits + 1
+    assert cached_licenses == licenses == Licenses(ids=['MIT', 'BSD-3-Clause'], expression='MIT AND BSD-3-Clause')
+    ### NOTE: Every package must get its own list of ids
+    assert cached_licenses.ids is not licenses.ids
+
+
+def test_proc_licenses_compound_legacy_expression() -> None:
+    assert proc_licenses('(GPLv2+ or LGPLv3+) and BSD with advertising') == Licenses(
+        ids=['GPL-2.0-or-later', 'LGPL-3.0-or-later', 'BSD-4-Clause'],
+        expression='(GPL-2.0-or-later OR LGPL-3.0-or-later) AND BSD-4-Clause',
+    )
+    ### NOTE:
+    ##  Strings which are neither translated nor parsed are kept as they are
+    assert proc_licenses('GPLv2 or BSD') == Licenses(ids=[], expression='GPLv2 or BSD')
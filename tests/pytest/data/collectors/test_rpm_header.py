@@ -0,0 +1,65 @@
+import os
+import pytest
+
+from alma_sbom.data.collectors.rpm_header import (
+    RpmPackageHeaders,
+    RPMTAG_NAME,
+    RPMTAG_VERSION,
+    RPMTAG_RELEASE,
+    RPMTAG_EPOCH,
+    RPMTAG_ARCH,
+    RPMTAG_SOURCERPM,
+    RPMTAG_LICENSE,
+    RPMTAG_SUMMARY,
+)
+
+TESTED_PACKAGE_NAME = 'bash-5.1.8-9.el9.x86_64.rpm'
+TESTED_PACKAGE_PATH = os.path.dirname(__file__) + f'/{TESTED_PACKAGE_NAME}'
+
+EXPECTED_TAGS = {
+    RPMTAG_NAME: 'bash',
+    RPMTAG_VERSION: '5.1.8',
+    RPMTAG_RELEASE: '9.el9',
+    RPMTAG_EPOCH: None,
+    RPMTAG_ARCH: 'x86_64',
+    RPMTAG_SOURCERPM: 'bash-5.1.8-9.el9.src.rpm',
+    RPMTAG_LICENSE: 'GPLv3+',
+    RPMTAG_SUMMARY: 'The GNU Bourne Again shell',
+}
+EXPECTED_DIGESTS = {
+    'header-sha1': 'b82ff430abcca773aa131f20eda8981e6bc237b7',
+    'header-sha256': '39be757c78c755834a574701d83bd1b3fceddce814e48745a32e5243a7064c1e',
+    'header-payload-md5': 'abbcee9ad5f5b605c895928edf38a068',
+    'payload-sha256': 'eac9fb47f059d6049f94e1e684cc5fc4f8cfd5e17ae33c62cab15542491a2be7',
+}
+
+def _read_package() -> bytes:
+    with open(TESTED_PACKAGE_PATH, 'rb') as fd:
+        return fd.read()
+
+def _check_headers(headers: RpmPackageHeaders) -> None:
+    for tag, value in EXPECTED_TAGS.items():
+        assert headers.header[tag] == value
+    assert headers.get_digests() == EXPECTED_DIGESTS
+    headers.verify_header_digest()
+
+def test_from_buffer() -> None:
+    data = _read_package()
+    _check_headers(RpmPackageHeaders.from_buffer(data))
+    _check_headers(RpmPackageHeaders.from_buffer(memoryview(b'\0' * 10 + data)[10:]))
+
+def test_from_fd(tmp_path) -> None:
+    image = tmp_path / 'image'
+    image.write_bytes(b'\0' * 4096 + _read_package())
+    fd = os.open(image, os.O_RDONLY)
+    try:
+        _check_headers(RpmPackageHeaders.from_fd(fd, 4096))
+    finally:
+        os.close(fd)
+
+def test_truncated_package() -> None:
+    data = _read_package()
+    with pytest.raises(ValueError):
+        RpmPackageHeaders.from_buffer(data[:1024])
+    with pytest.raises(ValueError):
+        RpmPackageHeaders.from_buffer(b'\0' * len(data))
@@ -1,6 +1,8 @@
+import json
+from array import array
 import pytest
 
-from alma_sbom.type import Hash, PackageNevra, Licenses, Algorithms
+from alma_sbom.type import Hash, PackageNevra, PackageFiles, Licenses, Algorithms
 from alma_sbom.data.models import Package, NullPackage
 from alma_sbom.data.attributes.property import (
     Property,
@@ -106,3 +108,27 @@ def test_merge(package_instance: Package) -> None:
     pkg_merged = NullPackage.merge(package_instance)
     assert pkg_merged == package_instance
 
+
+def test_merge_hashs(package_instance: Package) -> None:
+    sha256 = package_instance.hashs[0]
+    sha512 = Hash(value='0' * 128, algorithm=Algorithms.SHA_512)
+    pkg_from_pkg = Package(hashs=[Hash(value='1' * 64), sha512])
+    assert package_instance.merge(pkg_from_pkg).hashs == [sha256, sha512]
+
+
+
+def test_to_dict_from_dict(package_instance: Package) -> None:
+    assert Package.from_dict(package_instance.to_dict()) == package_instance
+
+
+def test_to_dict_from_dict_with_files(package_instance: Package) -> None:
+    package_instance.files = PackageFiles(
+        dirnames=['/usr/bin/'],
+        dirindexes=array('I', [0]),
+        basenames=['bash'],
+        sizes=array('Q', [1389064]),
+        digests=['a' * 64],
+        algorithm=Algorithms.SHA_256,
+    )
+    data = json.loads(json.dumps(package_instance.to_dict()))
+    assert Package.from_dict(data) == package_instance
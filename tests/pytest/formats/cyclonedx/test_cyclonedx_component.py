@@ -1,3 +1,4 @@
+from array import array
 import pytest
 
 from cyclonedx.factory.license import LicenseFactory
@@ -11,8 +12,9 @@ from alma_sbom.formats.cyclonedx.component import (
     component_from_package,
     component_from_build,
     component_from_iso,
+    FILE_SIZE_PROPERTY,
 )
-from alma_sbom.type import Hash, PackageNevra, Licenses, Algorithms, SbomFileFormatType
+from alma_sbom.type import Hash, PackageNevra, PackageFiles, Licenses, Algorithms, SbomFileFormatType
 from alma_sbom.data import Package, Build, Iso
 from alma_sbom.data.attributes.property import (
     # Property,
@@ -127,6 +129,23 @@ def test_component_from_package(package_instance) -> None:
     assert component_from_package(package_instance) == EXPECTED_PKG_COMPONENT
 
 
+def test_component_from_package_with_files(package_instance) -> None:
+    package_instance.files = PackageFiles(
+        dirnames=['/usr/bin/', '/usr/share/doc/bash/'],
+        dirindexes=array('I', [0, 1]),
+        basenames=['bash', 'FAQ'],
+        sizes=array('Q', [1389064, 73]),
+        digests=['a' * 64, 'b' * 64],
+        algorithm=Algorithms.SHA_256,
+    )
+    files = component_from_package(package_instance).components
+    assert sorted((f.type, f.name, f.hashes[0].content, f.properties[0].value) for f in files) == [
+        (ComponentType.FILE, '/usr/bin/bash', 'a' * 64, '1389064'),
+        (ComponentType.FILE, '/usr/share/doc/bash/FAQ', 'b' * 64, '73'),
+    ]
+    assert all(f.properties[0].name == FILE_SIZE_PROPERTY for f in files)
+
+
 ### TODO: need to add packages !!!!!!!!!!!!!!!!!
 @pytest.fixture
 def build_instance() -> Build:
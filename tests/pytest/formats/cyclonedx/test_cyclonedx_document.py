@@ -1,4 +1,5 @@
 import pytest
+import json
 import os
 from datetime import datetime, timezone
 from pathlib import Path
@@ -385,6 +386,50 @@ def test_from_iso(cdx_document_iso_instance) -> None:
     else:
         diff_CDXDocument(cdx_document_iso_instance, EXPECTED_DOC_FROM_ISO)
 
+def test_from_iso_with_dependencies() -> None:
+    bash = Package(
+        package_nevra=PackageNevra(epoch=None, name='bash', version='5.1.8', release='9.el9', arch='x86_64'),
+        hashs=[Hash(value='1' * 64)],
+        dependencies=['2' * 64],
+    )
+    glibc = Package(
+        package_nevra=PackageNevra(epoch=None, name='glibc', version='2.34', release='100.el9', arch='x86_64'),
+        hashs=[Hash(value='2' * 64)],
+    )
+    doc = CDXDocument.from_iso(
+        iso=Iso(releasever=9, image_type='test', packages=[bash, glibc]),
+        file_format_type=SbomFileFormatType.JSON,
+    )
+    bom = json.loads(doc.formatter.write(doc.bom))
+    refs = {component['name']: component['bom-ref'] for component in bom['components']}
+    dependencies = {dependency['ref']: dependency.get('dependsOn', []) for dependency in bom['dependencies']}
+    assert dependencies[refs['bash']] == [refs['glibc']]
+    assert dependencies[refs['glibc']] == []
+
+def test_stream_iso(tmp_path) -> None:
+    output_file = tmp_path / 'output.json'
+    CDXDocument.stream_iso(
+        iso=TESTED_ISO,
+        packages=iter([TESTED_PACKAGE, TESTED_PACKAGE]),
+        file_format_type=SbomFileFormatType.JSON,
+        output_file=output_file,
+    )
+    bom = json.loads(output_file.read_text(encoding='utf-8'))
+    assert bom['metadata']['component']['name'] == TESTED_ISO.get_doc_name()
+    assert [component['name'] for component in bom['components']] == ['bash', 'bash']
+    assert [dependency['ref'] for dependency in bom['dependencies']] == [
+        bom['metadata']['component']['bom-ref'],
+    ] + [component['bom-ref'] for component in bom['components']]
+
+def test_stream_iso_unsupported_format(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        CDXDocument.stream_iso(
+            iso=TESTED_ISO,
+            packages=iter([]),
+            file_format_type=SbomFileFormatType.XML,
+            output_file=tmp_path / 'output.xml',
+        )
+
 def diff_CDXDocument(doc1: CDXDocument, doc2: CDXDocument) -> None:
     assert doc1.bom.metadata.component.group == doc2.bom.metadata.component.group
     assert doc1.bom.metadata.component.name == doc2.bom.metadata.component.name
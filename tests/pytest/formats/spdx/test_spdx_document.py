@@ -0,0 +1,79 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+
+from alma_sbom.type import Hash, PackageNevra, Licenses, SbomFileFormatType
+from alma_sbom.formats.spdx.document import SPDXDocument
+from alma_sbom.data import Package, Iso
+from alma_sbom.data.collectors.dependencies import resolve_dependencies
+
+TESTED_PACKAGES = [
+    Package(
+        package_nevra=PackageNevra(epoch=None, name='bash', version='5.1.8', release='9.el9', arch='x86_64'),
+        source_rpm='bash-5.1.8-9.el9.src.rpm',
+        hashs=[Hash(value='05dc1b806bd5456d40e3d7f882ead037aaf480c596e83fbfb6ab86be74a2d8d1')],
+        licenses=Licenses(ids=['GPL-3.0-or-later'], expression='GPLv3+'),
+        summary='The GNU Bourne Again shell',
+    ),
+    Package(
+        package_nevra=PackageNevra(epoch=None, name='glibc', version='2.34', release='100.el9', arch='x86_64'),
+        source_rpm='glibc-2.34-100.el9.src.rpm',
+        hashs=[Hash(value='2' * 64)],
+        summary='The GNU libc libraries',
+    ),
+]
+
+
+def load_document(output_file: Path) -> dict:
+    document = json.loads(output_file.read_text(encoding='utf-8'))
+    ### NOTE:
+    ##  Every document gets a namespace and a creation time of its own
+    del document['documentNamespace']
+    del document['creationInfo']['created']
+    return document
+
+
+def test_stream_iso(tmp_path: Path) -> None:
+    iso = Iso(releasever='9', image_type='DVD', packages=[])
+    streamed_file = tmp_path / 'streamed.json'
+    SPDXDocument.stream_iso(iso, iter(TESTED_PACKAGES), SbomFileFormatType.JSON, streamed_file)
+
+    for pkg in TESTED_PACKAGES:
+        iso.append_package(pkg)
+    written_file = tmp_path / 'written.json'
+    SPDXDocument.from_iso(iso, SbomFileFormatType.JSON).write(str(written_file))
+
+    streamed = load_document(streamed_file)
+    written = load_document(written_file)
+    assert [package['name'] for package in streamed['packages']] == ['bash', 'glibc']
+    assert streamed == written
+
+
+def test_iso_dependencies(tmp_path: Path) -> None:
+    bash, glibc = TESTED_PACKAGES
+    packages = [
+        replace(
+            bash,
+            requires=['/bin/sh', 'libc.so.6()(64bit)', 'rpmlib(CompressedFileNames)'],
+            provides=['/bin/sh', 'bash', 'bash(x86-64)'],
+        ),
+        replace(glibc, requires=['/bin/sh'], provides=['glibc', 'libc.so.6()(64bit)']),
+    ]
+    resolve_dependencies(packages)
+    iso = Iso(releasever='9', image_type='DVD', packages=[])
+    for pkg in packages:
+        iso.append_package(pkg)
+    output_file = tmp_path / 'iso.json'
+    SPDXDocument.from_iso(iso, SbomFileFormatType.JSON).write(str(output_file))
+
+    document = load_document(output_file)
+    package_ids = {package['name']: package['SPDXID'] for package in document['packages']}
+    depends_on = [
+        (relationship['spdxElementId'], relationship['relatedSpdxElement'])
+        for relationship in document['relationships']
+        if relationship['relationshipType'] == 'DEPENDS_ON'
+    ]
+    assert sorted(depends_on) == sorted([
+        (package_ids['bash'], package_ids['glibc']),
+        (package_ids['glibc'], package_ids['bash']),
+    ])
@@ -0,0 +1,27 @@
+import io
+import json
+
+from alma_sbom.formats.stream import JsonStreamWriter
+
+def test_json_stream_writer() -> None:
+    expected = {
+        'name': 'test',
+        'nested': {'key': ['value']},
+        'items': [{'id': 0}, {'id': 1, 'text': 'line\nbreak'}],
+        'empty': [],
+        'deferred': [{'ref': 0}, {'ref': 1}],
+    }
+    fd = io.StringIO()
+    with JsonStreamWriter(fd) as writer:
+        writer.write_member('name', 'test')
+        writer.write_member('nested', {'key': ['value']})
+        writer.begin_array('items')
+        for item in expected['items']:
+            writer.write_item(item)
+            writer.defer_item('deferred', {'ref': item['id']})
+        writer.end_array()
+        writer.begin_array('empty')
+        writer.end_array()
+
+    assert json.loads(fd.getvalue()) == expected
+    assert fd.getvalue() == json.dumps(expected, indent=4) + '\n'